@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Import time benchmark of the OSACA command line module.
+
+Every run imports osaca.osaca in a fresh interpreter and reports the time of the import and the
+number of modules loaded by it. The best of all runs is the most stable figure, as the first runs
+may read from a cold file cache::
+
+    ./import_time.py --runs 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Run in a fresh interpreter, prints measurements as JSON.
+MEASURE = """
+import json, sys, time
+modules_before = set(sys.modules)
+start = time.perf_counter()
+import osaca.osaca
+duration = time.perf_counter() - start
+imported = sorted(set(sys.modules) - modules_before)
+print(json.dumps({"time": duration, "imported": imported}))
+"""
+
+# Dependencies which are expensive to import and should only be loaded when they are used.
+HEAVY_MODULES = ["networkx", "ruamel", "pyparsing", "matplotlib"]
+
+
+def measure():
+    env = dict(os.environ, PYTHONPATH=REPO_DIR)
+    output = subprocess.check_output([sys.executable, "-c", MEASURE], env=env)
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5, help="number of fresh interpreters")
+    args = parser.parse_args()
+
+    results = [measure() for _ in range(args.runs)]
+    times = [result["time"] for result in results]
+    print(
+        "import osaca.osaca: best {:.3f}s, median {:.3f}s of {} runs".format(
+            min(times), statistics.median(times), len(times)
+        )
+    )
+    imported = results[-1]["imported"]
+    heavy = sorted({m.split(".")[0] for m in imported if m.split(".")[0] in HEAVY_MODULES})
+    print("modules loaded: {}".format(len(imported)))
+    print("heavy dependencies loaded: {}".format(", ".join(heavy) or "none"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Asynchronous Python API of OSACA.
+
+The analysis runs in an executor, so it does not block the event loop::
+
+    import osaca.api
+
+    result = await osaca.api.analyze(code, arch="csx", deadline=5)
+
+Cancelling the awaiting task also stops the analysis: its :class:`~osaca.utils.Deadline` is
+cancelled and the analysis gives up at its next check.  Cancellation only reaches analyses
+running in threads, e.g., in the default executor of the event loop.  In a
+:class:`concurrent.futures.ProcessPoolExecutor`, only the expiry of the deadline is enforced.
+"""
+
+import argparse
+import asyncio
+
+from osaca.frontend import Frontend
+from osaca.osaca import analyze_code
+from osaca.utils import Deadline, DeadlineExceeded
+
+
+async def analyze(
+    code,
+    arch=None,
+    syntax=None,
+    lines=None,
+    fixed=False,
+    consider_flag_deps=False,
+    lcd_timeout=10,
+    deadline=None,
+    executor=None,
+):
+    """
+    Analyze assembly code without blocking the event loop.
+
+    :param str code: assembly code
+    :param str arch: micro-architecture code, defaults to the default uarch of the detected ISA
+    :param str syntax: assembly syntax for x86 (ATT or INTEL), defaults to auto-detection
+    :param str lines: line range to analyze (see ``--lines``), defaults to the marked kernel
+    :param bool fixed: use fixed port utilization instead of optimal port balancing
+    :param bool consider_flag_deps: consider flag dependencies
+    :param lcd_timeout: timeout in seconds of the LCD search, -1 for no timeout. Afterwards,
+                        the LCDs found so far are reported with an ``LCDWarning``.
+    :type lcd_timeout: int or :class:`~osaca.utils.Deadline`
+    :param deadline: deadline or timeout in seconds of the whole analysis, defaults to no limit
+    :type deadline: :class:`~osaca.utils.Deadline` or float, optional
+    :param executor: executor to run the analysis in, defaults to the default executor of the
+                     event loop
+    :type executor: :class:`concurrent.futures.Executor`, optional
+    :returns: `dict` -- analysis as returned by
+              :func:`~osaca.frontend.Frontend.full_analysis_dict`
+    :raises TimeoutError: if the deadline expired
+    :raises SyntaxError: if the code could not be parsed
+    """
+    if not isinstance(deadline, Deadline):
+        deadline = Deadline(deadline)
+    args = argparse.Namespace(
+        arch=arch.upper() if arch else None,
+        syntax=syntax.upper() if syntax else None,
+        lines=lines,
+        fixed=fixed,
+        legacy_balancing=False,
+        lcd_timeout=lcd_timeout,
+        consider_flag_deps=consider_flag_deps,
+    )
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(executor, _analyze, code, args, deadline)
+    except asyncio.CancelledError:
+        deadline.cancel()
+        raise
+
+
+def _analyze(code, args, deadline):
+    """Run the analysis for :func:`analyze` and return its dictionary."""
+    try:
+        arch, kernel, kernel_graph, arch_warning, length_warning = analyze_code(
+            code, args, deadline
+        )
+        return Frontend(arch=arch).full_analysis_dict(
+            kernel,
+            kernel_graph,
+            arch_warning=arch_warning,
+            length_warning=length_warning,
+            lcd_warning=kernel_graph.timed_out,
+        )
+    except DeadlineExceeded as e:
+        # raised for cancelled analyses as well, but their result is not awaited anymore
+        raise TimeoutError(str(e)) from None
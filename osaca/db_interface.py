@@ -1,11 +1,12 @@
 #!/usr/bin/env python3
 
+import json
 import math
 import os
 import re
 import sys
 import warnings
-from collections import OrderedDict
+from collections import Counter, OrderedDict
 
 import ruamel.yaml
 
@@ -16,11 +17,17 @@ from osaca.parser.immediate import ImmediateOperand
 from osaca.parser.instruction_form import InstructionForm
 
 
-def sanity_check(arch: str, verbose=False, internet_check=False, output_file=sys.stdout):
+def sanity_check(
+    arch: str, verbose=False, internet_check=False, output_file=sys.stdout, output_format="text"
+):
     """
     Checks the database for missing TP/LT values, instructions might missing int the ISA DB and
     duplicate instructions.
 
+    All checks are done in a single pass over both DBs: duplicates are found by the signature of
+    each instruction form (see :func:`~osaca.semantics.MachineModel.get_instruction_signature`)
+    and every instruction form is looked up at most once in the other DB.
+
     :param arch: micro-arch key to define DB to check
     :type arch: str
     :param verbose: verbose output flag, defaults to `False`
@@ -31,6 +38,9 @@ def sanity_check(arch: str, verbose=False, internet_check=False, output_file=sys
     :param output_file: output stream specifying where to write output,
                         defaults to :class:`sys.stdout`
     :type output_file: stream, optional
+    :param output_format: report format, either ``text`` (human-readable), ``yaml`` or ``json``,
+                          defaults to ``text``
+    :type output_format: str, optional
 
     :return: True if everything checked out
     """
@@ -54,6 +64,27 @@ def sanity_check(arch: str, verbose=False, internet_check=False, output_file=sys
     # check ISA DB entries
     duplicate_instr_isa, only_in_isa = _check_sanity_isa_db(arch_mm, isa_mm)
 
+    if output_format in ["yaml", "json"]:
+        report = _get_sanity_report_data(
+            arch_mm,
+            isa_mm,
+            num_of_instr,
+            missing_throughput,
+            missing_latency,
+            missing_port_pressure,
+            suspicious_instructions,
+            duplicate_instr_arch,
+            duplicate_instr_isa,
+            only_in_isa,
+            bad_operand,
+        )
+        if output_format == "json":
+            print(json.dumps(report, indent=2), file=output_file)
+        else:
+            _create_yaml_object().dump(report, output_file)
+        return report["ok"]
+    elif output_format != "text":
+        raise ValueError("Unknown report format {!r}".format(output_format))
     report = _get_sanity_report(
         num_of_instr,
         missing_throughput,
@@ -395,10 +426,16 @@ def _check_sanity_arch_db(arch_mm, isa_mm, internet_check=True):
     missing_port_pressure = []
     suspicious_instructions = []
     duplicate_instr_arch = []
-    duplicate_strings = []
     bad_operand = []
 
-    for instr_form in arch_mm["instruction_forms"]:
+    signatures = [
+        arch_mm.get_instruction_signature(instr_form["name"], instr_form["operands"])
+        for instr_form in arch_mm["instruction_forms"]
+    ]
+    signature_counts = Counter(signatures)
+    reported_duplicates = set()
+    suspicious_signatures = set()
+    for instr_form, signature in zip(arch_mm["instruction_forms"], signatures):
         # check value in DB entry
         if instr_form["throughput"] is None:
             missing_throughput.append(instr_form)
@@ -407,41 +444,39 @@ def _check_sanity_arch_db(arch_mm, isa_mm, internet_check=True):
         if instr_form["port_pressure"] is None:
             missing_port_pressure.append(instr_form)
         # check entry against ISA DB
-        for prefix in suspicious_prefixes:
-            if instr_form["name"].lower().startswith(prefix):
-                # check if instruction in ISA DB
-                if isa_mm.get_instruction(instr_form["name"], instr_form["operands"]) is None:
-                    # if not, mark them as suspicious and print it on the screen
-                    suspicious_instructions.append(instr_form)
+        name = instr_form["name"].lower()
+        is_suspicious = any(name.startswith(prefix) for prefix in suspicious_prefixes)
         # instr forms with less than 3 operands might need an ISA DB entry due to src_reg operands
-        if (
+        might_need_isa_entry = (
             len(instr_form["operands"]) < 3
             and len(instr_form["operands"]) > 1
-            and "mov" not in instr_form["name"].lower()
-            and not instr_form["name"].lower().startswith("j")
-            and instr_form not in suspicious_instructions
+            and "mov" not in name
+            and not name.startswith("j")
+        )
+        # look up ISA DB entry only if needed, forms with the same signature are listed once
+        if (
+            (is_suspicious or might_need_isa_entry)
+            and signature not in suspicious_signatures
             and isa_mm.get_instruction(instr_form["name"], instr_form["operands"]) is None
         ):
+            if is_suspicious:
+                # if not in ISA DB, mark them as suspicious and print it on the screen
+                suspicious_instructions.append(instr_form)
+                suspicious_signatures.add(signature)
             # validate with data from internet if connected flag is set
-            if internet_check:
+            elif internet_check:
                 is_susp, info_string = _scrape_from_felixcloutier(instr_form["name"])
                 if is_susp:
                     instr_form["note"] = info_string
                     suspicious_instructions.append(instr_form)
+                    suspicious_signatures.add(signature)
             else:
                 suspicious_instructions.append(instr_form)
-        # check for duplicates in DB
-        if arch_mm._check_for_duplicate(instr_form["name"], instr_form["operands"]):
+                suspicious_signatures.add(signature)
+        # check for duplicates in DB, report each of them once
+        if signature_counts[signature] > 1 and signature not in reported_duplicates:
+            reported_duplicates.add(signature)
             duplicate_instr_arch.append(instr_form)
-
-    # every entry exists twice --> uniquify
-    tmp_list = []
-    for _ in range(0, len(duplicate_instr_arch)):
-        tmp = duplicate_instr_arch.pop()
-        if _get_full_instruction_name(tmp).lower() not in duplicate_strings:
-            duplicate_strings.append(_get_full_instruction_name(tmp).lower())
-            tmp_list.append(tmp)
-    duplicate_instr_arch = tmp_list
     return (
         missing_throughput,
         missing_latency,
@@ -458,20 +493,20 @@ def _check_sanity_isa_db(arch_mm, isa_mm):
     duplicate_instr_isa = []
     only_in_isa = []
 
-    for instr_form in isa_mm["instruction_forms"]:
+    signatures = [
+        isa_mm.get_instruction_signature(instr_form["name"], instr_form["operands"])
+        for instr_form in isa_mm["instruction_forms"]
+    ]
+    signature_counts = Counter(signatures)
+    reported_duplicates = set()
+    for instr_form, signature in zip(isa_mm["instruction_forms"], signatures):
         # check if instr is missing in arch DB
         if arch_mm.get_instruction(instr_form["name"], instr_form["operands"]) is None:
             only_in_isa.append(instr_form)
-        # check for duplicates
-        if isa_mm._check_for_duplicate(instr_form["name"], instr_form["operands"]):
+        # check for duplicates, report each of them once
+        if signature_counts[signature] > 1 and signature not in reported_duplicates:
+            reported_duplicates.add(signature)
             duplicate_instr_isa.append(instr_form)
-    # every entry exists twice --> uniquify
-    tmp_list = []
-    for i in range(0, len(duplicate_instr_isa)):
-        tmp = duplicate_instr_isa.pop()
-        if tmp not in duplicate_instr_isa:
-            tmp_list.append(tmp)
-    duplicate_instr_isa = tmp_list
 
     return duplicate_instr_isa, only_in_isa
 
@@ -530,6 +565,44 @@ def _get_sanity_report(
     return s
 
 
+def _get_sanity_report_data(
+    arch_mm,
+    isa_mm,
+    total,
+    m_tp,
+    m_l,
+    m_pp,
+    suspic_instr,
+    dup_arch,
+    dup_isa,
+    only_isa,
+    bad_operands,
+):
+    """Get sanity report as dictionary for a machine-readable (YAML or JSON) output."""
+
+    def names(instruction_forms):
+        return sorted(_get_full_instruction_name(instr_form) for instr_form in instruction_forms)
+
+    return {
+        "arch": arch_mm.get_arch(),
+        "isa": isa_mm.get_ISA(),
+        "instruction_forms": total,
+        "ok": not any([m_pp, bad_operands]),
+        "missing_throughput": names(m_tp),
+        "missing_latency": names(m_l),
+        "missing_port_pressure": names(m_pp),
+        "suspicious_instructions": sorted(
+            _get_full_instruction_name(instr_form)
+            + (" -- " + instr_form["note"] if "note" in instr_form else "")
+            for instr_form in suspic_instr
+        ),
+        "duplicates_arch": names(dup_arch),
+        "duplicates_isa": names(dup_isa),
+        "only_in_isa": names(only_isa),
+        "bad_operands": names(bad_operands),
+    }
+
+
 def _get_sanity_report_verbose(
     total,
     m_tp,
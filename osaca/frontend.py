@@ -8,6 +8,7 @@ import os
 import re
 from datetime import datetime as dt
 
+from osaca.parser.instruction_form import InstructionForm
 from osaca.semantics import INSTR_FLAGS, ArchSemantics, KernelDG, MachineModel
 
 
@@ -211,6 +212,61 @@ class Frontend(object):
             + self.loopcarried_dependencies(kernel_dg.get_loopcarried_dependencies())
         )
 
+    def full_analysis_from_dict(self, analysis_dict, ignore_unknown=False, verbose=False):
+        """
+        Build the full analysis report like :func:`full_analysis` from a dictionary created by
+        :func:`full_analysis_dict` with ``text_report=True``, e.g., for a cached analysis.
+
+        :param analysis_dict: analysis including the ``TextReport`` entry
+        :type analysis_dict: dict
+        :param ignore_unknown: flag for ignore warning if performance data is missing, defaults to
+            `False`
+        :type ignore_unknown: boolean, optional
+        :param verbose: flag for verbosity level, defaults to False
+        :type verbose: boolean, optional
+        """
+        text_report = analysis_dict["TextReport"]
+        kernel = []
+        for entry, line in zip(analysis_dict["Kernel"], text_report["Lines"]):
+            instruction_form = InstructionForm(
+                mnemonic=entry["Instruction"],
+                comment_id=entry["Comment"],
+                line=line,
+                line_number=entry["LineNumber"],
+                throughput=entry["Throughput"],
+                port_pressure=list(entry["PortPressure"].values()),
+            )
+            instruction_form.flags = entry["Flags"]
+            instruction_form.port_uops = [
+                (port_uops["Cycles"], port_uops["Ports"]) for port_uops in entry["PortUops"]
+            ]
+            kernel.append(instruction_form)
+        cp_kernel = []
+        for line_number, latency_cp in text_report["CriticalPath"]:
+            instruction_form = InstructionForm(line_number=line_number)
+            instruction_form.latency_cp = latency_cp
+            cp_kernel.append(instruction_form)
+        dep_dict = {
+            dep: {
+                "latency": lcd["Latency"],
+                "root": InstructionForm(line=lcd["RootLine"]),
+                "dependencies": [
+                    (InstructionForm(line_number=line_number), latency)
+                    for line_number, latency in lcd["Dependencies"]
+                ],
+            }
+            for dep, lcd in text_report["LoopCarriedDependencies"].items()
+        }
+        warnings = analysis_dict["Warnings"]
+        return (
+            self._header_report()
+            + self._user_warnings_header("ArchWarning" in warnings, "LengthWarning" in warnings)
+            + self._symbol_map()
+            + self.combined_view(kernel, cp_kernel, dep_dict, ignore_unknown)
+            + self._user_warnings_footer("LCDWarning" in warnings)
+            + self.loopcarried_dependencies(dep_dict)
+        )
+
     def full_analysis_dict(
         self,
         kernel,
@@ -218,6 +274,7 @@ class Frontend(object):
         arch_warning=False,
         length_warning=False,
         lcd_warning=False,
+        text_report=False,
     ):
         """
         Create a dictionary of the full analysis for machine-readable output.
@@ -233,6 +290,10 @@ class Frontend(object):
         :type length_warning: boolean, optional
         :param lcd_warning: flag for additional user warning due to LCD analysis timed out
         :type lcd_warning: boolean, optional
+        :param text_report: flag for adding a ``TextReport`` entry with all information needed
+                            to build the full analysis report with
+                            :func:`full_analysis_from_dict`, defaults to `False`
+        :type text_report: boolean, optional
 
         :returns: dict -- a dict of the analysis
         """
@@ -258,7 +319,7 @@ class Frontend(object):
         if dep_dict:
             longest_lcd = max(dep_dict, key=lambda ln: dep_dict[ln]["latency"])
             lcd_sum = dep_dict[longest_lcd]["latency"]
-        return {
+        analysis_dict = {
             "Header": self._header_report_dict(),
             "Warnings": warnings,
             "Kernel": [
@@ -287,6 +348,7 @@ class Frontend(object):
                         }
                         for y in x.port_uops
                     ],
+                    "PortUopsOption": x.port_uops_option,
                     "Comment": x.comment,
                 }
                 for x in kernel
@@ -303,6 +365,23 @@ class Frontend(object):
                 "Ports": list(self._machine_model.get_ports()),
             },
         }
+        if text_report:
+            analysis_dict["TextReport"] = {
+                "Lines": [x.line for x in kernel],
+                "CriticalPath": [[x.line_number, x.latency_cp] for x in cp_kernel],
+                "LoopCarriedDependencies": {
+                    dep: {
+                        "Latency": dep_dict[dep]["latency"],
+                        "RootLine": dep_dict[dep]["root"].line,
+                        "Dependencies": [
+                            [instr.line_number, lat]
+                            for instr, lat in dep_dict[dep]["dependencies"]
+                        ],
+                    }
+                    for dep in dep_dict
+                },
+            }
+        return analysis_dict
 
     def combined_view(
         self,
@@ -2,24 +2,30 @@
 """CLI for OSACA"""
 
 import argparse
+import glob
 import io
+import json
+import multiprocessing
 import os
 import re
+import signal
 import sys
-from functools import lru_cache
+import threading
+from contextlib import contextmanager
+from functools import lru_cache, partial
 
-from ruamel.yaml import YAML
-
-from osaca.db_interface import import_benchmark_output, sanity_check
 from osaca.frontend import Frontend
-from osaca.parser import BaseParser, ParserAArch64, ParserX86ATT, ParserX86Intel
+from osaca.result_cache import ResultCache
+from osaca.parser import BaseParser, InstructionForm, Operand, get_parser
 from osaca.semantics import (
     INSTR_FLAGS,
     ArchSemantics,
     KernelDG,
     MachineModel,
-    reduce_to_section,
+    parse_marked_section,
 )
+from osaca.semantics import reduce_to_section  # noqa: F401 (re-exported for downstream tools)
+from osaca.utils import Deadline, DeadlineExceeded
 
 SUPPORTED_ARCHS = [
     "SNB",
@@ -125,6 +131,13 @@ def create_parser(parser=None):
         help="Run the throughput analysis with fixed probabilities for all suitable ports per "
         "instruction. Otherwise, OSACA will print the optimal port utilization for the kernel.",
     )
+    parser.add_argument(
+        "--legacy-balancing",
+        dest="legacy_balancing",
+        action="store_true",
+        help="Balance port utilization with the former heuristic in steps of 0.01 cy instead of "
+        "computing the exact optimum. Only useful for comparison with older results.",
+    )
     parser.add_argument(
         "--lines",
         type=str,
@@ -139,6 +152,14 @@ def create_parser(parser=None):
         help='Run a sanity check on the by "--arch" specified database. The output depends '
         "on the verbosity level.",
     )
+    parser.add_argument(
+        "--db-check-format",
+        dest="check_db_format",
+        choices=["text", "yaml", "json"],
+        default="text",
+        help="Output format of the DB sanity check: human-readable text (default) or a "
+        "machine-readable YAML or JSON report. Can be only used in combination with --db-check.",
+    )
     parser.add_argument(
         "--online",
         dest="internet_check",
@@ -196,6 +217,22 @@ def create_parser(parser=None):
         default=False,
         help="Consider flag dependencies (carry, zero, ...)",
     )
+    parser.add_argument(
+        "--result-cache",
+        dest="result_cache",
+        action="store_true",
+        help="Store analysis results in the OSACA cache directory and reuse them if the same "
+        "kernel is analyzed again with the same options and machine models.",
+    )
+    parser.add_argument(
+        "--result-cache-size",
+        dest="result_cache_size",
+        metavar="MIB",
+        type=int,
+        default=ResultCache.DEFAULT_MAX_SIZE // 1024**2,
+        help="Maximum size of the result cache in MiB, least recently used results are removed "
+        "first. Defaults to 100.",
+    )
     parser.add_argument(
         "--verbose", "-v", action="count", default=0, help="Increases verbosity level."
     )
@@ -222,6 +259,193 @@ def create_parser(parser=None):
     return parser
 
 
+def create_batch_parser(parser=None):
+    """
+    Return argparse parser for the ``osaca batch`` subcommand.
+
+    :param parser: Existing parser object to add the arguments, defaults to `None`
+    :type parser: :class:`~Argparse.ArgumentParser`
+    :returns: The newly created :class:`~Argparse.ArgumentParser` object.
+    """
+    if not parser:
+        parser = argparse.ArgumentParser(
+            prog="osaca batch",
+            description="Analyzes many marked kernels in one run and writes the results as one "
+            "combined YAML or JSON stream.",
+            epilog="For help, examples, documentation and bug reports go to:\nhttps://github.com"
+            "/RRZE-HPC/OSACA/ | License: AGPLv3",
+        )
+    parser.add_argument(
+        "--arch",
+        type=str,
+        help="Define architecture for all kernels. If no architecture is given, OSACA assumes a "
+        "default uarch for x86/AArch64 per kernel.",
+    )
+    parser.add_argument(
+        "--syntax",
+        type=str,
+        help="Define the assembly syntax (ATT, Intel) for x86. If no syntax is given, OSACA "
+        "tries to determine automatically the syntax to use.",
+    )
+    parser.add_argument(
+        "--fixed",
+        action="store_true",
+        help="Run the throughput analysis with fixed probabilities for all suitable ports per "
+        "instruction.",
+    )
+    parser.add_argument(
+        "--lines",
+        type=str,
+        help="Define lines that should be included in the analysis of every kernel.",
+    )
+    parser.add_argument(
+        "--lcd-timeout",
+        dest="lcd_timeout",
+        metavar="SECONDS",
+        type=int,
+        default=10,
+        help="Set timeout in seconds for LCD analysis per kernel. Defaults to 10."
+        " Set to -1 for no timeout.",
+    )
+    parser.add_argument(
+        "--consider-flag-deps",
+        "-f",
+        dest="consider_flag_deps",
+        action="store_true",
+        default=False,
+        help="Consider flag dependencies (carry, zero, ...)",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        metavar="N",
+        type=int,
+        default=1,
+        help="Number of worker processes analyzing kernels in parallel. Defaults to 1.",
+    )
+    parser.add_argument(
+        "--timeout",
+        metavar="SECONDS",
+        type=float,
+        default=None,
+        help="Wall-clock time limit per kernel. Kernels exceeding it are reported with status "
+        '"timeout" and the batch continues. Defaults to no limit.',
+    )
+    parser.add_argument(
+        "--manifest",
+        type=str,
+        default=None,
+        help="File listing one kernel path per line (relative to the manifest).",
+    )
+    parser.add_argument(
+        "--pattern",
+        type=str,
+        default="*.s",
+        help='File name pattern used to search directories. Defaults to "*.s".',
+    )
+    parser.add_argument(
+        "--format",
+        choices=["yaml", "json"],
+        default="yaml",
+        help="Output format: multi-document YAML stream or JSON lines. Defaults to yaml.",
+    )
+    parser.add_argument(
+        "--out",
+        "-o",
+        default=sys.stdout,
+        type=argparse.FileType("w"),
+        help="Write analysis to this file (default to stdout).",
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="*",
+        help="Assembly files, directories or glob patterns.",
+    )
+
+    return parser
+
+
+def create_serve_parser(parser=None):
+    """
+    Return argparse parser for the ``osaca serve`` subcommand.
+
+    :param parser: Existing parser object to add the arguments, defaults to `None`
+    :type parser: :class:`~Argparse.ArgumentParser`
+    :returns: The newly created :class:`~Argparse.ArgumentParser` object.
+    """
+    if not parser:
+        parser = argparse.ArgumentParser(
+            prog="osaca serve",
+            description="Runs OSACA as a server analyzing kernels sent as JSON over HTTP, either "
+            "on a local TCP port or a Unix socket.",
+            epilog="For help, examples, documentation and bug reports go to:\nhttps://github.com"
+            "/RRZE-HPC/OSACA/ | License: AGPLv3",
+        )
+    parser.add_argument(
+        "--host",
+        type=str,
+        default="127.0.0.1",
+        help='Address to listen on for HTTP. Defaults to "127.0.0.1".',
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8765,
+        help="TCP port to listen on for HTTP. Defaults to 8765.",
+    )
+    parser.add_argument(
+        "--socket",
+        metavar="PATH",
+        type=str,
+        default=None,
+        help="Listen on this Unix socket instead of a TCP port.",
+    )
+    parser.add_argument(
+        "--arch",
+        type=str,
+        action="append",
+        help="Micro-architecture to keep loaded, can be given several times. Defaults to all "
+        "supported micro-architectures. Requests for others are still answered.",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        metavar="N",
+        type=int,
+        default=None,
+        help="Number of worker processes analyzing kernels in parallel. Defaults to the number "
+        "of CPUs.",
+    )
+    parser.add_argument(
+        "--timeout",
+        metavar="SECONDS",
+        type=float,
+        default=None,
+        help="Wall-clock time limit per request. Kernels exceeding it are answered with status "
+        '"timeout". Defaults to no limit.',
+    )
+    parser.add_argument(
+        "--result-cache",
+        dest="result_cache",
+        action="store_true",
+        help="Store analysis results in the OSACA cache directory and reuse them for requests "
+        "with the same kernel, options and machine models.",
+    )
+    parser.add_argument(
+        "--result-cache-size",
+        dest="result_cache_size",
+        metavar="MIB",
+        type=int,
+        default=ResultCache.DEFAULT_MAX_SIZE // 1024**2,
+        help="Maximum size of the result cache in MiB. Defaults to 100.",
+    )
+    parser.add_argument(
+        "--verbose", "-v", action="count", default=0, help="Log every request to stderr."
+    )
+
+    return parser
+
+
 def check_arguments(args, parser):
     """
     Check arguments passed by user that are not checked by argparse itself.
@@ -231,26 +455,12 @@ def check_arguments(args, parser):
     """
     supported_import_files = ["ibench", "asmbench"]
 
-    # manually set CLX to CSX to support both abbreviations
-    if args.arch and args.arch.upper() == "CLX":
-        args.arch = "CSX"
     if args.arch is None and (args.check_db or "import_data" in args):
         parser.error(
             "DB check and data import cannot work with a default microarchitecture. "
             "Please see --help for all valid architecture codes."
         )
-    elif args.arch is not None and args.arch.upper() not in SUPPORTED_ARCHS:
-        parser.error(
-            "Microarchitecture not supported. Please see --help for all valid architecture codes."
-        )
-    if args.syntax and args.arch and MachineModel.get_isa_for_arch(args.arch) != "x86":
-        parser.error("Syntax can only be explicitly specified for an x86 microarchitecture")
-    if args.syntax:
-        args.syntax = args.syntax.upper()
-        if args.syntax not in SUPPORTED_SYNTAXES:
-            parser.error(
-                "Assembly syntax not supported. Please see --help for all valid assembly syntaxes."
-            )
+    check_arch_and_syntax(args, parser)
     if "import_data" in args and args.import_data not in supported_import_files:
         parser.error(
             "Microbenchmark not supported for data import. Please see --help for all valid "
@@ -258,6 +468,46 @@ def check_arguments(args, parser):
         )
     if args.internet_check and not args.check_db:
         parser.error("--online requires --check-db")
+    if args.check_db_format != "text" and not args.check_db:
+        parser.error("--db-check-format requires --db-check")
+
+
+def check_arch_and_syntax(args, parser):
+    """
+    Check the architecture and syntax arguments shared by all subcommands.
+
+    :param args: arguments given from :class:`~argparse.ArgumentParser` after parsing
+    :param parser: :class:`~argparse.ArgumentParser` object
+    """
+    try:
+        args.arch, args.syntax = validate_arch_and_syntax(args.arch, args.syntax)
+    except ValueError as e:
+        parser.error("{} Please see --help for all valid options.".format(e))
+
+
+def validate_arch_and_syntax(arch, syntax):
+    """
+    Check micro-architecture and assembly syntax of an analysis.
+
+    :param arch: micro-architecture code, `None` for auto-detection
+    :type arch: str, optional
+    :param syntax: assembly syntax, `None` for auto-detection
+    :type syntax: str, optional
+    :returns: `tuple` -- (arch, syntax) with CLX replaced by CSX and the syntax in upper case
+    :raises ValueError: if either is not supported or a syntax is given for a non-x86 uarch
+    """
+    # manually set CLX to CSX to support both abbreviations
+    if arch and arch.upper() == "CLX":
+        arch = "CSX"
+    if arch is not None and arch.upper() not in SUPPORTED_ARCHS:
+        raise ValueError("Microarchitecture {!r} not supported.".format(arch))
+    if syntax and arch and MachineModel.get_isa_for_arch(arch) != "x86":
+        raise ValueError("Syntax can only be explicitly specified for an x86 microarchitecture.")
+    if syntax:
+        syntax = syntax.upper()
+        if syntax not in SUPPORTED_SYNTAXES:
+            raise ValueError("Assembly syntax {!r} not supported.".format(syntax))
+    return arch, syntax
 
 
 def import_data(benchmark_type, arch, filepath, output_file=sys.stdout):
@@ -274,6 +524,8 @@ def import_data(benchmark_type, arch, filepath, output_file=sys.stdout):
                         defaults to :class:`sys.stdout`
     :type output_file: stream, optional
     """
+    from osaca.db_interface import import_benchmark_output
+
     if benchmark_type.lower() == "ibench":
         import_benchmark_output(arch, "ibench", filepath, output=output_file)
     elif benchmark_type.lower() == "asmbench":
@@ -328,13 +580,139 @@ def inspect(args, output_file=sys.stdout):
     # Read file
     code = args.file.read()
 
+    verbose = args.verbose
+    ignore_unknown = args.ignore_unknown
+    result_cache = None
+    # the graph export needs the kernel graph, which is not cached
+    if args.result_cache and args.dotpath is None:
+        result_cache = ResultCache(max_size=args.result_cache_size * 1024**2)
+        cache_key = get_result_cache_key(code, args)
+        analysis = result_cache.get(cache_key)
+        if analysis is not None:
+            _print_cached_analysis(analysis, args, output_file)
+            return
+    (
+        arch,
+        kernel,
+        kernel_graph,
+        print_arch_warning,
+        print_length_warning,
+    ) = analyze_code(code, args)
+    if args.dotpath is not None:
+        kernel_graph.export_graph(args.dotpath if args.dotpath != "." else None)
+    # Print analysis
+    frontend = Frontend(args.file.name, arch=arch)
+    print(
+        frontend.full_analysis(
+            kernel,
+            kernel_graph,
+            ignore_unknown=ignore_unknown,
+            arch_warning=print_arch_warning,
+            length_warning=print_length_warning,
+            lcd_warning=kernel_graph.timed_out,
+            verbose=verbose,
+        ),
+        file=output_file,
+    )
+    # results of a timed out LCD analysis depend on the machine load and are not cached
+    if result_cache is not None and not kernel_graph.timed_out:
+        result_cache.put(
+            cache_key,
+            frontend.full_analysis_dict(
+                kernel,
+                kernel_graph,
+                arch_warning=print_arch_warning,
+                length_warning=print_length_warning,
+                text_report=True,
+            ),
+        )
+    if args.yaml_out is not None:
+        from ruamel.yaml import YAML
+
+        yaml = YAML(typ="unsafe", pure=True)
+        yaml.dump(
+            frontend.full_analysis_dict(
+                kernel,
+                kernel_graph,
+                arch_warning=print_arch_warning,
+                length_warning=print_length_warning,
+                lcd_warning=kernel_graph.timed_out,
+            ),
+            args.yaml_out,
+        )
+
+
+def get_result_cache_key(code, args):
+    """
+    Return the key of the analysis of assembly code in the :class:`~osaca.result_cache.ResultCache`.
+
+    :param str code: assembly code
+    :param args: arguments given from :class:`~argparse.ArgumentParser` after parsing, only the
+                 ones used by :func:`analyze_code` are part of the key
+    :returns: `str` -- key
+    """
+    return ResultCache.get_key(
+        code,
+        [args.arch] if args.arch else DEFAULT_ARCHS.values(),
+        {
+            "arch": args.arch,
+            "syntax": args.syntax,
+            "lines": args.lines,
+            "fixed": args.fixed,
+            "legacy_balancing": args.legacy_balancing,
+            "lcd_timeout": args.lcd_timeout,
+            "consider_flag_deps": args.consider_flag_deps,
+        },
+    )
+
+
+def _print_cached_analysis(analysis, args, output_file=sys.stdout):
+    """
+    Print analysis result from the result cache like :func:`inspect`.
+
+    :param dict analysis: analysis as returned by
+                          :func:`~osaca.frontend.Frontend.full_analysis_dict` with
+                          ``text_report=True``
+    :param args: arguments given from :class:`~argparse.ArgumentParser` after parsing
+    :param output_file: Define the stream for output, defaults to :class:`sys.stdout`
+    :type output_file: stream, optional
+    """
+    frontend = Frontend(args.file.name, arch=analysis["Target"]["Name"])
+    print(
+        frontend.full_analysis_from_dict(
+            analysis, ignore_unknown=args.ignore_unknown, verbose=args.verbose
+        ),
+        file=output_file,
+    )
+    if args.yaml_out is not None:
+        analysis = dict(analysis, Header=frontend._header_report_dict())
+        del analysis["TextReport"]
+        from ruamel.yaml import YAML
+
+        yaml = YAML(typ="unsafe", pure=True)
+        yaml.dump(analysis, args.yaml_out)
+
+
+def analyze_code(code, args, deadline=None):
+    """
+    Run the analysis pipeline (parsing, semantics, port balancing and dependency graph) on
+    assembly code.
+
+    :param str code: assembly code
+    :param args: arguments given from :class:`~argparse.ArgumentParser` after parsing, only
+                 `arch`, `syntax`, `lines`, `fixed`, `legacy_balancing`, `lcd_timeout` and
+                 `consider_flag_deps` are used. `lcd_timeout` may also be a
+                 :class:`~osaca.utils.Deadline`.
+    :param deadline: deadline of the whole analysis, defaults to `None`
+    :type deadline: :class:`~osaca.utils.Deadline`, optional
+    :raises ~osaca.utils.DeadlineExceeded: if the deadline expired or was cancelled
+    :returns: `tuple` -- (arch, kernel, kernel graph, arch warning, length warning)
+    """
     # Detect ISA if necessary
     detected_isa, detected_syntax = BaseParser.detect_ISA(code)
     detected_arch = DEFAULT_ARCHS[detected_isa]
 
     print_arch_warning = not args.arch
-    verbose = args.verbose
-    ignore_unknown = args.ignore_unknown
 
     # If the arch/syntax is explicitly specified, that's the only thing we'll try.  Otherwise, we'll
     # look at all the possible archs/syntaxes, but with our detected arch/syntax last in the list,
@@ -361,14 +739,26 @@ def inspect(args, output_file=sys.stdout):
         if (syntax is not None) == (MachineModel.get_isa_for_arch(arch) == "x86")
     ]
 
-    # Parse file.
+    # Parse marked kernel or chosen section of file.
     message = ""
     single_combination = len(combinations_to_try) == 1
     while True:
         arch, syntax = combinations_to_try.pop()
         parser = get_asm_parser(arch, syntax)
         try:
-            parsed_code = parser.parse_file(code)
+            if args.lines:
+                line_range = set(get_line_range(args.lines))
+                kernel = []
+                for line_number, line in parser.iter_lines(code):
+                    if line_number in line_range:
+                        if deadline is not None:
+                            deadline.check()
+                        kernel.append(parser.parse_line(line, line_number))
+                print_length_warning = False
+            else:
+                kernel, marked = parse_marked_section(code, parser, deadline)
+                # Print warning if kernel has no markers and is larger than threshold (100)
+                print_length_warning = not marked and len(kernel) > 100
             break
         except Exception as e:
             message += f"\nWith arch {arch} and syntax {syntax} got error: {e}."
@@ -380,58 +770,313 @@ def inspect(args, output_file=sys.stdout):
             if not combinations_to_try:
                 raise SyntaxError(message) from e if single_combination else None
 
-    # Reduce to marked kernel or chosen section and add semantics
-    if args.lines:
-        line_range = get_line_range(args.lines)
-        kernel = [line for line in parsed_code if line.line_number in line_range]
-        print_length_warning = False
-    else:
-        kernel = reduce_to_section(parsed_code, parser)
-        # Print warning if kernel has no markers and is larger than threshold (100)
-        print_length_warning = (
-            True if len(kernel) == len(parsed_code) and len(kernel) > 100 else False
-        )
+    # Add semantics
     machine_model = MachineModel(arch=arch)
-    semantics = ArchSemantics(parser, machine_model)
+    semantics = get_arch_semantics(arch, syntax)
     semantics.normalize_instruction_forms(kernel)
-    semantics.add_semantics(kernel)
+    semantics.add_semantics(kernel, deadline)
     # Do optimal schedule for kernel throughput if wished
-    if not args.fixed:
-        semantics.assign_optimal_throughput(kernel)
-        semantics.assign_optimal_throughput(kernel)
+    if not args.fixed and args.legacy_balancing:
+        # the heuristic needs two passes to converge
+        semantics.assign_optimal_throughput(kernel, legacy=True, deadline=deadline)
+        semantics.assign_optimal_throughput(kernel, legacy=True, deadline=deadline)
+    elif not args.fixed:
+        semantics.assign_optimal_throughput(kernel, deadline=deadline)
 
     # Create DiGrahps
     kernel_graph = KernelDG(
-        kernel, parser, machine_model, semantics, args.lcd_timeout, args.consider_flag_deps
+        kernel,
+        parser,
+        machine_model,
+        semantics,
+        args.lcd_timeout,
+        args.consider_flag_deps,
+        deadline=deadline,
     )
-    if args.dotpath is not None:
-        kernel_graph.export_graph(args.dotpath if args.dotpath != "." else None)
-    # Print analysis
-    frontend = Frontend(args.file.name, arch=arch)
-    print(
-        frontend.full_analysis(
-            kernel,
-            kernel_graph,
-            ignore_unknown=ignore_unknown,
-            arch_warning=print_arch_warning,
-            length_warning=print_length_warning,
-            lcd_warning=kernel_graph.timed_out,
-            verbose=verbose,
-        ),
-        file=output_file,
+    return arch, kernel, kernel_graph, print_arch_warning, print_length_warning
+
+
+def batch_inspect(
+    files,
+    arch=None,
+    syntax=None,
+    lines=None,
+    fixed=False,
+    lcd_timeout=10,
+    consider_flag_deps=False,
+    jobs=1,
+    timeout=None,
+):
+    """
+    Analyze several kernel files and yield the machine-readable analysis of each of them.
+
+    Parsers, ISA/architecture semantics and machine models are created once per process and
+    reused for all files of the batch. With ``jobs > 1``, the kernels are distributed over a
+    pool of worker processes, but results are still yielded in the order of ``files``.
+
+    A kernel that fails does not abort the batch. The outcome of each kernel is stored in
+    ``["Header"]["Status"]`` (``ok``, ``timeout``, ``parse error`` or ``error``); failed
+    kernels only contain the header and an ``Error`` message.
+
+    :param files: paths of the assembly files to analyze
+    :type files: list
+    :param str arch: micro-architecture code, defaults to the default uarch of the detected ISA
+    :param str syntax: assembly syntax for x86 (ATT or INTEL), defaults to auto-detection
+    :param str lines: line range to analyze (see ``--lines``), defaults to the marked kernel
+    :param bool fixed: use fixed port utilization instead of optimal port balancing
+    :param int lcd_timeout: timeout in seconds for the LCD analysis per kernel, -1 for no timeout
+    :param bool consider_flag_deps: consider flag dependencies
+    :param int jobs: number of worker processes, defaults to 1 (analysis in this process)
+    :param timeout: wall-clock limit in seconds for the whole analysis of one kernel (only
+                    enforced on platforms supporting ``SIGALRM``), defaults to no limit
+    :type timeout: float, optional
+    :returns: generator of `dict` -- one :func:`~osaca.frontend.Frontend.full_analysis_dict`
+              per file, in the order of ``files``
+    """
+    args = argparse.Namespace(
+        arch=arch,
+        syntax=syntax.upper() if syntax else None,
+        lines=lines,
+        fixed=fixed,
+        legacy_balancing=False,
+        lcd_timeout=lcd_timeout,
+        consider_flag_deps=consider_flag_deps,
     )
-    if args.yaml_out is not None:
-        yaml = YAML(typ="unsafe", pure=True)
-        yaml.dump(
-            frontend.full_analysis_dict(
+    analyze = partial(_analyze_kernel_file, args=args, timeout=timeout)
+    if jobs is None or jobs > 1:
+        archs = [args.arch] if args.arch else [DEFAULT_ARCHS["x86"], DEFAULT_ARCHS["aarch64"]]
+        syntaxes = [args.syntax] if args.syntax else None
+        with multiprocessing.Pool(
+            jobs, initializer=_preload_models, initargs=(archs, syntaxes)
+        ) as pool:
+            yield from pool.imap(analyze, files)
+    else:
+        yield from map(analyze, files)
+
+
+@contextmanager
+def _time_limit(seconds):
+    """
+    Raise :class:`~osaca.utils.DeadlineExceeded` in the main thread after `seconds` of
+    wall-clock time, also in parts of the analysis not checking their deadline.
+    """
+    if (
+        not seconds
+        or not hasattr(signal, "SIGALRM")
+        or threading.current_thread() is not threading.main_thread()
+    ):
+        yield
+        return
+
+    def handler(signum, frame):
+        raise DeadlineExceeded()
+
+    old_handler = signal.signal(signal.SIGALRM, handler)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, old_handler)
+
+
+def _preload_models(archs, syntaxes=None):
+    """
+    Create parsers, semantics and machine models ahead of time, e.g., in a worker process.
+
+    :param list archs: micro-architecture codes
+    :param syntaxes: assembly syntaxes to load for x86 micro-architectures, defaults to ATT, as
+                     the Intel syntax parser is expensive to build and only needed for Intel
+                     syntax kernels
+    :type syntaxes: list, optional
+    """
+    for arch in archs:
+        if MachineModel.get_isa_for_arch(arch) == "x86":
+            for syntax in syntaxes or ["ATT"]:
+                get_arch_semantics(arch, syntax)
+        else:
+            get_arch_semantics(arch, None)
+
+
+def _analyze_kernel_file(filename, args, timeout=None, code=None, text_report=False):
+    """
+    Analyze a single kernel file for :func:`batch_inspect` without raising on failure.
+
+    :param code: assembly code of the kernel, read from `filename` if not given
+    :type code: str, optional
+    :param bool text_report: add the ``TextReport`` entry to the analysis, see
+                             :func:`~osaca.frontend.Frontend.full_analysis_dict`
+    :returns: `dict` -- analysis dictionary with the kernel status in its header
+    """
+    header = {"FileName": filename}
+    # The analysis stops itself at its next deadline check. The alarm is only a backstop for
+    # parts not checking the deadline, e.g., loading models, so it is armed with a grace period.
+    deadline = Deadline(timeout)
+    try:
+        with _time_limit(timeout + max(1, 0.1 * timeout) if timeout else None):
+            if code is None:
+                with open(filename, "r") as f:
+                    code = f.read()
+            (
+                arch,
+                kernel,
+                kernel_graph,
+                print_arch_warning,
+                print_length_warning,
+            ) = analyze_code(code, args, deadline)
+            frontend = Frontend(filename, arch=arch)
+            result = frontend.full_analysis_dict(
                 kernel,
                 kernel_graph,
                 arch_warning=print_arch_warning,
                 length_warning=print_length_warning,
                 lcd_warning=kernel_graph.timed_out,
+                text_report=text_report,
+            )
+    except DeadlineExceeded:
+        header["Status"] = "timeout"
+        return {"Header": header, "Error": "Analysis exceeded {} s.".format(timeout)}
+    except SyntaxError as e:
+        header["Status"] = "parse error"
+        return {"Header": header, "Error": str(e).strip()}
+    except Exception as e:
+        header["Status"] = "error"
+        return {"Header": header, "Error": "{}: {}".format(type(e).__name__, e)}
+    result["Header"]["Status"] = "ok"
+    return result
+
+
+def collect_kernel_files(paths, pattern="*.s", manifest=None):
+    """
+    Expand directories, glob patterns and an optional manifest file into a list of files.
+
+    :param paths: files, directories (searched recursively for ``pattern``) or glob patterns
+    :type paths: list
+    :param str pattern: file name pattern used for directories, defaults to ``*.s``
+    :param manifest: file listing one path per line, empty lines and lines starting with ``#``
+                     are ignored, defaults to `None`
+    :type manifest: str, optional
+    :returns: `list` -- file paths, duplicates removed
+    """
+    paths = list(paths)
+    if manifest is not None:
+        manifest_dir = os.path.dirname(manifest)
+        with open(manifest, "r") as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    paths.append(os.path.join(manifest_dir, line))
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            matches = sorted(glob.glob(os.path.join(path, "**", pattern), recursive=True))
+        elif os.path.isfile(path):
+            matches = [path]
+        else:
+            matches = sorted(glob.glob(path, recursive=True))
+            if not matches:
+                raise FileNotFoundError("No kernel file matches {!r}.".format(path))
+        files += [m for m in matches if os.path.isfile(m) and m not in files]
+    return files
+
+
+def write_batch_results(results, output_file=sys.stdout, output_format="yaml"):
+    """
+    Write analysis results as one combined stream, i.e., a multi-document YAML stream or
+    JSON lines.
+
+    :param results: analysis dictionaries as returned by :func:`batch_inspect`
+    :type results: iterable
+    :param output_file: Define the stream for output, defaults to :class:`sys.stdout`
+    :type output_file: stream, optional
+    :param str output_format: either ``yaml`` or ``json``, defaults to ``yaml``
+    """
+    if output_format == "yaml":
+        from ruamel.yaml import YAML
+
+        yaml = YAML(typ="unsafe", pure=True)
+        yaml.explicit_start = True
+        for result in results:
+            yaml.dump(result, output_file)
+            output_file.flush()
+    elif output_format == "json":
+        for result in results:
+            output_file.write(json.dumps(result, default=_to_serializable) + "\n")
+            output_file.flush()
+    else:
+        raise ValueError("Unknown output format {!r}.".format(output_format))
+
+
+def _to_serializable(obj):
+    """Convert objects (e.g., operands) to JSON serializable values."""
+    if isinstance(obj, (set, tuple)):
+        return list(obj)
+    if isinstance(obj, (InstructionForm, Operand)):
+        return {key.lstrip("_"): value for key, value in obj.__getstate__().items()}
+    if hasattr(obj, "__dict__"):
+        return {key.lstrip("_"): value for key, value in obj.__dict__.items()}
+    return str(obj)
+
+
+def run_batch(args, output_file=sys.stdout):
+    """
+    Entry point for the batch analysis of many kernel files.
+
+    :param args: arguments given from :func:`create_batch_parser` after parsing
+    :param output_file: Define the stream for output, defaults to :class:`sys.stdout`
+    :type output_file: stream, optional
+    """
+    files = collect_kernel_files(args.inputs, pattern=args.pattern, manifest=args.manifest)
+    write_batch_results(
+        batch_inspect(
+            files,
+            arch=args.arch,
+            syntax=args.syntax,
+            lines=args.lines,
+            fixed=args.fixed,
+            lcd_timeout=args.lcd_timeout,
+            consider_flag_deps=args.consider_flag_deps,
+            jobs=args.jobs,
+            timeout=args.timeout,
+        ),
+        output_file=output_file,
+        output_format=args.format,
+    )
+
+
+def run_serve(args, output_file=sys.stdout):
+    """
+    Entry point for the analysis server, runs until interrupted or terminated.
+
+    :param args: arguments given from :func:`create_serve_parser` after parsing
+    :param output_file: Define the stream for status messages, defaults to :class:`sys.stdout`
+    :type output_file: stream, optional
+    """
+    # imported here, since the server module builds on this one
+    from osaca.server import serve
+
+    def terminate(signum, frame):
+        raise KeyboardInterrupt()
+
+    # shut down worker processes and remove the socket file on termination as well
+    signal.signal(signal.SIGTERM, terminate)
+    try:
+        serve(
+            args.socket if args.socket is not None else (args.host, args.port),
+            archs=args.arch,
+            jobs=args.jobs,
+            timeout=args.timeout,
+            result_cache=(
+                ResultCache(max_size=args.result_cache_size * 1024**2)
+                if args.result_cache
+                else None
             ),
-            args.yaml_out,
+            verbose=args.verbose > 0,
+            output_file=output_file,
         )
+    except KeyboardInterrupt:
+        # interrupted while loading the models
+        pass
 
 
 def run(args, output_file=sys.stdout):
@@ -444,12 +1089,15 @@ def run(args, output_file=sys.stdout):
     """
     if args.check_db:
         # Sanity check on DB
+        from osaca.db_interface import sanity_check
+
         verbose = True if args.verbose > 0 else False
         sanity_check(
             args.arch,
             verbose=verbose,
             internet_check=args.internet_check,
             output_file=output_file,
+            output_format=args.check_db_format,
         )
     elif "import_data" in args:
         # Import microbench output file into DB
@@ -472,10 +1120,23 @@ def get_asm_parser(arch, syntax="ATT") -> BaseParser:
     :returns: :class:`~osaca.parser.BaseParser` object
     """
     isa = MachineModel.get_isa_for_arch(arch)
+    # only the parser of the ISA in use is imported, see osaca.parser
     if isa == "x86":
-        return ParserX86ATT() if syntax == "ATT" else ParserX86Intel()
+        return get_parser(isa, "ATT" if syntax == "ATT" else "INTEL")
     elif isa == "aarch64":
-        return ParserAArch64()
+        return get_parser(isa)
+
+
+@lru_cache()
+def get_arch_semantics(arch, syntax="ATT") -> ArchSemantics:
+    """
+    Helper function to create the architecture semantics for a specific architecture.
+
+    :param arch: architecture code
+    :type arch: str
+    :returns: :class:`~osaca.semantics.ArchSemantics` object
+    """
+    return ArchSemantics(get_asm_parser(arch, syntax), MachineModel(arch=arch))
 
 
 def get_unmatched_instruction_ratio(kernel):
@@ -502,8 +1163,44 @@ def get_line_range(line_str):
     return lines_int
 
 
+def _get_subcommand(argv):
+    """
+    Return the subcommand given as first argument, if any.
+
+    Kernel files named like a subcommand are analyzed instead.
+
+    :param list argv: command line arguments without the program name
+    :returns: `str` -- ``batch``, ``serve`` or `None`
+    """
+    if argv and argv[0] in ["batch", "serve"] and not os.path.isfile(argv[0]):
+        return argv[0]
+    return None
+
+
 def main():
     """Initialize and run command line interface."""
+    subcommand = _get_subcommand(sys.argv[1:])
+    if subcommand == "batch":
+        parser = create_batch_parser()
+        args = parser.parse_args(sys.argv[2:])
+        check_arch_and_syntax(args, parser)
+        if not args.inputs and args.manifest is None:
+            parser.error("Either kernel files, directories, glob patterns or --manifest needed.")
+        if args.jobs < 1:
+            parser.error("--jobs must be a positive number.")
+        run_batch(args, output_file=args.out)
+        return
+    if subcommand == "serve":
+        parser = create_serve_parser()
+        args = parser.parse_args(sys.argv[2:])
+        for i, arch in enumerate(args.arch or []):
+            arch_args = argparse.Namespace(arch=arch, syntax=None)
+            check_arch_and_syntax(arch_args, parser)
+            args.arch[i] = arch_args.arch.upper()
+        if args.jobs is not None and args.jobs < 1:
+            parser.error("--jobs must be a positive number.")
+        run_serve(args)
+        return
     parser = create_parser()
     args = parser.parse_args()
     check_arguments(args, parser)
@@ -2,13 +2,13 @@
 Collection of parsers supported by OSACA.
 
 Only the parsers below will be exported, so please add new parsers to __all__.
+The concrete parsers are imported on first access, so only the grammar of the ISA in use
+is loaded.
 """
 
+import importlib
+
 from .base_parser import BaseParser
-from .parser_x86 import ParserX86
-from .parser_x86att import ParserX86ATT
-from .parser_x86intel import ParserX86Intel
-from .parser_AArch64 import ParserAArch64
 from .instruction_form import InstructionForm
 from .operand import Operand
 
@@ -23,11 +23,39 @@ __all__ = [
     "get_parser",
 ]
 
+# modules of the parsers imported on first access
+_LAZY_PARSERS = {
+    "ParserX86": ".parser_x86",
+    "ParserX86ATT": ".parser_x86att",
+    "ParserX86Intel": ".parser_x86intel",
+    "ParserAArch64": ".parser_AArch64",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_PARSERS:
+        parser_class = getattr(importlib.import_module(_LAZY_PARSERS[name], __name__), name)
+        globals()[name] = parser_class
+        return parser_class
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
 
 def get_parser(isa, syntax="ATT"):
     if isa.lower() == "x86":
-        return ParserX86ATT() if syntax.upper() == "ATT" else ParserX86Intel()
+        if syntax.upper() == "ATT":
+            from .parser_x86att import ParserX86ATT
+
+            return ParserX86ATT()
+        from .parser_x86intel import ParserX86Intel
+
+        return ParserX86Intel()
     elif isa.lower() == "aarch64":
+        from .parser_AArch64 import ParserAArch64
+
         return ParserAArch64()
     else:
         raise ValueError("Unknown ISA {!r}.".format(isa))
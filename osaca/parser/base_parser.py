@@ -1,8 +1,14 @@
 #!/usr/bin/env python3
 """Parser superclass of specific parsers."""
 
+import multiprocessing
 import operator
+import os
 import re
+from collections import OrderedDict
+
+from osaca.parser.instruction_form import InstructionForm
+from osaca.parser.operand import freeze
 
 
 class BaseParser(object):
@@ -20,11 +26,20 @@ class BaseParser(object):
     operands = "operands"
     prefetch = "prfop"
     _parser_constructed = False
+    # files with fewer lines are always parsed sequentially, as starting worker processes and
+    # transferring the parsed instruction forms takes longer than parsing them. `None` disables
+    # parallel parsing for parsers whose results depend on previously parsed lines.
+    PARALLEL_MIN_LINES = 20000
+    # number of distinct lines, whose parsed operands are kept for reuse, 0 disables the cache
+    PARSE_CACHE_SIZE = 8192
+    _line_cache = None
 
     def __init__(self):
         if not self._parser_constructed:
             self.construct_parser()
             self._parser_constructed = True
+        if self._line_cache is None:
+            self._line_cache = OrderedDict()
 
     def isa(self):
         # Done in derived classes
@@ -84,28 +99,124 @@ class BaseParser(object):
 
         return max(matches.items(), key=operator.itemgetter(1))[0]
 
-    def parse_file(self, file_content, start_line=0):
+    def parse_file(self, file_content, start_line=0, jobs=1):
         """
         Parse assembly file. This includes *not* extracting of the marked kernel and
         the parsing of the instruction forms.
 
+        With ``jobs > 1``, the file is split into chunks of whole lines, which are parsed by a
+        pool of worker processes. The result is identical to sequential parsing. Files with less
+        than :attr:`PARALLEL_MIN_LINES` lines are always parsed sequentially.
+
         :param str file_content: assembly code
         :param int start_line: offset, if first line in file_content is meant to be not 1
+        :param int jobs: number of worker processes, defaults to 1 (sequential parsing). `None`
+                         uses all available CPUs.
         :return: list of instruction forms
         """
-        # Create instruction form list
-        asm_instructions = []
-        lines = file_content.split("\n")
-        for i, line in enumerate(lines):
-            if line.strip() == "":
-                continue
-            asm_instructions.append(self.parse_line(line, i + 1 + start_line))
-        return asm_instructions
+        if jobs is None:
+            jobs = os.cpu_count() or 1
+        if (
+            jobs > 1
+            and self.PARALLEL_MIN_LINES is not None
+            and file_content.count("\n") + 1 >= self.PARALLEL_MIN_LINES
+        ):
+            chunks = self._split_file(file_content, start_line, jobs * 4)
+            with multiprocessing.Pool(min(jobs, len(chunks))) as pool:
+                results = pool.map(_parse_chunk, [(type(self), chunk) for chunk in chunks])
+            instruction_forms = [form for result in results for form in result]
+            # operands shared by the line cache are unpickled as mutable objects
+            for instruction_form in instruction_forms:
+                freeze(instruction_form.operands)
+                freeze(instruction_form.directive)
+            return instruction_forms
+        return [
+            self.parse_line(line, line_number)
+            for line_number, line in self.iter_lines(file_content, start_line)
+        ]
+
+    @staticmethod
+    def _split_file(file_content, start_line, count):
+        """
+        Split assembly code into about `count` chunks of whole lines.
+
+        :returns: `list` of (code, start line) tuples
+        """
+        chunks = []
+        size = len(file_content) // count + 1
+        start = 0
+        while True:
+            end = file_content.find("\n", start + size)
+            if end == -1:
+                chunks.append((file_content[start:], start_line))
+                return chunks
+            chunks.append((file_content[start:end], start_line))
+            start_line += file_content.count("\n", start, end) + 1
+            start = end + 1
+
+    @staticmethod
+    def iter_lines(file_content, start_line=0):
+        """
+        Iterate lazily over all non-empty lines of assembly code without splitting it first.
+
+        :param str file_content: assembly code
+        :param int start_line: offset, if first line in file_content is meant to be not 1
+        :return: generator of (line number, line) tuples
+        """
+        start = 0
+        line_number = start_line
+        while start <= len(file_content):
+            end = file_content.find("\n", start)
+            if end == -1:
+                end = len(file_content)
+            line_number += 1
+            line = file_content[start:end]
+            if line.strip() != "":
+                yield line_number, line
+            start = end + 1
 
     def parse_line(self, line, line_number=None):
         # Done in derived classes
         raise NotImplementedError
 
+    def _parse_line_cached(self, line, line_number=None):
+        """
+        Parse line, reusing the operands of a previously parsed line with the same text.
+
+        Lines are looked up by their text without indentation (trailing whitespace is kept, as
+        the grammars do not always ignore it). The least recently used lines are evicted once
+        more than :attr:`PARSE_CACHE_SIZE` lines are cached. Each call
+        returns a new instruction form, but operands are shared between all forms of the same
+        line and are therefore frozen (see :meth:`~osaca.parser.operand.Operand.freeze`).
+        Parsers must implement `_parse_line_uncached` to use this method.
+
+        :param str line: line of assembly code
+        :param line_number: default None, identifier of instruction form
+        :type line_number: int, optional
+        :return: `InstructionForm` -- parsed asm line
+        """
+        key = line.lstrip()
+        cache = self._line_cache
+        parsed = cache.get(key)
+        if parsed is None:
+            parsed = self._parse_line_uncached(line, line_number)
+            freeze(parsed.operands)
+            freeze(parsed.directive)
+            cache[key] = parsed
+            while len(cache) > self.PARSE_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        return InstructionForm(
+            mnemonic=parsed.mnemonic,
+            operands=list(parsed.operands),
+            directive_id=parsed.directive,
+            comment_id=parsed.comment,
+            label_id=parsed.label,
+            line=line,
+            line_number=line_number,
+        )
+
     def parse_instruction(self, instruction):
         # Done in derived classes
         raise NotImplementedError
@@ -149,3 +260,18 @@ class BaseParser(object):
 
     def is_reg_dependend_of(self, reg_a, reg_b):
         raise NotImplementedError
+
+    def get_reg_dependency_key(self, register):
+        """
+        Return key equal for all registers ``register`` may depend on (and possibly others).
+
+        Dependent registers can be looked up by this key and are verified with
+        :func:`is_reg_dependend_of` afterwards. By default, all registers share the same key.
+        """
+        return None
+
+
+def _parse_chunk(args):
+    """Parse chunk of assembly code in worker process with its own parser instance."""
+    parser_class, (code, start_line) = args
+    return parser_class().parse_file(code, start_line)
@@ -4,6 +4,8 @@ from osaca.parser.operand import Operand
 
 
 class ConditionOperand(Operand):
+    __slots__ = ("_ccode",)
+
     def __init__(
         self,
         ccode=None,
@@ -4,6 +4,8 @@ from osaca.parser.operand import Operand
 
 
 class DirectiveOperand(Operand):
+    __slots__ = ("_name", "_parameters")
+
     def __init__(self, name=None, parameters=None):
         self._name = name
         self._parameters = parameters
@@ -4,6 +4,8 @@ from osaca.parser.operand import Operand
 
 
 class FlagOperand(Operand):
+    __slots__ = ("_name",)
+
     def __init__(self, name=None, source=False, destination=False):
         self._name = name
         super().__init__(source, destination)
@@ -4,6 +4,8 @@ from osaca.parser.operand import Operand
 
 
 class IdentifierOperand(Operand):
+    __slots__ = ("_name", "_offset", "_relocation")
+
     def __init__(self, name=None, offset=None, relocation=None, source=False, destination=False):
         super().__init__(source, destination)
         self._name = name
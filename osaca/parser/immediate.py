@@ -4,6 +4,8 @@ from osaca.parser.operand import Operand
 
 
 class ImmediateOperand(Operand):
+    __slots__ = ("_identifier", "_imd_type", "_value", "_shift")
+
     def __init__(
         self,
         identifier=None,
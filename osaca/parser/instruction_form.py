@@ -1,7 +1,36 @@
 #!/usr/bin/env python3
 
+from osaca.parser.operand import get_slot_state, set_slot_state
+
 
 class InstructionForm:
+    __slots__ = (
+        "_mnemonic",
+        "_llvm_name",
+        "_operands",
+        "_hidden_operands",
+        "_directive_id",
+        "_comment_id",
+        "_label_id",
+        "_line",
+        "_line_number",
+        "_semantic_operands",
+        "_operation",
+        "_uops",
+        "_breaks_dependency_on_equal_operands",
+        "_normalized",
+        "_latency",
+        "_throughput",
+        "_latency_cp",
+        "_latency_lcd",
+        "_latency_wo_load",
+        "_port_pressure",
+        "_port_uops",
+        "_port_uops_option",
+        "_flags",
+        "_reg_changes",
+    )
+
     def __init__(
         self,
         mnemonic=None,
@@ -44,8 +73,16 @@ class InstructionForm:
         self._latency_wo_load = None
         self._port_pressure = port_pressure
         self._port_uops = []
+        self._port_uops_option = None
         self._flags = []
 
+    def __getstate__(self):
+        # register changes are only memoized and recomputed on demand
+        return get_slot_state(self, exclude="_reg_changes")
+
+    def __setstate__(self, state):
+        set_slot_state(self, state)
+
     def check_normalized(self):
         if not self._normalized:
             raise AssertionError("Unnormalized instruction")
@@ -98,6 +135,10 @@ class InstructionForm:
     def port_uops(self):
         return self._port_uops
 
+    @property
+    def port_uops_option(self):
+        return self._port_uops_option
+
     @property
     def flags(self):
         return self._flags
@@ -118,10 +159,30 @@ class InstructionForm:
     def latency_wo_load(self):
         return self._latency_wo_load
 
+    @property
+    def latency_cp(self):
+        return self._latency_cp
+
+    @property
+    def latency_lcd(self):
+        return self._latency_lcd
+
     @property
     def operation(self):
         return self._operation
 
+    @property
+    def reg_changes(self):
+        """
+        Memo of :meth:`~osaca.semantics.isa_semantics.ISASemantics.get_reg_changes` results,
+        reset whenever operands or semantic operands are set.
+        """
+        try:
+            return self._reg_changes
+        except AttributeError:
+            self._reg_changes = {}
+            return self._reg_changes
+
     @property
     def breaks_dependency_on_equal_operands(self):
         return self._breaks_dependency_on_equal_operands
@@ -133,6 +194,7 @@ class InstructionForm:
     @semantic_operands.setter
     def semantic_operands(self, semantic_operands):
         self._semantic_operands = semantic_operands
+        self._reg_changes = {}
 
     @directive.setter
     def directive(self, directive):
@@ -149,6 +211,7 @@ class InstructionForm:
     @operands.setter
     def operands(self, operands):
         self._operands = operands
+        self._reg_changes = {}
 
     @hidden_operands.setter
     def hidden_operands(self, hidden_operands):
@@ -186,6 +249,10 @@ class InstructionForm:
     def port_uops(self, port_uops):
         self._port_uops = port_uops
 
+    @port_uops_option.setter
+    def port_uops_option(self, port_uops_option):
+        self._port_uops_option = port_uops_option
+
     @flags.setter
     def flags(self, flags):
         self._flags = flags
@@ -206,6 +273,14 @@ class InstructionForm:
     def latency(self, latency):
         self._latency = latency
 
+    @latency_cp.setter
+    def latency_cp(self, latency_cp):
+        self._latency_cp = latency_cp
+
+    @latency_lcd.setter
+    def latency_lcd(self, latency_lcd):
+        self._latency_lcd = latency_lcd
+
     @latency_wo_load.setter
     def latency_wo_load(self, latency_wo_load):
         self._latency_wo_load = latency_wo_load
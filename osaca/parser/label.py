@@ -4,6 +4,8 @@ from osaca.parser.operand import Operand
 
 
 class LabelOperand(Operand):
+    __slots__ = ("_name",)
+
     def __init__(self, name=None):
         self._name = name
 
@@ -4,6 +4,21 @@ from osaca.parser.operand import Operand
 
 
 class MemoryOperand(Operand):
+    __slots__ = (
+        "_offset",
+        "_base",
+        "_index",
+        "_scale",
+        "_segment_ext",
+        "_mask",
+        "_pre_indexed",
+        "_post_indexed",
+        "_indexed_val",
+        "_data_type",
+        "_src",
+        "_dst",
+    )
+
     def __init__(
         self,
         offset=None,
@@ -1,11 +1,51 @@
 #!/usr/bin/env python3
 
+_slot_names = {}
+
 
 class Operand:
+    # Machine models hold tens of thousands of operands, slots keep them small. Subclasses list
+    # their attributes in `__slots__` as well.
+    # Frozen operands are shared between instruction forms (see `BaseParser._parse_line_cached`)
+    # and must not be modified.
+    __slots__ = ("_frozen", "_source", "_destination")
+
+    def __new__(cls, *args, **kwargs):
+        operand = super().__new__(cls)
+        object.__setattr__(operand, "_frozen", False)
+        return operand
+
     def __init__(self, source=False, destination=False):
         self._source = source
         self._destination = destination
 
+    def __setattr__(self, name, value):
+        if self._frozen:
+            raise AttributeError(
+                "Cannot set {!r} of frozen operand {}, copy it first".format(
+                    name.lstrip("_"), self
+                )
+            )
+        object.__setattr__(self, name, value)
+
+    def freeze(self):
+        """Make operand and all nested operands immutable, so they can be shared safely."""
+        if not self._frozen:
+            for value in self.__getstate__().values():
+                freeze(value)
+            object.__setattr__(self, "_frozen", True)
+        return self
+
+    def __getstate__(self):
+        """
+        Return all set attributes, except for the frozen flag. Copies and unpickled operands are
+        therefore mutable and serialized operands look the same either way.
+        """
+        return get_slot_state(self, exclude="_frozen")
+
+    def __setstate__(self, state):
+        set_slot_state(self, state)
+
     @property
     def source(self):
         return self._source
@@ -27,3 +67,46 @@ class Operand:
 
     def __repr__(self):
         return self.__str__()
+
+
+def freeze(value):
+    """Freeze all operands in `value`, which may also be a (nested) list, tuple or dict."""
+    if isinstance(value, Operand):
+        value.freeze()
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            freeze(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            freeze(item)
+    return value
+
+
+def get_slot_state(obj, exclude=None):
+    """
+    Return set slot attributes of `obj` as dict, ordered from base class to subclass.
+
+    :param obj: object of class using `__slots__`
+    :param str exclude: name of attribute to leave out, optional
+    :returns: `dict` of attribute names and values
+    """
+    cls = type(obj)
+    names = _slot_names.get(cls)
+    if names is None:
+        names = _slot_names[cls] = [
+            name for base in reversed(cls.__mro__) for name in base.__dict__.get("__slots__", ())
+        ]
+    state = {}
+    for name in names:
+        if name != exclude:
+            try:
+                state[name] = getattr(obj, name)
+            except AttributeError:
+                pass
+    return state
+
+
+def set_slot_state(obj, state):
+    """Set attributes of `obj` from a dict as returned by :func:`get_slot_state`."""
+    for name, value in state.items():
+        object.__setattr__(obj, name, value)
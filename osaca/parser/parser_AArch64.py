@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+import re
 from copy import deepcopy
 import pyparsing as pp
 
@@ -18,6 +19,34 @@ from osaca.parser.prefetch import PrefetchOperand
 class ParserAArch64(BaseParser):
     _instance = None
 
+    # Regular expressions for the fast path of parse_line, covering the common line and operand
+    # shapes of compiler output. Everything else is handled by the pyparsing grammar.
+    _FAST_CHARS = re.compile(r"[\x20-\x7e\t\r]*")
+    _FAST_LABEL = re.compile(r"([A-Za-z_.][A-Za-z0-9_.]*):\s*(?://(.*))?")
+    _FAST_DIRECTIVE = re.compile(
+        r"\.([A-Za-z0-9_]+)(?:\s+({param}(?:,\s*{param})*))?".format(
+            param=r"(?:\"[^\"\\,]*\"|[A-Za-z#@.%][^,\s]*|-?0x[0-9a-fA-F]+|-?[0-9]+)"
+        )
+    )
+    _FAST_INSTRUCTION = re.compile(r"([A-Za-z0-9.]+)(?:\s+(.*))?")
+    _FAST_SCALAR = re.compile(r"([xwbhsdqXWBHSDQ])([0-9]+)(!)?")
+    _FAST_ALIAS = re.compile(r"sp|wsp|([xw])zr")
+    _FAST_VECTOR = re.compile(r"([vzVZ])([0-9]+)(?:\.([12468]+)?([A-Za-z]))?(?:\[([0-9]+)\])?")
+    _FAST_PREDICATE = re.compile(r"([pP])([0-9]+)(?:/([zmZM])|\.([12468]+)?([A-Za-z]))?")
+    _FAST_REGISTER_LIST = re.compile(r"\{\s*([^{}]*?)\s*\}(?:\[([0-9]+)\])?")
+    _FAST_INTEGER = re.compile(r"#?(-?0x[0-9a-fA-F]+|-?(?:0|[1-9][0-9]*))")
+    _FAST_FLOAT = re.compile(r"#?(-?[0-9]+\.[0-9]+)(?:[eE]([+-])([0-9]+))?([fF])?")
+    _FAST_SHIFT = re.compile(r"(lsl|lsr|asr|ror|sxtw|uxtw|uxtb)(?:\s*#([0-9]+)|\s+([0-9]+))?")
+    _FAST_MEMORY = re.compile(
+        r"\[\s*(x[0-9]+|sp)\s*(?:,\s*(?:"
+        r"#?(-?0x[0-9a-fA-F]+|-?(?:0|[1-9][0-9]*))|#?(:[A-Za-z0-9_]+:)([A-Za-z_.][A-Za-z0-9_.]*)|"
+        r"([xw])([0-9]+)(?:\s*,\s*(lsl|uxtw|sxtw|uxtb)(?:\s*#([0-9]+))?)?"
+        r")\s*)?\](!)?"
+    )
+    _FAST_IDENTIFIER = re.compile(r"(:[A-Za-z0-9_]+:)?([A-Za-z_.][A-Za-z0-9_.]*)")
+    _FAST_CONDITION = re.compile(r"eq|ne|cs|hs|cc|lo|mi|pl|vs|vc|hi|ls|ge|lt|gt|le|al", re.I)
+    _FAST_PREFETCH = re.compile(r"(pld|pst)(l[123])(keep|strm)", re.I)
+
     # Singelton pattern, as this is created very many times
     def __new__(cls):
         if cls._instance is None:
@@ -306,13 +335,28 @@ class ParserAArch64(BaseParser):
 
     def parse_line(self, line, line_number=None):
         """
-        Parse line and return instruction form.
+        Parse line and return instruction form. Recurring lines reuse the frozen operands of
+        their first occurrence, see :meth:`BaseParser._parse_line_cached`.
 
         :param str line: line of assembly code
         :param line_number: identifier of instruction form, defautls to None
         :type line_number: int, optional
         :return: `dict` -- parsed asm line (comment, label, directive or instruction form)
         """
+        return self._parse_line_cached(line, line_number)
+
+    def _parse_line_uncached(self, line, line_number=None):
+        """
+        Parse line and return instruction form without using the line cache.
+
+        :param str line: line of assembly code
+        :param line_number: identifier of instruction form, defautls to None
+        :type line_number: int, optional
+        :return: `dict` -- parsed asm line (comment, label, directive or instruction form)
+        """
+        instruction_form = self._parse_line_fast(line, line_number)
+        if instruction_form is not None:
+            return instruction_form
         instruction_form = InstructionForm(
             mnemonic=None,
             operands=[],
@@ -377,6 +421,291 @@ class ParserAArch64(BaseParser):
             instruction_form.comment = result.comment
         return instruction_form
 
+    def _parse_line_fast(self, line, line_number=None):
+        """
+        Parse common assembly lines without pyparsing.
+
+        The result is identical to the one of the pyparsing grammar. Lines not covered by the
+        fast path are left to the grammar.
+
+        :param str line: line of assembly code
+        :param line_number: default None, identifier of instruction form
+        :type line_number: int, optional
+        :return: `InstructionForm` -- parsed asm line or `None` if not covered by fast path
+        """
+        stripped = line.strip()
+        if not stripped or not self._FAST_CHARS.fullmatch(stripped):
+            return None
+        # 1. Comment
+        if stripped.startswith("//"):
+            return InstructionForm(
+                operands=[],
+                line=line,
+                line_number=line_number,
+                comment_id=" ".join(stripped[2:].split()),
+            )
+        # 2. Label
+        if ":" in stripped:
+            match = self._FAST_LABEL.fullmatch(stripped)
+            if match:
+                comment = match.group(2)
+                if comment is not None and not comment.strip():
+                    return None
+                return InstructionForm(
+                    operands=[],
+                    line=line,
+                    line_number=line_number,
+                    label_id=match.group(1),
+                    comment_id=" ".join(comment.split()) if comment is not None else None,
+                )
+        # 3. Directive
+        if stripped.startswith("."):
+            # trailing whitespace and comments become part of unquoted directive parameters
+            match = self._FAST_DIRECTIVE.fullmatch(line.lstrip())
+            if not match:
+                return None
+            parameters = match.group(2).split(",") if match.group(2) else []
+            return InstructionForm(
+                operands=[],
+                line=line,
+                line_number=line_number,
+                directive_id=DirectiveOperand(
+                    name=match.group(1), parameters=[parameter.strip() for parameter in parameters]
+                ),
+            )
+        # 4. Instruction
+        code, has_comment, comment = stripped.partition("//")
+        if has_comment and not comment.strip():
+            return None
+        match = self._FAST_INSTRUCTION.fullmatch(code.rstrip())
+        if not match:
+            return None
+        operands = []
+        if match.group(2):
+            operands = self._parse_operands_fast(self._split_operands(match.group(2)))
+            if operands is None:
+                return None
+        return InstructionForm(
+            line=line,
+            line_number=line_number,
+            mnemonic=match.group(1),
+            operands=operands,
+            comment_id=" ".join(comment.split()) if has_comment else None,
+        )
+
+    @staticmethod
+    def _split_operands(operands_string):
+        """Split operand string at commas outside of brackets and braces."""
+        operands = []
+        depth = 0
+        start = 0
+        for i, char in enumerate(operands_string):
+            if char in "[{":
+                depth += 1
+            elif char in "]}":
+                depth -= 1
+            elif char == "," and depth == 0:
+                operands.append(operands_string[start:i].strip())
+                start = i + 1
+        operands.append(operands_string[start:].strip())
+        return operands
+
+    def _parse_operands_fast(self, operand_strings):
+        """
+        Parse comma separated operand strings, merging shifts and post-indices with their
+        operand. Return `None` if any operand is not covered by the fast path.
+        """
+        operands = []
+        groups = 0
+        i = 0
+        while i < len(operand_strings):
+            operand_string = operand_strings[i]
+            following = operand_strings[i + 1] if i + 1 < len(operand_strings) else None
+            i += 1
+            if operand_string.startswith("["):
+                post_indexed = None
+                if following is not None and not operand_string.endswith("!"):
+                    match = self._FAST_INTEGER.fullmatch(following)
+                    if match:
+                        post_indexed = {"value": int(match.group(1), 0)}
+                        i += 1
+                    elif not following.startswith(("{", "[")):
+                        # any other immediate or identifier would be parsed as post-index
+                        return None
+                operand = self._parse_memory_fast(operand_string)
+                if operand is not None and post_indexed is not None:
+                    operand.post_indexed = post_indexed
+            else:
+                shift = None
+                if following is not None:
+                    shift = self._FAST_SHIFT.fullmatch(following)
+                    if shift:
+                        i += 1
+                operand = self._parse_operand_fast(operand_string, first=(groups == 0))
+                if shift:
+                    if isinstance(operand, ImmediateOperand) and operand.imd_type == "int":
+                        amount = shift.group(2) or shift.group(3)
+                        if amount is None:
+                            return None
+                        # arithmetic immediate, shift is applied to value
+                        operand = ImmediateOperand(
+                            imd_type="int",
+                            value=operand.value << int(amount),
+                            shift={"value": amount},
+                        )
+                    elif not (
+                        isinstance(operand, RegisterOperand)
+                        and (operand.prefix in "xwbhsdq" or operand.name in ("sp", "zr"))
+                    ):
+                        return None
+                    # shifts of register operands are not stored
+            if operand is None:
+                return None
+            operands.extend(operand) if isinstance(operand, list) else operands.append(operand)
+            groups += 1
+        if groups > 5:
+            return None
+        return operands
+
+    def _parse_operand_fast(self, operand_string, first=False):
+        """Parse common operand shapes, return `None` for any other operand."""
+        operand = self._parse_register_fast(operand_string)
+        if operand is not None:
+            return operand
+        if operand_string.startswith("{"):
+            return self._parse_register_list_fast(operand_string)
+        match = self._FAST_INTEGER.fullmatch(operand_string)
+        if match:
+            return ImmediateOperand(imd_type="int", value=int(match.group(1), 0))
+        match = self._FAST_FLOAT.fullmatch(operand_string)
+        if match:
+            mantissa, e_sign, exponent, float_suffix = match.groups()
+            imd_type = "float" if float_suffix else "double"
+            if exponent is None:
+                return ImmediateOperand(value=mantissa, imd_type=imd_type)
+            return ImmediateOperand(
+                imd_type=imd_type,
+                value={"mantissa": mantissa, "e_sign": e_sign, "exponent": exponent},
+            )
+        if first:
+            match = self._FAST_PREFETCH.fullmatch(operand_string)
+            if match:
+                return PrefetchOperand(
+                    type_id=[match.group(1).upper()],
+                    target=[match.group(2).upper()],
+                    policy=[match.group(3).upper()],
+                )
+        elif self._FAST_CONDITION.fullmatch(operand_string):
+            return ConditionOperand(ccode=operand_string.upper())
+        match = self._FAST_IDENTIFIER.fullmatch(operand_string.lstrip("#"))
+        if match and operand_string.count("#") <= 1:
+            return IdentifierOperand(name=match.group(2), relocation=match.group(1))
+        return None
+
+    def _parse_register_fast(self, register_string):
+        """Parse single register, return `None` if not covered by fast path."""
+        match = self._FAST_SCALAR.fullmatch(register_string)
+        if match:
+            return RegisterOperand(
+                prefix=match.group(1),
+                name=match.group(2),
+                pre_indexed=match.group(3) is not None,
+            )
+        match = self._FAST_ALIAS.fullmatch(register_string)
+        if match:
+            if match.group(1) is None:
+                return RegisterOperand(prefix="x", name="sp")
+            return RegisterOperand(prefix=match.group(1), name="zr")
+        match = self._FAST_VECTOR.fullmatch(register_string)
+        if match:
+            prefix, name, lanes, shape, index = match.groups()
+            return RegisterOperand(prefix=prefix, name=name, lanes=lanes, shape=shape, index=index)
+        match = self._FAST_PREDICATE.fullmatch(register_string)
+        if match:
+            prefix, name, predication, lanes, shape = match.groups()
+            return RegisterOperand(
+                prefix=prefix, name=name, lanes=lanes, shape=shape, predication=predication
+            )
+        return None
+
+    def _parse_register_list_fast(self, operand_string):
+        """Parse register list or range, return `None` if not covered by fast path."""
+        match = self._FAST_REGISTER_LIST.fullmatch(operand_string)
+        if not match:
+            return None
+        content, index = match.groups()
+        elements = [element.strip() for element in content.split(",")]
+        is_range = len(elements) == 1 and "-" in elements[0]
+        if is_range:
+            elements = [element.strip() for element in elements[0].split("-")]
+            if len(elements) != 2:
+                return None
+        registers = []
+        for element in elements:
+            register = self._parse_register_fast(element)
+            if (
+                register is None
+                or register.prefix not in "vzxwbhsdq"
+                or register.name in ("sp", "zr")
+                or register.pre_indexed
+                or register.predication is not None
+                or register.index is not None
+            ):
+                return None
+            if index is not None:
+                register.index = int(index, 0)
+            registers.append(register)
+        if is_range:
+            start, end = registers
+            registers = []
+            for name in range(int(start.name), int(end.name) + 1):
+                register = deepcopy(start)
+                register.name = str(name)
+                registers.append(register)
+        return registers
+
+    def _parse_memory_fast(self, memory_string):
+        """Parse memory address, return `None` if not covered by fast path."""
+        match = self._FAST_MEMORY.fullmatch(memory_string)
+        if not match:
+            return None
+        (
+            base,
+            offset_value,
+            relocation,
+            offset_name,
+            index_prefix,
+            index_name,
+            shift_op,
+            shift,
+            pre_indexed,
+        ) = match.groups()
+        offset = None
+        if offset_value is not None:
+            offset = ImmediateOperand(value=int(offset_value, 0))
+        elif offset_name is not None:
+            offset = IdentifierOperand(name=offset_name, relocation=relocation)
+        index = None
+        scale = 1
+        if index_name is not None:
+            index = RegisterOperand(
+                name=index_name,
+                prefix=index_prefix,
+                shift=[{"value": shift}] if shift is not None else None,
+                shift_op=shift_op,
+            )
+            if shift is not None:
+                scale = 2 ** int(shift)
+        memory = MemoryOperand(
+            offset=offset,
+            base=RegisterOperand(name=base if base == "sp" else base[1:], prefix="x"),
+            index=index,
+            scale=scale,
+        )
+        if pre_indexed:
+            memory.pre_indexed = True
+        return memory
+
     def parse_instruction(self, instruction):
         """
         Parse instruction in asm line.
@@ -716,6 +1045,10 @@ class ParserAArch64(BaseParser):
                 return True
         return False
 
+    def get_reg_dependency_key(self, register):
+        """Return key equal for all registers ``register`` may depend on"""
+        return register.name
+
     def get_reg_type(self, register):
         """Get register type"""
         return register.prefix
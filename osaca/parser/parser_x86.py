@@ -6,6 +6,16 @@ from osaca.parser import BaseParser
 
 class ParserX86(BaseParser):
     _instance = None
+    # basic GPRs sharing the same physical register
+    GPR_GROUPS = {
+        "A": ["RAX", "EAX", "AX", "AH", "AL"],
+        "B": ["RBX", "EBX", "BX", "BH", "BL"],
+        "C": ["RCX", "ECX", "CX", "CH", "CL"],
+        "D": ["RDX", "EDX", "DX", "DH", "DL"],
+        "SP": ["RSP", "ESP", "SP", "SPL"],
+        "SRC": ["RSI", "ESI", "SI", "SIL"],
+        "DST": ["RDI", "EDI", "DI", "DIL"],
+    }
 
     # Singleton pattern, as this is created very many times.
     def __new__(cls):
@@ -35,18 +45,9 @@ class ParserX86(BaseParser):
                     return True
             return False
         # Check basic GPRs
-        gpr_groups = {
-            "A": ["RAX", "EAX", "AX", "AH", "AL"],
-            "B": ["RBX", "EBX", "BX", "BH", "BL"],
-            "C": ["RCX", "ECX", "CX", "CH", "CL"],
-            "D": ["RDX", "EDX", "DX", "DH", "DL"],
-            "SP": ["RSP", "ESP", "SP", "SPL"],
-            "SRC": ["RSI", "ESI", "SI", "SIL"],
-            "DST": ["RDI", "EDI", "DI", "DIL"],
-        }
         if self.is_basic_gpr(reg_a):
             if self.is_basic_gpr(reg_b):
-                for dep_group in gpr_groups.values():
+                for dep_group in self.GPR_GROUPS.values():
                     if reg_a_name in dep_group:
                         if reg_b_name in dep_group:
                             return True
@@ -61,6 +62,22 @@ class ParserX86(BaseParser):
         # No dependencies
         return False
 
+    def get_reg_dependency_key(self, register):
+        """Return key equal for all registers ``register`` may depend on"""
+        name = register.name.upper()
+        if self.is_vector_register(register):
+            # registers in the same vector space, e.g., XMM1 and YMM1
+            return name[1:]
+        if self.is_basic_gpr(register):
+            for group, dep_group in self.GPR_GROUPS.items():
+                if name in dep_group:
+                    return group
+            return name
+        match = re.match(r"R([0-9]+)[DWB]?", name)
+        if match:
+            return "R" + match.group(1)
+        return name
+
     def is_basic_gpr(self, register):
         """Check if register is a basic general purpose register (ebi, rax, ...)"""
         if any(char.isdigit() for char in register.name) or any(
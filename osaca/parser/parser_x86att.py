@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
 
+import re
+
 import pyparsing as pp
 
 from osaca.parser import ParserX86
@@ -16,6 +18,27 @@ class ParserX86ATT(ParserX86):
     _instance = None
     GAS_SUFFIXES = "bswlqt"
 
+    # Regular expressions for the fast path of parse_line, covering the common line and operand
+    # shapes of compiler output. Everything else is handled by the pyparsing grammar.
+    _FAST_CHARS = re.compile(r"[\x20-\x7e\t\r\f\v]*")
+    _FAST_COMMENT = re.compile(r"(#|//)(.*)")
+    _FAST_LABEL = re.compile(r"([A-Za-z_.][A-Za-z0-9_.$]*|[0-9]+):\s*(?:(?:#|//)(.*))?")
+    _FAST_DIRECTIVE = re.compile(
+        r"\.([A-Za-z0-9_]+)(?:\s+((?:[^\"'#]|\"[^\"\s,#\\]*\")*))?(?:#(.*))?"
+    )
+    _FAST_INSTRUCTION = re.compile(r"([A-Za-z0-9]+)(?:\s+([^#/]*))?(?:(?:#|//)(.*))?")
+    _FAST_REGISTER = re.compile(
+        r"%([A-Za-z0-9]+)(?:\s*\{\s*%?([A-Za-z0-9]+)\s*\}(?:\s*\{\s*z\s*\})?)?"
+    )
+    _FAST_IMMEDIATE = re.compile(
+        r"\$(?:(-?0x[0-9a-fA-F]+|-?(?:0|[1-9][0-9]*))|([A-Za-z_.][\w.$]*))"
+    )
+    _FAST_MEMORY = re.compile(
+        r"\*?(?:(-?0x[0-9a-fA-F]+|-?(?:0|[1-9][0-9]*))|([A-Za-z_.][\w.$]*))?"
+        r"\(\s*(?:%([A-Za-z0-9]+))?\s*(?:,\s*%([A-Za-z0-9]+)\s*(?:,\s*([1248])\s*)?)?\)"
+    )
+    _FAST_IDENTIFIER = re.compile(r"[A-Za-z_.][\w.$]*")
+
     # Singelton pattern, as this is created very many times
     def __new__(cls):
         if cls._instance is None:
@@ -275,13 +298,28 @@ class ParserX86ATT(ParserX86):
 
     def parse_line(self, line, line_number=None):
         """
-        Parse line and return instruction form.
+        Parse line and return instruction form. Recurring lines reuse the frozen operands of
+        their first occurrence, see :meth:`BaseParser._parse_line_cached`.
+
+        :param str line: line of assembly code
+        :param line_number: default None, identifier of instruction form
+        :type line_number: int, optional
+        :return: ``dict`` -- parsed asm line (comment, label, directive or instruction form)
+        """
+        return self._parse_line_cached(line, line_number)
+
+    def _parse_line_uncached(self, line, line_number=None):
+        """
+        Parse line and return instruction form without using the line cache.
 
         :param str line: line of assembly code
         :param line_number: default None, identifier of instruction form
         :type line_number: int, optional
         :return: ``dict`` -- parsed asm line (comment, label, directive or instruction form)
         """
+        instruction_form = self._parse_line_fast(line, line_number)
+        if instruction_form is not None:
+            return instruction_form
         instruction_form = InstructionForm(line=line, line_number=line_number)
         result = None
 
@@ -333,6 +371,131 @@ class ParserX86ATT(ParserX86):
             instruction_form.comment = result.comment
         return instruction_form
 
+    def _parse_line_fast(self, line, line_number=None):
+        """
+        Parse common assembly lines without pyparsing.
+
+        The result is identical to the one of the pyparsing grammar. Lines not covered by the
+        fast path are left to the grammar.
+
+        :param str line: line of assembly code
+        :param line_number: default None, identifier of instruction form
+        :type line_number: int, optional
+        :return: `InstructionForm` -- parsed asm line or `None` if not covered by fast path
+        """
+        stripped = line.strip()
+        if not self._FAST_CHARS.fullmatch(stripped):
+            return None
+        # 1. Comment
+        match = self._FAST_COMMENT.fullmatch(stripped)
+        if match:
+            return InstructionForm(
+                line=line, line_number=line_number, comment_id=" ".join(match.group(2).split())
+            )
+        # 2. Label
+        if ":" in stripped:
+            match = self._FAST_LABEL.fullmatch(stripped)
+            if not match:
+                # e.g., identifiers with spaces or segment registers
+                return None
+            comment = match.group(2)
+            return InstructionForm(
+                line=line,
+                line_number=line_number,
+                label_id=match.group(1),
+                comment_id=" ".join(comment.split()) if comment is not None else None,
+            )
+        # 3. Directive
+        if stripped.startswith("."):
+            match = self._FAST_DIRECTIVE.fullmatch(stripped)
+            if not match:
+                return None
+            parameters = [
+                parameter for parameter in re.split(r"[\s,]+", match.group(2) or "") if parameter
+            ]
+            comment = match.group(3)
+            return InstructionForm(
+                line=line,
+                line_number=line_number,
+                directive_id=DirectiveOperand(name=match.group(1), parameters=parameters),
+                comment_id=" ".join(comment.split()) if comment is not None else None,
+            )
+        # 4. Instruction
+        match = self._FAST_INSTRUCTION.fullmatch(stripped)
+        if not match or match.group(1) in ("data16", "data32"):
+            return None
+        operands = []
+        if match.group(2):
+            for i, operand_string in enumerate(self._split_operands(match.group(2))):
+                operand = self._parse_operand_fast(operand_string, first=(i == 0))
+                if operand is None:
+                    return None
+                operands.append(operand)
+            if len(operands) > 4:
+                return None
+        comment = match.group(3)
+        return InstructionForm(
+            line=line,
+            line_number=line_number,
+            mnemonic=match.group(1),
+            operands=operands,
+            comment_id=" ".join(comment.split()) if comment is not None else None,
+        )
+
+    @staticmethod
+    def _split_operands(operands_string):
+        """Split operand string at commas outside of parentheses and braces."""
+        operands = []
+        depth = 0
+        start = 0
+        for i, char in enumerate(operands_string):
+            if char in "({":
+                depth += 1
+            elif char in ")}":
+                depth -= 1
+            elif char == "," and depth == 0:
+                operands.append(operands_string[start:i].strip())
+                start = i + 1
+        operands.append(operands_string[start:].strip())
+        return operands
+
+    def _parse_operand_fast(self, operand_string, first=False):
+        """Parse common operand shapes, return `None` for any other operand."""
+        if operand_string.startswith("%"):
+            match = self._FAST_REGISTER.fullmatch(operand_string)
+            if match:
+                return RegisterOperand(
+                    name=match.group(1),
+                    mask=RegisterOperand(name=match.group(2)) if match.group(2) else None,
+                )
+            return None
+        if operand_string.startswith("$"):
+            match = self._FAST_IMMEDIATE.fullmatch(operand_string)
+            if match and match.group(1):
+                return ImmediateOperand(value=int(match.group(1), 0))
+            if match:
+                return IdentifierOperand(name=match.group(2))
+            return None
+        match = self._FAST_MEMORY.fullmatch(operand_string)
+        if match:
+            value, name, base, index, scale = match.groups()
+            if base is None and index is None:
+                return None
+            offset = None
+            if value is not None:
+                offset = ImmediateOperand(value=int(value, 0))
+            elif name is not None:
+                offset = IdentifierOperand(name=name)
+            return MemoryOperand(
+                offset=offset,
+                base=RegisterOperand(name=base) if base else None,
+                index=RegisterOperand(name=index) if index else None,
+                scale=int(scale) if scale else 1,
+            )
+        if first and self._FAST_IDENTIFIER.fullmatch(operand_string):
+            return IdentifierOperand(name=operand_string)
+        return None
+
     def parse_instruction(self, instruction):
         """
         Parse instruction in asm line.
@@ -31,6 +31,8 @@ NON_ASCII_PRINTABLE_CHARACTERS = "".join(
 #   Intel Architecture Code Analyzer User's Guide, https://www.intel.com/content/dam/develop/external/us/en/documents/intel-architecture-code-analyzer-3-0-users-guide-157552.pdf.
 class ParserX86Intel(ParserX86):
     _instance = None
+    # "=" directives define symbols used by later lines, so the file cannot be parsed in chunks.
+    PARALLEL_MIN_LINES = None
 
     # Singleton pattern, as this is created very many times.
     def __new__(cls):
@@ -4,6 +4,8 @@ from osaca.parser.operand import Operand
 
 
 class PrefetchOperand(Operand):
+    __slots__ = ("_type_id", "_target", "_policy")
+
     def __init__(self, type_id=None, target=None, policy=None):
         self._type_id = type_id
         self._target = target
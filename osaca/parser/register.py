@@ -4,6 +4,23 @@ from osaca.parser.operand import Operand
 
 
 class RegisterOperand(Operand):
+    __slots__ = (
+        "_name",
+        "_width",
+        "_prefix",
+        "_regtype",
+        "_lanes",
+        "_shape",
+        "_index",
+        "_mask",
+        "_zeroing",
+        "_predication",
+        "_pre_indexed",
+        "_post_indexed",
+        "_shift",
+        "_shift_op",
+    )
+
     def __init__(
         self,
         name=None,
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Persistent cache for analysis results.
+
+Results are stored content-addressed, i.e., under the hash of everything they depend on: the
+assembly code, the analysis options, the OSACA version and the machine models used.  Unchanged
+kernels are therefore never analyzed twice, while any change of the code, the options or the
+models leads to a new analysis.  The total size of the cache is bounded, the least recently used
+results are evicted first.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+
+from osaca import __version__, utils
+from osaca.semantics import MachineModel
+from osaca.semantics.model_cache import get_model_hash
+
+
+class ResultCache(object):
+    """Content-addressed cache of analysis results with size-bounded LRU eviction."""
+
+    # default maximum size of all cached results in bytes
+    DEFAULT_MAX_SIZE = 100 * 1024**2
+    SUFFIX = ".result"
+
+    def __init__(self, cache_dir=None, max_size=DEFAULT_MAX_SIZE):
+        """
+        Constructor method.
+
+        :param cache_dir: directory of the cached results, defaults to ``results`` in
+                          :data:`osaca.utils.CACHE_DIR`
+        :type cache_dir: str, optional
+        :param int max_size: maximum size of all cached results in bytes, defaults to
+                             :attr:`DEFAULT_MAX_SIZE`
+        """
+        self.cache_dir = cache_dir or os.path.join(utils.CACHE_DIR, "results")
+        self.max_size = max_size
+
+    @staticmethod
+    def get_key(code, archs, options):
+        """
+        Return key of the analysis of assembly code.
+
+        :param str code: assembly code
+        :param list archs: micro-architectures the analysis may use, their machine models and
+                           ISA models are hashed
+        :param dict options: all options affecting the result of the analysis
+        :returns: `str` -- hex digest identifying the analysis
+        """
+        models = {}
+        for arch in sorted(set(arch.lower() for arch in archs)):
+            for name in [arch, "isa/" + MachineModel.get_isa_for_arch(arch)]:
+                if name not in models:
+                    models[name] = get_model_hash(utils.find_datafile(name + ".yml"))
+        key = {
+            "version": __version__,
+            "internal_version": MachineModel.INTERNAL_VERSION,
+            "models": models,
+            "options": options,
+        }
+        sha256 = hashlib.sha256(json.dumps(key, sort_keys=True).encode())
+        # Line endings and trailing whitespace do not change the analysis
+        for line in code.splitlines():
+            sha256.update(line.rstrip().encode())
+            sha256.update(b"\n")
+        return sha256.hexdigest()
+
+    def _get_path(self, key):
+        return os.path.join(self.cache_dir, key + self.SUFFIX)
+
+    def get(self, key):
+        """
+        Return cached result or `None` if not cached.
+
+        :param str key: key as returned by :func:`get_key`
+        """
+        path = self._get_path(key)
+        try:
+            with open(path, "rb") as f:
+                result = pickle.load(f)
+            # the modification time marks the last use for the LRU eviction
+            os.utime(path)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return None
+        return result
+
+    def put(self, key, result):
+        """
+        Store result and evict least recently used results if the cache exceeds its size.
+
+        Failures to write are ignored, since caching is optional.
+
+        :param str key: key as returned by :func:`get_key`
+        :param result: picklable analysis result
+        """
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # write to temporary file first, so concurrent readers never see partial files
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, self._get_path(key))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            self.evict()
+        except OSError:
+            pass
+
+    def evict(self):
+        """Remove least recently used results until the cache does not exceed its size."""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(self.SUFFIX):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            total_size -= size
@@ -9,12 +9,13 @@ from .arch_semantics import ArchSemantics
 from .hw_model import MachineModel
 from .kernel_dg import KernelDG
 from .marker_utils import reduce_to_section, find_basic_blocks, find_basic_loop_bodies
-from .marker_utils import find_jump_labels
+from .marker_utils import find_jump_labels, parse_marked_section
 
 __all__ = [
     "MachineModel",
     "KernelDG",
     "reduce_to_section",
+    "parse_marked_section",
     "ArchSemantics",
     "ISASemantics",
     "INSTR_FLAGS",
@@ -3,17 +3,22 @@
 
 import sys
 import warnings
+from collections import defaultdict
 from itertools import chain
 from operator import itemgetter
 from copy import deepcopy
 
 from .hw_model import MachineModel
 from .isa_semantics import INSTR_FLAGS, ISASemantics
+from .port_balancing import EPS, PortPressureMatrix, balance_port_load
 from osaca.parser.memory import MemoryOperand
 from osaca.parser.register import RegisterOperand
 
 
 class ArchSemantics(ISASemantics):
+    # maximum number of evaluated choices for instructions with multiple port assignment options
+    PORT_OPTIONS_SEARCH_LIMIT = 10000
+
     def __init__(self, parser, machine_model: MachineModel, path_to_yaml=None):
         super().__init__(parser, path_to_yaml=path_to_yaml)
         self._machine_model = machine_model
@@ -32,54 +37,305 @@ class ArchSemantics(ISASemantics):
             instruction_form.check_normalized()
 
     # SUMMARY FUNCTION
-    def add_semantics(self, kernel):
+    def add_semantics(self, kernel, deadline=None):
         """
         Applies performance data (throughput, latency, port pressure) and source/destination
         distribution to each instruction of a given kernel.
 
         :param list kernel: kernel to apply semantics
+        :param deadline: deadline checked for every instruction, defaults to `None`
+        :type deadline: :class:`~osaca.utils.Deadline`, optional
         """
         self._check_normalized(kernel)
         for instruction_form in kernel:
+            if deadline is not None:
+                deadline.check()
             self.assign_src_dst(instruction_form)
             self.assign_tp_lt(instruction_form)
         if self._machine_model.has_hidden_loads():
             self.set_hidden_loads(kernel)
 
-    def assign_optimal_throughput(self, kernel, start=0):
+    def assign_optimal_throughput(self, kernel, start=0, legacy=False, deadline=None):
         """
-        Assign optimal throughput port pressure to a kernel. This is done in steps of ``0.01cy``.
+        Assign optimal throughput port pressure to a kernel.
+
+        The uops of all instructions are distributed over their ports, such that the maximum port
+        load is minimal and all other ports are as balanced as possible. For instructions with
+        multiple port assignment options, the options resulting in the lowest port loads are
+        chosen jointly and stored in their ``port_uops_option``.
 
         :param list kernel: kernel to apply optimal port utilization
+        :param int start: index of the first instruction to choose a port assignment option for,
+                          defaults to `0`
+        :param bool legacy: use the former heuristic balancing in steps of ``0.01cy`` instead,
+                            defaults to `False`
+        :param deadline: deadline checked while searching the port assignment options, defaults
+                         to `None`
+        :type deadline: :class:`~osaca.utils.Deadline`, optional
         """
         self._check_normalized(kernel)
+        if legacy:
+            self._assign_optimal_throughput_legacy(kernel, start, deadline)
+            return
+        instructions = [instr for instr in kernel if instr.throughput != 0.0]
+        # start with the first option for all instructions with multiple port assignments
+        options = []
+        for idx, instruction_form in enumerate(kernel):
+            if isinstance(instruction_form.port_uops, dict):
+                port_util_alts = list(instruction_form.port_uops.items())
+                if idx >= start and instruction_form.throughput != 0.0:
+                    options.append((instruction_form, port_util_alts))
+                self._set_port_uops_option(instruction_form, *port_util_alts[0])
+        if options:
+            option_ids = {id(instruction_form) for instruction_form, _ in options}
+            choice = self._choose_port_uops_options(
+                [instr for instr in instructions if id(instr) not in option_ids],
+                [port_util_alts for _, port_util_alts in options],
+                deadline,
+            )
+            for (instruction_form, port_util_alts), i in zip(options, choice):
+                self._set_port_uops_option(instruction_form, *port_util_alts[i])
+        self._balance_ports(instructions)
+
+    def _set_port_uops_option(self, instruction_form, option, port_uops):
+        """Select one of multiple port assignment options of an instruction form."""
+        instruction_form.port_uops_option = option
+        instruction_form.port_uops = port_uops
+        instruction_form.port_pressure = self._machine_model.average_port_pressure(port_uops)
+
+    def _choose_port_uops_options(self, instructions, alternatives, deadline=None):
+        """
+        Choose the port assignment options of several instruction forms jointly, such that the
+        balanced port loads of the kernel are minimal.
+
+        Instructions with identical options are interchangeable, so only the number of them
+        using each option is enumerated. The enumeration is a branch and bound search. Its lower
+        bound is the maximum port load of a relaxation, in which the cycles of each undecided
+        instruction may be issued on all ports of all of its options. After
+        ``PORT_OPTIONS_SEARCH_LIMIT`` search steps, the best choice found so far is taken.
+
+        :param list instructions: instruction forms without multiple options
+        :param list alternatives: (option, port uops) tuples of each instruction form with
+                                  multiple options
+        :param deadline: deadline checked for every search step, defaults to `None`
+        :type deadline: :class:`~osaca.utils.Deadline`, optional
+        :returns: `list` -- index of the chosen option for each entry of `alternatives`
+        """
+        port_index = {port: i for i, port in enumerate(self._machine_model.get_ports())}
+        fixed_load, demands, _ = self._get_port_demands(instructions, port_index)
+        groups = defaultdict(list)
+        for i, port_util_alts in enumerate(alternatives):
+            key = tuple(
+                tuple((cycles, tuple(ports)) for cycles, ports in port_uops)
+                for _, port_uops in port_util_alts
+            )
+            groups[key].append(i)
+        search_groups = []
+        for members in groups.values():
+            contributions = []
+            relaxed_ports = set()
+            relaxed_cycles = []
+            for _, port_uops in alternatives[members[0]]:
+                contributions.append(
+                    self._split_port_pressure(
+                        self._machine_model.average_port_pressure(port_uops),
+                        port_uops,
+                        port_index,
+                    )
+                )
+                relaxed_ports.update(port_index[p] for _, ports in port_uops for p in ports)
+                relaxed_cycles.append(sum(cycles for cycles, _ in port_uops))
+            relaxed = (tuple(sorted(relaxed_ports)), min(relaxed_cycles) * len(members))
+            demands[relaxed[0]] += relaxed[1]
+            search_groups.append((members, contributions, relaxed))
+
+        def add_split(contributions, split, sign):
+            for count, (fixed_pressure, uops) in zip(split, contributions):
+                for p, pressure in enumerate(fixed_pressure):
+                    fixed_load[p] += sign * count * pressure
+                for cycles, indices in uops:
+                    demands[indices] += sign * count * cycles
+
+        def get_loads():
+            loads = self._get_port_loads(fixed_load, demands)
+            return sorted((round(load, 9) for load in loads), reverse=True)
+
+        best = {"loads": None, "splits": None, "steps": 0}
+        splits = [None] * len(search_groups)
+
+        def search(depth, loads):
+            if best["loads"] is not None and loads[0] > best["loads"][0]:
+                return
+            if depth == len(search_groups):
+                if best["loads"] is None or loads < best["loads"]:
+                    best["loads"] = loads
+                    best["splits"] = list(splits)
+                return
+            if best["loads"] is not None and best["steps"] >= self.PORT_OPTIONS_SEARCH_LIMIT:
+                return
+            members, contributions, relaxed = search_groups[depth]
+            demands[relaxed[0]] -= relaxed[1]
+            children = []
+            for split in self._get_option_splits(len(members), len(contributions)):
+                if deadline is not None:
+                    deadline.check()
+                add_split(contributions, split, 1)
+                children.append((get_loads(), split))
+                add_split(contributions, split, -1)
+                best["steps"] += 1
+            # most promising choices first
+            for child_loads, split in sorted(children):
+                splits[depth] = split
+                add_split(contributions, split, 1)
+                search(depth + 1, child_loads)
+                add_split(contributions, split, -1)
+            demands[relaxed[0]] += relaxed[1]
+
+        search(0, get_loads())
+        choice = [0] * len(alternatives)
+        for (members, _, _), split in zip(search_groups, best["splits"]):
+            members = iter(members)
+            for option, count in enumerate(split):
+                for _ in range(count):
+                    choice[next(members)] = option
+        return choice
+
+    @staticmethod
+    def _get_option_splits(count, options):
+        """Yield all distributions of `count` instructions over `options` options."""
+        if options == 1:
+            yield (count,)
+            return
+        for first in range(count, -1, -1):
+            for rest in ArchSemantics._get_option_splits(count - first, options - 1):
+                yield (first,) + rest
+
+    def _balance_ports(self, instructions, apply=True):
+        """
+        Distribute the uops of the given instructions optimally over their ports.
+
+        Pressure of an instruction which is not covered by its uops (e.g., caused by a load
+        throughput multiplier) stays on its port.
+
+        :param list instructions: instruction forms to balance
+        :param bool apply: set the resulting port pressure of the instruction forms, defaults
+                           to `True`
+        :returns: `list` -- resulting overall load per port
+        """
+        port_index = {port: i for i, port in enumerate(self._machine_model.get_ports())}
+        fixed_load, demands, movable = self._get_port_demands(instructions, port_index)
+        distribution = balance_port_load(fixed_load, demands)
+        if apply:
+            for instruction_form, fixed_pressure, uops in movable:
+                for cycles, indices in uops:
+                    share = cycles / demands[indices]
+                    for p, port_cycles in distribution[indices].items():
+                        fixed_pressure[p] += port_cycles * share
+                instruction_form.port_pressure = [
+                    0.0 if abs(pp) < EPS else pp for pp in fixed_pressure
+                ]
+        return self._get_port_loads(fixed_load, demands, distribution)
+
+    def _get_port_demands(self, instructions, port_index):
+        """
+        Collect fixed port loads and cycles of movable uops per set of ports.
+
+        :param list instructions: instruction forms
+        :param dict port_index: index of each port name
+        :returns: (`list`, `dict`, `list`) -- fixed load per port, cycles per tuple of port indices
+                  and (instruction form, fixed pressure, uops) of each instruction form with
+                  movable uops
+        """
+        fixed_load = [0.0] * len(port_index)
+        demands = defaultdict(float)
+        movable = []
+        for instruction_form in instructions:
+            fixed_pressure, uops = self._split_port_pressure(
+                instruction_form.port_pressure, instruction_form.port_uops, port_index
+            )
+            if uops and min(fixed_pressure) >= -EPS:
+                movable.append((instruction_form, fixed_pressure, uops))
+                for cycles, indices in uops:
+                    demands[indices] += cycles
+            else:
+                # pressure was modified after assignment (e.g., hidden loads), keep it
+                fixed_pressure = instruction_form.port_pressure
+            for p, pressure in enumerate(fixed_pressure):
+                fixed_load[p] += pressure
+        return fixed_load, demands, movable
+
+    @staticmethod
+    def _split_port_pressure(port_pressure, port_uops, port_index):
+        """
+        Split port pressure of an instruction form into uops which can be issued on multiple
+        ports and the remaining pressure, which is fixed to its ports.
+
+        :returns: (`list`, `list`) -- fixed pressure per port and (cycles, port indices) of each
+                  movable uop
+        """
+        fixed_pressure = list(port_pressure)
+        uops = []
+        for cycles, ports in port_uops:
+            indices = tuple(sorted(set(port_index[p] for p in ports)))
+            if len(indices) > 1 and cycles > 0:
+                uops.append((cycles, indices))
+                for p in ports:
+                    fixed_pressure[port_index[p]] -= cycles / len(ports)
+        return fixed_pressure, uops
+
+    @staticmethod
+    def _get_port_loads(fixed_load, demands, distribution=None):
+        """Return overall load per port after balancing the given demands."""
+        if distribution is None:
+            distribution = balance_port_load(fixed_load, demands)
+        loads = list(fixed_load)
+        for port_distribution in distribution.values():
+            for p, port_cycles in port_distribution.items():
+                loads[p] += port_cycles
+        return loads
+
+    def _assign_optimal_throughput_legacy(self, kernel, start=0, deadline=None):
+        """
+        Assign optimal throughput port pressure to a kernel. This is done in steps of ``0.01cy``.
+
+        :param list kernel: kernel to apply optimal port utilization
+        :param deadline: deadline checked for every instruction, defaults to `None`
+        :type deadline: :class:`~osaca.utils.Deadline`, optional
+        """
         INC = 0.01
         port_list = self._machine_model.get_ports()
+        # keep track of the overall port pressure while moving pressure between ports
+        port_pressures = PortPressureMatrix(kernel)
         multiple_assignments = False
         best_kernel = None
         best_kernel_tp = sys.maxsize
         for idx, instruction_form in enumerate(kernel[start:], start):
+            if deadline is not None:
+                deadline.check()
             # if iform has multiple possible port assignments, check all in a DFS manner and take the best
             if isinstance(instruction_form.port_uops, dict):
-                for port_util_alt in list(instruction_form.port_uops.values())[1:]:
+                for option, port_util_alt in list(instruction_form.port_uops.items())[1:]:
                     k_tmp = deepcopy(kernel)
+                    k_tmp[idx].port_uops_option = option
                     k_tmp[idx].port_uops = deepcopy(port_util_alt)
                     k_tmp[idx].port_pressure = self._machine_model.average_port_pressure(
                         k_tmp[idx].port_uops
                     )
-                    self.assign_optimal_throughput(k_tmp, idx)
+                    self._assign_optimal_throughput_legacy(k_tmp, idx, deadline)
                     if max(self.get_throughput_sum(k_tmp)) < best_kernel_tp:
                         best_kernel = k_tmp
                         best_kernel_tp = max(self.get_throughput_sum(best_kernel))
                 # check the first option in the main branch and compare against the best option later
                 multiple_assignments = True
-                kernel[idx].port_uops = list(instruction_form.port_uops.values())[0]
+                kernel[idx].port_uops_option, kernel[idx].port_uops = list(
+                    instruction_form.port_uops.items()
+                )[0]
             for uop in instruction_form.port_uops:
                 cycles = uop[0]
                 ports = list(uop[1])
                 indices = [port_list.index(p) for p in ports]
                 # check if port sum of used ports for uop are unbalanced
-                port_sums = self._to_list(itemgetter(*indices)(self.get_throughput_sum(kernel)))
+                port_sums = self._to_list(itemgetter(*indices)(port_pressures.get_sums(2)))
                 instr_ports = self._to_list(itemgetter(*indices)(instruction_form.port_pressure))
                 if len(set(port_sums)) > 1:
                     # balance ports
@@ -96,7 +352,7 @@ class ArchSemantics(ISASemantics):
                         differences[max_port_idx] -= INC
                         differences[min_port_idx] += INC
                         # instr_ports = [round(p, 2) for p in instr_ports]
-                        self._itemsetter(*indices)(instruction_form.port_pressure, *instr_ports)
+                        port_pressures.set_pressure(idx, indices, instr_ports)
                         # check if min port is zero
                         if round(min(instr_ports), 2) <= 0:
                             # if port_pressure is not exactly 0.00, add the residual to
@@ -108,16 +364,14 @@ class ArchSemantics(ISASemantics):
                                 # we don't need to decrease difference for other port, just
                                 # delete it
                                 del differences[instr_ports.index(min(instr_ports))]
-                                self._itemsetter(*indices)(
-                                    instruction_form.port_pressure, *instr_ports
-                                )
+                                port_pressures.set_pressure(idx, indices, instr_ports)
                                 zero_index = [
                                     p
                                     for p in indices
                                     if round(instruction_form.port_pressure[p], 2) == 0
                                     or instruction_form.port_pressure[p] < 0.00
                                 ][0]
-                                instruction_form.port_pressure[zero_index] = 0.0
+                                port_pressures.set_pressure(idx, [zero_index], [0.0])
                             # Remove from further balancing
                             indices = [p for p in indices if instruction_form.port_pressure[p] > 0]
                             instr_ports = self._to_list(
@@ -134,12 +388,11 @@ class ArchSemantics(ISASemantics):
                                 itemgetter(*indices)(instruction_form.port_pressure)
                             )
                             del differences[differences.index(min(differences))]
-                        port_sums = self._to_list(
-                            itemgetter(*indices)(self.get_throughput_sum(kernel))
-                        )
+                        port_sums = self._to_list(itemgetter(*indices)(port_pressures.get_sums(2)))
         if multiple_assignments:
             if max(self.get_throughput_sum(kernel)) > best_kernel_tp:
                 for i, instr in enumerate(best_kernel):
+                    kernel[i].port_uops_option = best_kernel[i].port_uops_option
                     kernel[i].port_uops = best_kernel[i].port_uops
                     kernel[i].port_pressure = best_kernel[i].port_pressure
 
@@ -441,21 +694,6 @@ class ArchSemantics(ISASemantics):
             port_pressure[index] = 0.0
         return port_pressure
 
-    def _itemsetter(self, *items):
-        if len(items) == 1:
-            item = items[0]
-
-            def g(obj, value):
-                obj[item] = value
-
-        else:
-
-            def g(obj, *values):
-                for item, value in zip(items, values):
-                    obj[item] = value
-
-        return g
-
     def _to_list(self, obj):
         if isinstance(obj, tuple):
             return list(obj)
@@ -470,6 +708,6 @@ class ArchSemantics(ISASemantics):
         port_pressures = [instr.port_pressure for instr in kernel if instr.throughput != 0.0]
         # Essentially summing up each columns of port_pressures, where each column is one port
         # and each row is one line of the kernel
-        # round is necessary to ensure termination of ArchsSemantics.assign_optimal_throughput
+        # round to avoid floating point noise in reports and comparisons
         tp_sum = [round(sum(col), 2) for col in zip(*port_pressures)]
         return tp_sum
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Compact directed graph for the dependencies of a kernel.
+
+Nodes are numbered consecutively and store their line number, instruction form and kind
+(instruction or load), edges store their latency and the operand creating the dependency.
+Successors and predecessors are kept in CSR format, i.e., as one flat array of edges per
+direction, sorted by node, with an array of offsets per node.
+
+Successors and predecessors of a node are always in the order their edges were added, and the
+algorithms below visit nodes in the same order as their networkx counterparts, so results
+(including ties between paths of equal length) are the same as for a :class:`networkx.DiGraph`
+built the same way.
+"""
+
+from array import array
+
+
+class DependencyGraph(object):
+    """Directed graph of instruction forms with integer node ids and CSR adjacency arrays."""
+
+    INSTRUCTION = 0
+    LOAD = 1
+
+    def __init__(self):
+        self.line_numbers = []
+        self.instruction_forms = []
+        self.kinds = bytearray()
+        self.sources = array("l")
+        self.targets = array("l")
+        self.latencies = []
+        self.operands = []
+        self._node_ids = {}
+        self._edge_ids = {}
+        self._successors = None
+        self._predecessors = None
+
+    def __len__(self):
+        return len(self.line_numbers)
+
+    def __contains__(self, line_number):
+        return line_number in self._node_ids
+
+    def node_id(self, line_number):
+        """Return node id of a line number."""
+        return self._node_ids[line_number]
+
+    def add_node(self, line_number, instruction_form, kind=INSTRUCTION):
+        """
+        Add node for instruction form, or replace instruction form of an existing node.
+
+        :param line_number: line number of the node, unique in the graph
+        :param instruction_form: instruction form of the node
+        :type instruction_form: :class:`~osaca.parser.instruction_form.InstructionForm`
+        :param int kind: :attr:`INSTRUCTION` or :attr:`LOAD`
+        :returns: `int` -- node id
+        """
+        node = self._node_ids.get(line_number)
+        if node is not None:
+            self.instruction_forms[node] = instruction_form
+            return node
+        node = self._node_ids[line_number] = len(self.line_numbers)
+        self.line_numbers.append(line_number)
+        self.instruction_forms.append(instruction_form)
+        self.kinds.append(kind)
+        self._successors = self._predecessors = None
+        return node
+
+    def add_edge(self, source, target, latency, operand=None):
+        """
+        Add edge between two nodes, or update latency and operand of an existing one.
+
+        :param int source: node id of source
+        :param int target: node id of target
+        :param latency: latency of the dependency
+        :param operand: operand creating the dependency, not changed if `None`
+        :returns: `int` -- edge id
+        """
+        edge = self._edge_ids.get((source, target))
+        if edge is None:
+            edge = self._edge_ids[source, target] = len(self.sources)
+            self.sources.append(source)
+            self.targets.append(target)
+            self.latencies.append(latency)
+            self.operands.append(operand)
+            self._successors = self._predecessors = None
+        else:
+            self.latencies[edge] = latency
+            if operand is not None:
+                self.operands[edge] = operand
+        return edge
+
+    def edge_id(self, source, target):
+        """Return edge id between two nodes or `None` if not connected."""
+        return self._edge_ids.get((source, target))
+
+    def successors(self, node):
+        """Return edge ids of all outgoing edges of a node."""
+        if self._successors is None:
+            self._successors = self._index(self.sources)
+        offsets, edges = self._successors
+        return edges[offsets[node] : offsets[node + 1]]
+
+    def predecessors(self, node):
+        """Return edge ids of all incoming edges of a node."""
+        if self._predecessors is None:
+            self._predecessors = self._index(self.targets)
+        offsets, edges = self._predecessors
+        return edges[offsets[node] : offsets[node + 1]]
+
+    def _index(self, nodes):
+        """Return CSR offsets and edges sorted by the node of each edge, keeping edge order."""
+        offsets = array("l", bytes(array("l").itemsize * (len(self.line_numbers) + 1)))
+        for node in nodes:
+            offsets[node + 1] += 1
+        for node in range(len(self.line_numbers)):
+            offsets[node + 1] += offsets[node]
+        position = array("l", offsets)
+        edges = array("l", bytes(array("l").itemsize * len(nodes)))
+        for edge, node in enumerate(nodes):
+            edges[position[node]] = edge
+            position[node] += 1
+        return offsets, edges
+
+    def topological_order(self):
+        """
+        Return node ids in topological order, generation by generation like
+        :func:`networkx.topological_sort`.
+
+        :returns: `list` of node ids, `None` if the graph is cyclic
+        """
+        indegrees = array("l", bytes(array("l").itemsize * len(self.line_numbers)))
+        for target in self.targets:
+            indegrees[target] += 1
+        order = [node for node in range(len(self.line_numbers)) if indegrees[node] == 0]
+        # the order list is extended while iterating it, which visits one generation after
+        # the other
+        for node in order:
+            for edge in self.successors(node):
+                target = self.targets[edge]
+                indegrees[target] -= 1
+                if indegrees[target] == 0:
+                    order.append(target)
+        if len(order) != len(self.line_numbers):
+            return None
+        return order
+
+    def is_acyclic(self):
+        return self.topological_order() is not None
+
+    def longest_path(self, topological_order=None):
+        """
+        Return the path with the highest latency sum like :func:`networkx.dag_longest_path`.
+
+        :param list topological_order: node ids in topological order, computed if not given
+        :returns: `list` of node ids
+        """
+        if not self.line_numbers:
+            return []
+        if topological_order is None:
+            topological_order = self.topological_order()
+        # length of the longest path reaching each node and its predecessor on that path
+        lengths = [0] * len(self.line_numbers)
+        previous = list(range(len(self.line_numbers)))
+        for node in topological_order:
+            best = None
+            for edge in self.predecessors(node):
+                length = lengths[self.sources[edge]] + self.latencies[edge]
+                if best is None or length > best:
+                    best = length
+                    previous[node] = self.sources[edge]
+            if best is not None and best < 0:
+                best = 0
+                previous[node] = node
+            lengths[node] = best or 0
+        node = max(topological_order, key=lengths.__getitem__)
+        path = [node]
+        while previous[node] != node:
+            node = previous[node]
+            path.append(node)
+        return path[::-1]
+
+    def ancestors(self, node):
+        """
+        Return all nodes with a path to the given node, including itself.
+
+        :returns: `bytearray` with a non-zero value for each ancestor
+        """
+        visited = bytearray(len(self.line_numbers))
+        visited[node] = 1
+        stack = [node]
+        while stack:
+            for edge in self.predecessors(stack.pop()):
+                source = self.sources[edge]
+                if not visited[source]:
+                    visited[source] = 1
+                    stack.append(source)
+        return visited
+
+    def to_networkx(self):
+        """
+        Return graph as :class:`networkx.DiGraph` with line numbers as nodes, ``instruction_form``
+        node attributes and ``latency`` and ``operand`` edge attributes.
+        """
+        import networkx as nx
+
+        graph = nx.DiGraph()
+        for line_number, instruction_form in zip(self.line_numbers, self.instruction_forms):
+            graph.add_node(line_number, instruction_form=instruction_form)
+        for source, target, latency, operand in zip(
+            self.sources, self.targets, self.latencies, self.operands
+        ):
+            if operand is None:
+                graph.add_edge(
+                    self.line_numbers[source], self.line_numbers[target], latency=latency
+                )
+            else:
+                graph.add_edge(
+                    self.line_numbers[source],
+                    self.line_numbers[target],
+                    latency=latency,
+                    operand=operand,
+                )
+        return graph
+
+    @classmethod
+    def from_networkx(cls, graph):
+        """
+        Create graph from a :class:`networkx.DiGraph` as returned by :func:`to_networkx`, keeping
+        the order of its nodes, successors and predecessors. Edges without latency get a latency
+        of 1.
+        """
+        dependency_graph = cls()
+        for line_number, data in graph.nodes(data=True):
+            dependency_graph.add_node(
+                line_number,
+                data.get("instruction_form"),
+                cls.LOAD if line_number != int(line_number) else cls.INSTRUCTION,
+            )
+        for source, target, data in graph.edges(data=True):
+            dependency_graph.add_edge(
+                dependency_graph.node_id(source),
+                dependency_graph.node_id(target),
+                data.get("latency", 1),
+                data.get("operand"),
+            )
+        # predecessors are ordered by their insertion into the networkx graph, which may differ
+        # from the order of edges
+        edges = array("l")
+        offsets = array("l", [0])
+        for target in graph:
+            for source in graph.pred[target]:
+                edges.append(
+                    dependency_graph.edge_id(
+                        dependency_graph.node_id(source), dependency_graph.node_id(target)
+                    )
+                )
+            offsets.append(len(edges))
+        dependency_graph._predecessors = (offsets, edges)
+        return dependency_graph
@@ -1,15 +1,14 @@
 #!/usr/bin/env python3
 
-import hashlib
+import copy
 import os
-import pickle
 import re
 import string
 from collections import defaultdict
+from io import StringIO
 from itertools import product
 from pathlib import Path
 
-import ruamel.yaml
 from osaca import __version__, utils
 from osaca.parser.instruction_form import InstructionForm
 from osaca.parser.operand import Operand
@@ -20,15 +19,29 @@ from osaca.parser.identifier import IdentifierOperand
 from osaca.parser.condition import ConditionOperand
 from osaca.parser.flag import FlagOperand
 from osaca.parser.prefetch import PrefetchOperand
-from ruamel.yaml.compat import StringIO
+from osaca.semantics.model_cache import (
+    get_model_hash,
+    load_model_cache,
+    register_cachefile,
+    write_model_cache,
+)
 
 
 class MachineModel(object):
     WILDCARD = "*"
-    INTERNAL_VERSION = 1  # increase whenever self._data format changes to invalidate cache!
+    INTERNAL_VERSION = 3  # increase whenever self._data format changes to invalidate cache!
     _runtime_cache = {}
+    # get_instruction lookup index and memo shared by models from the runtime cache
+    _runtime_lookup_cache = {}
+    # minimum number of candidate instruction forms for using the get_instruction memo
+    LOOKUP_MEMO_THRESHOLD = 3
+    # shared DB operands of all models, see `intern_operand`
+    _interned_operands = {}
 
     def __init__(self, arch=None, path_to_yaml=None, isa=None, lazy=False):
+        # Lookup index and memo for get_instruction, built on demand
+        self._instruction_index = {}
+        self._instruction_cache = {}
         if not arch and not path_to_yaml:
             if not isa:
                 raise ValueError("One of arch, path_to_yaml and isa must be specified")
@@ -68,27 +81,24 @@ class MachineModel(object):
             if arch:
                 self._arch = arch.lower()
                 self._path = utils.find_datafile(self._arch + ".yml")
+            # Instruction forms are always read on demand per mnemonic from the model cache,
+            # `lazy` is kept for backwards compatibility.
             # Check runtime cache
-            if self._path in MachineModel._runtime_cache and not lazy:
+            if self._path in MachineModel._runtime_cache:
                 self._data = MachineModel._runtime_cache[self._path]
+                self._instruction_index, self._instruction_cache = (
+                    MachineModel._runtime_lookup_cache[self._path]
+                )
+                return
             # check if file is cached
-            cached = self._get_cached(self._path) if not lazy else False
+            cached = self._get_cached(self._path)
             if cached:
                 self._data = cached
             else:
                 yaml = self._create_yaml_object()
                 # otherwise load
                 with open(self._path, "r", encoding="utf8") as f:
-                    if not lazy:
-                        self._data = yaml.load(f)
-                    else:
-                        file_content = ""
-                        line = f.readline()
-                        while "instruction_forms:" not in line:
-                            file_content += line
-                            line = f.readline()
-                        self._data = yaml.load(file_content)
-                        self._data["instruction_forms"] = []
+                    self._data = yaml.load(f)
                 # separate multi-alias instruction forms
                 for entry in [
                     x for x in self._data["instruction_forms"] if isinstance(x["name"], list)
@@ -185,90 +195,118 @@ class MachineModel(object):
                         )
                     self._data["store_throughput"] = new_throughputs
 
-                if not lazy:
-                    # cache internal representation for future use
-                    self._write_in_cache(self._path)
+                # cache internal representation for future use
+                self._write_in_cache(self._path)
             # Store in runtime cache
-            if not lazy:
-                MachineModel._runtime_cache[self._path] = self._data
+            MachineModel._runtime_cache[self._path] = self._data
+            MachineModel._runtime_lookup_cache[self._path] = (
+                self._instruction_index,
+                self._instruction_cache,
+            )
 
     def operand_to_class(self, o, new_operands):
         """Convert an operand from dict type to class"""
         if o["class"] == "register":
-            new_operands.append(
-                RegisterOperand(
-                    name=o["name"] if "name" in o else None,
-                    prefix=o["prefix"] if "prefix" in o else None,
-                    shape=o["shape"] if "shape" in o else None,
-                    mask=o["mask"] if "mask" in o else False,
-                    pre_indexed=o["pre_indexed"] if "pre_indexed" in o else False,
-                    post_indexed=o["post_indexed"] if "post_indexed" in o else False,
-                    source=o["source"] if "source" in o else False,
-                    destination=o["destination"] if "destination" in o else False,
-                )
+            operand = RegisterOperand(
+                name=o["name"] if "name" in o else None,
+                prefix=o["prefix"] if "prefix" in o else None,
+                shape=o["shape"] if "shape" in o else None,
+                mask=o["mask"] if "mask" in o else False,
+                pre_indexed=o["pre_indexed"] if "pre_indexed" in o else False,
+                post_indexed=o["post_indexed"] if "post_indexed" in o else False,
+                source=o["source"] if "source" in o else False,
+                destination=o["destination"] if "destination" in o else False,
             )
         elif o["class"] == "memory":
             if isinstance(o["base"], dict):
-                o["base"] = RegisterOperand(name=o["base"]["name"])
+                o["base"] = self.intern_operand(RegisterOperand(name=o["base"]["name"]))
             if isinstance(o["index"], dict):
-                o["index"] = RegisterOperand(
-                    name=o["index"]["name"],
-                    prefix=o["index"]["prefix"] if "prefix" in o["index"] else None,
-                )
-            new_operands.append(
-                MemoryOperand(
-                    base=o["base"],
-                    offset=o["offset"],
-                    index=o["index"],
-                    scale=o["scale"],
-                    source=o["source"] if "source" in o else False,
-                    destination=o["destination"] if "destination" in o else False,
-                    pre_indexed=o["pre_indexed"] if "pre_indexed" in o else False,
-                    post_indexed=o["post_indexed"] if "post_indexed" in o else False,
+                o["index"] = self.intern_operand(
+                    RegisterOperand(
+                        name=o["index"]["name"],
+                        prefix=o["index"]["prefix"] if "prefix" in o["index"] else None,
+                    )
                 )
+            operand = MemoryOperand(
+                base=o["base"],
+                offset=o["offset"],
+                index=o["index"],
+                scale=o["scale"],
+                source=o["source"] if "source" in o else False,
+                destination=o["destination"] if "destination" in o else False,
+                pre_indexed=o["pre_indexed"] if "pre_indexed" in o else False,
+                post_indexed=o["post_indexed"] if "post_indexed" in o else False,
             )
         elif o["class"] == "immediate":
-            new_operands.append(
-                ImmediateOperand(
-                    imd_type=o["imd"],
-                    source=o["source"] if "source" in o else False,
-                    destination=o["destination"] if "destination" in o else False,
-                )
+            operand = ImmediateOperand(
+                imd_type=o["imd"],
+                source=o["source"] if "source" in o else False,
+                destination=o["destination"] if "destination" in o else False,
             )
         elif o["class"] == "identifier":
-            new_operands.append(
-                IdentifierOperand(
-                    name=o["name"] if "name" in o else None,
-                    source=o["source"] if "source" in o else False,
-                    destination=o["destination"] if "destination" in o else False,
-                )
+            operand = IdentifierOperand(
+                name=o["name"] if "name" in o else None,
+                source=o["source"] if "source" in o else False,
+                destination=o["destination"] if "destination" in o else False,
             )
         elif o["class"] == "condition":
-            new_operands.append(
-                ConditionOperand(
-                    ccode=o["ccode"].upper(),
-                    source=o["source"] if "source" in o else False,
-                    destination=o["destination"] if "destination" in o else False,
-                )
+            operand = ConditionOperand(
+                ccode=o["ccode"].upper(),
+                source=o["source"] if "source" in o else False,
+                destination=o["destination"] if "destination" in o else False,
             )
         elif o["class"] == "flag":
-            new_operands.append(
-                FlagOperand(
-                    name=o["name"],
-                    source=o["source"] if "source" in o else False,
-                    destination=o["destination"] if "destination" in o else False,
-                )
+            operand = FlagOperand(
+                name=o["name"],
+                source=o["source"] if "source" in o else False,
+                destination=o["destination"] if "destination" in o else False,
             )
         elif o["class"] == "prfop":
-            new_operands.append(
-                PrefetchOperand(
-                    type_id=o["type"] if "type" in o else None,
-                    target=o["target"] if "target" in o else None,
-                    policy=o["policy"] if "policy" in o else None,
-                )
+            operand = PrefetchOperand(
+                type_id=o["type"] if "type" in o else None,
+                target=o["target"] if "target" in o else None,
+                policy=o["policy"] if "policy" in o else None,
             )
         else:
             new_operands.append(o)
+            return
+        new_operands.append(self.intern_operand(operand))
+
+    @classmethod
+    def intern_operand(cls, operand):
+        """
+        Return the shared instance of a DB operand.
+
+        Machine models only contain a few hundred distinct operands, so all equal operands of
+        all models are represented by the same frozen object, including nested operands.
+        Operands with unhashable attributes are frozen but not shared.
+
+        :param operand: DB operand
+        :type operand: :class:`~osaca.parser.operand.Operand`
+        :returns: frozen :class:`~osaca.parser.operand.Operand` equal to `operand`
+        """
+        if not operand._frozen:
+            for name, value in operand.__getstate__().items():
+                if isinstance(value, Operand):
+                    setattr(operand, name, cls.intern_operand(value))
+        key = cls._get_intern_key(operand)
+        try:
+            return cls._interned_operands.setdefault(key, operand.freeze())
+        except TypeError:
+            return operand.freeze()
+
+    @classmethod
+    def _get_intern_key(cls, value):
+        """Return key identifying an operand by the types and values of all its attributes."""
+        if isinstance(value, Operand):
+            return (type(value),) + tuple(
+                (name, cls._get_intern_key(v)) for name, v in value.__getstate__().items()
+            )
+        if isinstance(value, (list, tuple)):
+            return (type(value),) + tuple(cls._get_intern_key(v) for v in value)
+        if isinstance(value, dict):
+            return (type(value),) + tuple((k, cls._get_intern_key(v)) for k, v in value.items())
+        return (type(value), value)
 
     def get(self, key, default=None):
         """Return config entry for key or default/None."""
@@ -289,7 +327,9 @@ class MachineModel(object):
         # For use with dict instead of list as DB
         if name is None:
             return None
-        name_matched_iforms = self._data["instruction_forms_dict"].get(name.upper(), [])
+        name = name.upper()
+        if name not in self._data["instruction_forms_dict"]:
+            return None
 
         try:
             # If `operands` is an integer, it represents the arity of the instruction.  This is
@@ -297,27 +337,167 @@ class MachineModel(object):
             # they may not match the model.
             if isinstance(operands, int):
                 arity = operands
-                return next(
-                    (
-                        instruction_form
-                        for instruction_form in name_matched_iforms
-                        if len(instruction_form.operands) == arity
-                    ),
-                    None,
-                )
-            else:
-                return next(
-                    (
-                        instruction_form
-                        for instruction_form in name_matched_iforms
-                        if self._match_operands(instruction_form.operands, operands)
-                    ),
-                    None,
-                )
+                return next(iter(self._get_indexed_iforms(name, arity)), None)
+            # Only check instruction forms with compatible operand classes
+            candidates = self._get_indexed_iforms(
+                name, tuple(self._get_operand_kind(o) for o in operands)
+            )
+            matches = (
+                iform for iform in candidates if self._match_operands(iform.operands, operands)
+            )
+            if len(candidates) < self.LOOKUP_MEMO_THRESHOLD:
+                return next(matches, None)
+            # Repeated queries with equal operand types are answered from the memo
+            signature = self._get_operands_signature(operands)
+            key = (name, signature)
+            if signature is not None and key in self._instruction_cache:
+                return self._instruction_cache[key]
+            instruction_form = next(matches, None)
+            if signature is not None:
+                self._instruction_cache[key] = instruction_form
+            return instruction_form
         except TypeError as e:
             print("\nname: {}\noperands: {}".format(name, operands))
             raise TypeError from e
 
+    def _get_indexed_iforms(self, name, operand_kinds):
+        """
+        Return instruction forms in DB order with the given name which can match operands of
+        the given classes.
+
+        :param str name: upper case mnemonic
+        :param operand_kinds: operand classes as returned by :func:`_get_operand_kind` or arity
+        :type operand_kinds: tuple or int
+        :returns: `list` of :class:`~osaca.parser.instruction_form.InstructionForm`
+        """
+        key = (name, operand_kinds)
+        if key not in self._instruction_index:
+            iforms = self._data["instruction_forms_dict"].get(name, [])
+            if isinstance(operand_kinds, int):
+                self._instruction_index[key] = [
+                    iform for iform in iforms if len(iform.operands) == operand_kinds
+                ]
+            else:
+                self._instruction_index[key] = [
+                    iform
+                    for iform in self._get_indexed_iforms(name, len(operand_kinds))
+                    if all(
+                        self._kinds_compatible(self._get_operand_kind(i_operand), kind)
+                        for i_operand, kind in zip(iform.operands, operand_kinds)
+                    )
+                ]
+        return self._instruction_index[key]
+
+    def _clear_instruction_caches(self):
+        """Invalidate lookup index and memo of get_instruction after DB changes."""
+        self._instruction_index = {}
+        self._instruction_cache = {}
+
+    @staticmethod
+    def _get_operand_kind(operand):
+        """Return coarse operand class used for pre-filtering instruction forms."""
+        if isinstance(operand, RegisterOperand):
+            return "register"
+        if isinstance(operand, MemoryOperand):
+            return "memory"
+        if isinstance(operand, ImmediateOperand):
+            return "immediate"
+        if isinstance(operand, IdentifierOperand):
+            return "identifier"
+        return None
+
+    @staticmethod
+    def _kinds_compatible(i_kind, kind):
+        """
+        Check if an instruction form operand of class ``i_kind`` may match an operand of
+        class ``kind``. Immediates can match identifiers (AArch64) and operands of other
+        classes are always checked in detail.
+        """
+        if kind is None:
+            return True
+        if kind == "immediate":
+            return i_kind in ("immediate", "identifier")
+        return i_kind == kind
+
+    def _get_operands_signature(self, operands):
+        """
+        Return hashable signature containing all operand attributes considered by
+        :func:`_match_operands` or `None` if it cannot be created.
+        """
+        signature = []
+        for operand in operands:
+            operand_signature = self._get_operand_signature(operand)
+            if operand_signature is None:
+                return None
+            signature.append(operand_signature)
+        signature = tuple(signature)
+        try:
+            hash(signature)
+        except TypeError:
+            return None
+        return signature
+
+    def _get_operand_signature(self, operand):
+        """Return hashable signature of a single operand or `None`."""
+        if operand is None or isinstance(operand, (str, int, float, bool)):
+            return ("value", operand)
+        if isinstance(operand, RegisterOperand):
+            # register types only depend on the name without its number (x86) or on prefix,
+            # shape and lanes (AArch64)
+            return (
+                "register",
+                operand.name.rstrip(string.digits).lower() if operand.name else operand.name,
+                operand.prefix,
+                operand.shape,
+                operand.lanes,
+            )
+        if isinstance(operand, MemoryOperand):
+            index = operand.index
+            if isinstance(index, RegisterOperand):
+                # indices are also compared by RegisterOperand.__eq__
+                index = (
+                    self._get_operand_signature(index),
+                    index.name,
+                    index.width,
+                    index.regtype,
+                    index.index,
+                    index.mask,
+                    index.zeroing,
+                )
+            else:
+                index = self._get_operand_signature(index)
+            base = self._get_operand_signature(operand.base)
+            offset = self._get_operand_signature(operand.offset)
+            post_indexed = operand.post_indexed
+            if isinstance(post_indexed, dict):
+                post_indexed = "dict"
+            if base is None or offset is None or index is None:
+                return None
+            return (
+                "memory",
+                base,
+                offset,
+                index,
+                operand.scale,
+                operand.pre_indexed,
+                post_indexed,
+            )
+        if isinstance(operand, ImmediateOperand):
+            return (
+                "immediate",
+                operand.imd_type,
+                operand.value is not None,
+                operand.value == "0",
+                operand.identifier is not None,
+            )
+        if isinstance(operand, IdentifierOperand):
+            return ("identifier",)
+        if isinstance(operand, PrefetchOperand):
+            return ("prfop",)
+        if isinstance(operand, ConditionOperand):
+            return ("condition", operand.ccode)
+        return None
+
     def average_port_pressure(self, port_pressure, option=0):
         """Construct average port pressure list from instruction data."""
         port_list = self._data["ports"]
@@ -346,12 +526,14 @@ class MachineModel(object):
         uops=None,
     ):
         """Import instruction form information."""
+        self._detach_from_runtime_cache()
         # If it already exists. Overwrite information.
         instr_data = self.get_instruction(mnemonic, operands)
         if instr_data is None:
             instr_data = InstructionForm()
             self._data["instruction_forms"].append(instr_data)
             self._data["instruction_forms_dict"][mnemonic].append(instr_data)
+        self._clear_instruction_caches()
 
         instr_data.mnemonic = mnemonic
         instr_data.llvm_name = llvm_name
@@ -377,9 +559,16 @@ class MachineModel(object):
 
     def add_port(self, port):
         """Add port in port model of current machine model."""
+        self._detach_from_runtime_cache()
         if port not in self._data["ports"]:
             self._data["ports"].append(port)
 
+    def _detach_from_runtime_cache(self):
+        """Copy model data shared through the runtime cache before it gets modified."""
+        if MachineModel._runtime_cache.get(getattr(self, "_path", None)) is self._data:
+            self._data = copy.deepcopy(self._data)
+            self._clear_instruction_caches()
+
     def get_ISA(self):
         """Return ISA of :class:`MachineModel`."""
         return self._data["isa"].lower()
@@ -489,26 +678,26 @@ class MachineModel(object):
         if isinstance(op, Operand):
             dict_op = dict(
                 (key.lstrip("_"), value)
-                for key, value in op.__dict__.items()
+                for key, value in op.__getstate__().items()
                 if not callable(value) and not key.startswith("__")
             )
             if isinstance(op, MemoryOperand):
                 if isinstance(dict_op["index"], Operand):
                     dict_op["index"] = dict(
                         (key.lstrip("_"), value)
-                        for key, value in dict_op["index"].__dict__.items()
+                        for key, value in dict_op["index"].__getstate__().items()
                         if not callable(value) and not key.startswith("__")
                     )
                 if isinstance(dict_op["offset"], Operand):
                     dict_op["offset"] = dict(
                         (key.lstrip("_"), value)
-                        for key, value in dict_op["offset"].__dict__.items()
+                        for key, value in dict_op["offset"].__getstate__().items()
                         if not callable(value) and not key.startswith("__")
                     )
                 if isinstance(dict_op["base"], Operand):
                     dict_op["base"] = dict(
                         (key.lstrip("_"), value)
-                        for key, value in dict_op["base"].__dict__.items()
+                        for key, value in dict_op["base"].__getstate__().items()
                         if not callable(value) and not key.startswith("__")
                     )
             return dict_op
@@ -516,13 +705,15 @@ class MachineModel(object):
 
     def dump(self, stream=None):
         """Dump machine model to stream or return it as a ``str`` if no stream is given."""
+        from ruamel.yaml.comments import CommentedMap, CommentedSeq
+
         # Replace instruction form's port_pressure with styled version for RoundtripDumper
         formatted_instruction_forms = []
         for instruction_form in self._data["instruction_forms"]:
             if isinstance(instruction_form, InstructionForm):
                 instruction_form = dict(
                     (key.lstrip("_"), value)
-                    for key, value in instruction_form.__dict__.items()
+                    for key, value in instruction_form.__getstate__().items()
                     if not callable(value) and not key.startswith("__")
                 )
             iform = {
@@ -540,7 +731,7 @@ class MachineModel(object):
             iform["operands"] = dict_operands
             iform["latency"] = instruction_form["latency"]
             if instruction_form["port_pressure"] is not None:
-                cs = ruamel.yaml.comments.CommentedSeq(instruction_form["port_pressure"])
+                cs = CommentedSeq(instruction_form["port_pressure"])
                 cs.fa.set_flow_style()
                 iform["port_pressure"] = cs
             iform["throughput"] = instruction_form["throughput"]
@@ -553,7 +744,7 @@ class MachineModel(object):
         for lt in self._data["load_throughput"]:
             cm = self.class_to_dict(lt[0])
             cm["port_pressure"] = lt[1]
-            cm = ruamel.yaml.comments.CommentedMap(cm)
+            cm = CommentedMap(cm)
             cm.fa.set_flow_style()
             formatted_load_throughput.append(cm)
 
@@ -562,7 +753,7 @@ class MachineModel(object):
         for st in self._data["store_throughput"]:
             cm = self.class_to_dict(st[0])
             cm["port_pressure"] = st[1]
-            cm = ruamel.yaml.comments.CommentedMap(cm)
+            cm = CommentedMap(cm)
             cm.fa.set_flow_style()
             formatted_store_throughput.append(cm)
 
@@ -600,29 +791,37 @@ class MachineModel(object):
         """
         Check if machine model is cached and if so, load it.
 
+        Instruction forms are read lazily per mnemonic from the memory-mapped cache file.
+
         :param filepath: path to check for cached machine model
         :type filepath: str
         :returns: cached DB if existing, `False` otherwise
         """
         p = Path(filepath)
-        hexhash = hashlib.sha256(p.read_bytes()).hexdigest()
+        hexhash = get_model_hash(filepath)
 
-        # 1. companion cachefile: same location, with '.<name>_<sha512hash>.pickle'
-        companion_cachefile = p.with_name("." + p.stem + "_" + hexhash).with_suffix(".pickle")
+        # 1. companion cachefile: same location, with '.<name>_<sha256hash>.osacache'
+        companion_cachefile = p.with_name("." + p.stem + "_" + hexhash).with_suffix(".osacache")
         if companion_cachefile.exists():
             # companion file (must be up-to-date, due to equal hash)
-            with companion_cachefile.open("rb") as f:
-                data = pickle.load(f)
-            if data.get("internal_version") == self.INTERNAL_VERSION:
+            data = load_model_cache(
+                str(companion_cachefile), self.INTERNAL_VERSION, self.intern_operand
+            )
+            if data is not None:
+                register_cachefile(filepath, companion_cachefile)
                 return data
 
-        # 2. home cachefile: ~/.osaca/cache/<name>_<sha512hash>.pickle
-        home_cachefile = (Path(utils.CACHE_DIR) / (p.stem + "_" + hexhash)).with_suffix(".pickle")
+        # 2. home cachefile: ~/.osaca/cache/<name>_<sha256hash>.osacache
+        home_cachefile = (Path(utils.CACHE_DIR) / (p.stem + "_" + hexhash)).with_suffix(
+            ".osacache"
+        )
         if home_cachefile.exists():
             # home file (must be up-to-date, due to equal hash)
-            with home_cachefile.open("rb") as f:
-                data = pickle.load(f)
-            if data.get("internal_version") == self.INTERNAL_VERSION:
+            data = load_model_cache(
+                str(home_cachefile), self.INTERNAL_VERSION, self.intern_operand
+            )
+            if data is not None:
+                register_cachefile(filepath, home_cachefile)
                 return data
         return False
 
@@ -634,24 +833,24 @@ class MachineModel(object):
         :type filepath: str
         """
         p = Path(filepath)
-        hexhash = hashlib.sha256(p.read_bytes()).hexdigest()
-        # 1. companion cachefile: same location, with '.<name>_<sha512hash>.pickle'
-        companion_cachefile = p.with_name("." + p.stem + "_" + hexhash).with_suffix(".pickle")
+        hexhash = get_model_hash(filepath)
+        # 1. companion cachefile: same location, with '.<name>_<sha256hash>.osacache'
+        companion_cachefile = p.with_name("." + p.stem + "_" + hexhash).with_suffix(".osacache")
         if os.access(str(companion_cachefile.parent), os.W_OK):
-            with companion_cachefile.open("wb") as f:
-                pickle.dump(self._data, f)
-                return
+            write_model_cache(str(companion_cachefile), self._data, self.INTERNAL_VERSION)
+            register_cachefile(filepath, companion_cachefile)
+            return
 
-        # 2. home cachefile: ~/.osaca/cache/<name>_<sha512hash>.pickle
+        # 2. home cachefile: ~/.osaca/cache/<name>_<sha256hash>.osacache
         cache_dir = Path(utils.CACHE_DIR)
         try:
             os.makedirs(cache_dir, exist_ok=True)
         except OSError:
             return
-        home_cachefile = (cache_dir / (p.stem + "_" + hexhash)).with_suffix(".pickle")
+        home_cachefile = (cache_dir / (p.stem + "_" + hexhash)).with_suffix(".osacache")
         if os.access(str(home_cachefile.parent), os.W_OK):
-            with home_cachefile.open("wb") as f:
-                pickle.dump(self._data, f)
+            write_model_cache(str(home_cachefile), self._data, self.INTERNAL_VERSION)
+            register_cachefile(filepath, home_cachefile)
 
     def _get_key(self, name, operands):
         """Get unique instruction form key for dict DB."""
@@ -733,37 +932,29 @@ class MachineModel(object):
         else:
             raise ValueError("Parameter {} is not a valid operand code".format(operand))
 
-    def _check_for_duplicate(self, name, operands):
+    @classmethod
+    def get_instruction_signature(cls, name, operands):
         """
-        Check if instruction form exists at least twice in DB.
+        Return canonical signature of a DB instruction form.
 
-        :param str name: mnemonic of instruction form
-        :param list operands: instruction form operands
+        Two instruction forms have the same signature if their mnemonics are equal (ignoring case)
+        and all their operands have the same types and attribute values, i.e., if one is a
+        duplicate of the other.
 
-        :returns: `True`, if duplicate exists, `False` otherwise
+        :param str name: mnemonic of instruction form
+        :param list operands: DB operands of instruction form
+        :returns: hashable `tuple`
         """
-        matches = [
-            instruction_form
-            for instruction_form in self._data["instruction_forms"]
-            if instruction_form["name"].lower() == name.lower()
-            and self._match_operands(instruction_form["operands"], operands)
-        ]
-        if len(matches) > 1:
-            return True
-        return False
+        return (name.upper(),) + tuple(cls._get_intern_key(operand) for operand in operands)
 
     def _match_operands(self, i_operands, operands):
         """Check if all operand types of ``i_operands`` and ``operands`` match."""
-        operands_ok = True
         if len(operands) != len(i_operands):
             return False
-        for idx, operand in enumerate(operands):
-            i_operand = i_operands[idx]
-            operands_ok = operands_ok and self._check_operands(i_operand, operand)
-        if operands_ok:
-            return True
-        else:
-            return False
+        for i_operand, operand in zip(i_operands, operands):
+            if not self._check_operands(i_operand, operand):
+                return False
+        return True
 
     def _check_operands(self, i_operand, operand):
         """Check if the types of operand ``i_operand`` and ``operand`` match."""
@@ -773,9 +964,10 @@ class MachineModel(object):
                 return True
             else:
                 return False
-        if self._data["isa"].lower() == "aarch64":
+        isa = self._data["isa"].lower()
+        if isa == "aarch64":
             return self._check_AArch64_operands(i_operand, operand)
-        if self._data["isa"].lower() == "x86":
+        if isa == "x86":
             return self._check_x86_operands(i_operand, operand)
 
     def _check_AArch64_operands(self, i_operand, operand):
@@ -1061,6 +1253,8 @@ class MachineModel(object):
 
     def _create_yaml_object(self):
         """Create YAML object for parsing and dumping DB"""
+        import ruamel.yaml
+
         yaml_obj = ruamel.yaml.YAML()
         yaml_obj.representer.add_representer(type(None), self.__represent_none)
         yaml_obj.default_flow_style = None
@@ -1,4 +1,8 @@
 #!/usr/bin/env python3
+import ast
+import operator
+import sys
+from copy import copy
 from itertools import chain
 
 from osaca import utils
@@ -24,6 +28,185 @@ class INSTR_FLAGS:
     HAS_ST = "performs_store"
 
 
+# Python < 3.8 parses constants into separate node types
+if sys.version_info >= (3, 8):
+    _CONSTANT_NODES = (ast.Constant,)
+else:
+    _CONSTANT_NODES = (ast.Num, ast.Str, ast.NameConstant)
+_BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.LShift: operator.lshift,
+    ast.RShift: operator.rshift,
+}
+_UNARY_OPERATORS = {ast.USub: operator.neg, ast.UAdd: operator.pos, ast.Not: operator.not_}
+_COMPARISON_OPERATORS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Is: operator.is_,
+    ast.IsNot: operator.is_not,
+    ast.In: lambda a, b: a in b,
+    ast.NotIn: lambda a, b: a not in b,
+}
+_compiled_operations = {}
+
+
+def compile_operation(operation):
+    """
+    Compile the operation of an ISA DB entry into a function applying it to an operand state.
+
+    Operations are python statements like ``op1['value'] += 1``, but only assignments,
+    arithmetic, comparisons, conditional expressions and lists are supported, so DB files can
+    not execute arbitrary code. Each operation is compiled only once.
+
+    :param str operation: statements separated by `;`
+    :returns: function taking the operand state `dict`, e.g., ``{'op1': {'value': 0}}``, and
+              modifying it in place
+    :raises ValueError: if the operation is invalid or contains unsupported statements
+    """
+    if operation not in _compiled_operations:
+        try:
+            statements = [_compile_statement(node) for node in ast.parse(operation).body]
+        except SyntaxError as e:
+            raise ValueError("Invalid operation {!r}: {}".format(operation, e.msg)) from None
+        except ValueError as e:
+            raise ValueError("Invalid operation {!r}: {}".format(operation, e)) from None
+
+        def apply_operation(state):
+            for statement in statements:
+                statement(state)
+
+        _compiled_operations[operation] = apply_operation
+    return _compiled_operations[operation]
+
+
+def _compile_statement(node):
+    """Return function executing an assignment statement on the operand state."""
+    if isinstance(node, ast.Assign):
+        targets = [_compile_target(target) for target in node.targets]
+        value = _compile_expression(node.value)
+
+        def assign(state):
+            result = value(state)
+            for target in targets:
+                target(state, result)
+
+        return assign
+    if isinstance(node, ast.AugAssign) and type(node.op) in _BINARY_OPERATORS:
+        load = _compile_expression(node.target)
+        store = _compile_target(node.target)
+        op = _BINARY_OPERATORS[type(node.op)]
+        value = _compile_expression(node.value)
+        return lambda state: store(state, op(load(state), value(state)))
+    raise ValueError("unsupported statement {}".format(type(node).__name__))
+
+
+def _compile_target(node):
+    """Return function storing a value in a variable or an item of the operand state."""
+    if isinstance(node, ast.Name):
+        name = node.id
+        return lambda state, value: state.__setitem__(name, value)
+    if isinstance(node, ast.Subscript):
+        container = _compile_expression(node.value)
+        key = _compile_expression(_get_subscript_key(node))
+        return lambda state, value: container(state).__setitem__(key(state), value)
+    raise ValueError("unsupported assignment to {}".format(type(node).__name__))
+
+
+def _compile_expression(node):
+    """Return function evaluating an expression on the operand state."""
+    if isinstance(node, _CONSTANT_NODES):
+        constant = ast.literal_eval(node)
+        return lambda state: constant
+    if isinstance(node, ast.Name):
+        name = node.id
+
+        def load(state):
+            try:
+                return state[name]
+            except KeyError:
+                raise NameError("name {!r} is not defined".format(name)) from None
+
+        return load
+    if isinstance(node, ast.Subscript):
+        container = _compile_expression(node.value)
+        key = _compile_expression(_get_subscript_key(node))
+        return lambda state: container(state)[key(state)]
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+        op = _BINARY_OPERATORS[type(node.op)]
+        left = _compile_expression(node.left)
+        right = _compile_expression(node.right)
+        return lambda state: op(left(state), right(state))
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPERATORS:
+        op = _UNARY_OPERATORS[type(node.op)]
+        operand = _compile_expression(node.operand)
+        return lambda state: op(operand(state))
+    if isinstance(node, ast.BoolOp):
+        values = [_compile_expression(value) for value in node.values]
+        if isinstance(node.op, ast.And):
+            return lambda state: _evaluate_and(values, state)
+        return lambda state: _evaluate_or(values, state)
+    if isinstance(node, ast.Compare) and all(type(op) in _COMPARISON_OPERATORS for op in node.ops):
+        left = _compile_expression(node.left)
+        comparisons = [
+            (_COMPARISON_OPERATORS[type(op)], _compile_expression(comparator))
+            for op, comparator in zip(node.ops, node.comparators)
+        ]
+        return lambda state: _evaluate_comparison(left(state), comparisons, state)
+    if isinstance(node, ast.IfExp):
+        test = _compile_expression(node.test)
+        body = _compile_expression(node.body)
+        orelse = _compile_expression(node.orelse)
+        return lambda state: body(state) if test(state) else orelse(state)
+    if isinstance(node, (ast.List, ast.Tuple)):
+        items = [_compile_expression(item) for item in node.elts]
+        container_type = list if isinstance(node, ast.List) else tuple
+        return lambda state: container_type(item(state) for item in items)
+    raise ValueError("unsupported expression {}".format(type(node).__name__))
+
+
+def _get_subscript_key(node):
+    # Python < 3.9 wraps subscript keys in an Index node
+    if type(node.slice).__name__ == "Index":
+        return node.slice.value
+    return node.slice
+
+
+def _evaluate_and(values, state):
+    result = True
+    for value in values:
+        result = value(state)
+        if not result:
+            break
+    return result
+
+
+def _evaluate_or(values, state):
+    result = False
+    for value in values:
+        result = value(state)
+        if result:
+            break
+    return result
+
+
+def _evaluate_comparison(left, comparisons, state):
+    for op, comparator in comparisons:
+        right = comparator(state)
+        if not op(left, right):
+            return False
+        left = right
+    return True
+
+
 class ISASemantics(object):
     def __init__(self, parser, path_to_yaml=None):
         path = path_to_yaml or utils.find_datafile("isa/" + parser.isa() + ".yml")
@@ -113,7 +296,7 @@ class ISASemantics(object):
                     or pre_indexed
                     or (isinstance(post_indexed, dict) and "value" in post_indexed)
                 ):
-                    new_op = operand.base
+                    new_op = copy(operand.base)
                     new_op.pre_indexed = pre_indexed
                     new_op.post_indexed = post_indexed
                     op_dict["src_dst"].append(new_op)
@@ -125,7 +308,7 @@ class ISASemantics(object):
                     or pre_indexed
                     or (isinstance(post_indexed, dict) and "value" in post_indexed)
                 ):
-                    new_op = operand.base
+                    new_op = copy(operand.base)
                     new_op.pre_indexed = pre_indexed
                     new_op.post_indexed = post_indexed
                     op_dict["src_dst"].append(new_op)
@@ -147,10 +330,19 @@ class ISASemantics(object):
 
         Empty dict if no changes of registers occured. None for registers with unknown changes.
         If only_postindexed is True, only considers changes due to post_indexed memory references.
+        The result is memoized in the instruction form and must not be modified.
         """
         instruction_form.check_normalized()
         if instruction_form.mnemonic is None:
             return {}
+        if only_postindexed not in instruction_form.reg_changes:
+            instruction_form.reg_changes[only_postindexed] = self._get_reg_changes(
+                instruction_form, only_postindexed
+            )
+        return instruction_form.reg_changes[only_postindexed]
+
+    def _get_reg_changes(self, instruction_form, only_postindexed):
+        """Determine register changes of an instruction form, see :meth:`get_reg_changes`."""
         dest_reg_names = [
             (op.prefix if op.prefix is not None else "") + op.name
             for op in chain(
@@ -213,7 +405,7 @@ class ISASemantics(object):
                 elif isinstance(o, MemoryOperand):
                     # TODO lea needs some thinking about
                     pass
-            exec(isa_data.operation, {}, operand_state)
+            compile_operation(isa_data.operation)(operand_state)
 
         change_dict = {
             reg_name: operand_state.get(reg_operand_names.get(reg_name))
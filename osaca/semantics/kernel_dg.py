@@ -1,23 +1,36 @@
 #!/usr/bin/env python3
 
 import copy
+import heapq
 from enum import Enum
-import time
 from itertools import chain, groupby
-from multiprocessing import Manager, Process, cpu_count
+from operator import itemgetter
 
-import networkx as nx
 from osaca.semantics import INSTR_FLAGS, ArchSemantics, MachineModel
+from osaca.semantics.dependency_graph import DependencyGraph
 from osaca.parser.instruction_form import InstructionForm
 from osaca.parser.memory import MemoryOperand
 from osaca.parser.register import RegisterOperand
 from osaca.parser.immediate import ImmediateOperand
 from osaca.parser.flag import FlagOperand
+from osaca.utils import Deadline
 
 
-class KernelDG(nx.DiGraph):
-    # threshold for checking dependency graph sequential or in parallel
-    INSTRUCTION_THRESHOLD = 50
+class _DependencyChain(object):
+    """Destination operand of an instruction form, followed until it is overwritten."""
+
+    __slots__ = ("source", "index", "operand", "register_changes")
+
+    def __init__(self, source, index, operand, register_changes=None):
+        self.source = source
+        self.index = index
+        self.operand = operand
+        self.register_changes = register_changes
+
+
+class KernelDG(object):
+    # maximum number of loop-carried dependency paths reported per root instruction
+    LCD_PATHS_PER_ROOT = 32
 
     class ReadKind(Enum):
         NOT_A_READ = 0
@@ -32,27 +45,21 @@ class KernelDG(nx.DiGraph):
         semantics: ArchSemantics,
         timeout=10,
         flag_dependencies=False,
+        deadline=None,
     ):
         self.timed_out = False
+        self.deadline = deadline
         self.kernel = parsed_kernel
         self.parser = parser
         self.model = hw_model
         self.arch_sem = semantics
-        self.dg = self.create_DG(self.kernel, flag_dependencies)
+        self._graph = self.create_DG(self.kernel, flag_dependencies)
+        self._nx_graph = None
+        self._nx_graph_state = None
         self.loopcarried_deps = self.check_for_loopcarried_dep(
             self.kernel, timeout, flag_dependencies
         )
 
-    @classmethod
-    def _extend_path(cls, dst_list, kernel, dg, offset):
-        for instr in kernel:
-            generator_path = nx.algorithms.simple_paths.all_simple_paths(
-                dg, instr.line_number, instr.line_number + offset
-            )
-            tmp_list = list(generator_path)
-            dst_list.extend(tmp_list)
-        # print('Thread [{}-{}] done'.format(kernel[0]['line_number'], kernel[-1]['line_number']))
-
     @staticmethod
     def get_load_line_number(line_number):
         # The line number of the load must be less than the line number of the instruction.  The
@@ -70,6 +77,40 @@ class KernelDG(nx.DiGraph):
             int(line_number + 0.125) if KernelDG.is_load_line_number(line_number) else line_number
         )
 
+    @property
+    def dg(self):
+        """
+        Dependency graph as :class:`~nx.DiGraph`, created on first access.  Added or removed nodes
+        and edges are considered by all subsequent analyses, after changing only attributes (e.g.,
+        latencies), :func:`invalidate` must be called.
+        """
+        if self._nx_graph is None:
+            self._nx_graph = self._graph.to_networkx()
+            self._nx_graph_state = self._get_nx_graph_state(self._nx_graph)
+        return self._nx_graph
+
+    @dg.setter
+    def dg(self, graph):
+        self._nx_graph = graph
+        self._nx_graph_state = None
+
+    def invalidate(self):
+        """Consider all changes made to :attr:`dg` in subsequent analyses."""
+        self._nx_graph_state = None
+
+    @staticmethod
+    def _get_nx_graph_state(graph):
+        return (graph.number_of_nodes(), graph.number_of_edges())
+
+    def _get_graph(self):
+        """Return dependency graph, rebuilt from :attr:`dg` if it has been changed."""
+        if self._nx_graph is not None:
+            state = self._get_nx_graph_state(self._nx_graph)
+            if state != self._nx_graph_state:
+                self._graph = DependencyGraph.from_networkx(self._nx_graph)
+                self._nx_graph_state = state
+        return self._graph
+
     def create_DG(self, kernel, flag_dependencies=False):
         """
         Create directed graph from given kernel
@@ -79,15 +120,31 @@ class KernelDG(nx.DiGraph):
         :param flag_dependencies: indicating if dependencies of flags should be considered,
                                   defaults to `False`
         :type flag_dependencies: boolean, optional
-        :returns: :class:`~nx.DiGraph` -- directed graph object
+        :returns: :class:`~osaca.semantics.dependency_graph.DependencyGraph` -- directed graph
+                  object
+        """
+        dependencies, _ = self._find_dependencies(kernel, flag_dependencies)
+        return self._build_DG(kernel, dependencies)
+
+    def _build_DG(self, kernel, dependencies):
+        """
+        Create directed graph from given kernel and the dependencies found in it.
+
+        :param kernel: Parsed asm kernel with assigned semantic information
+        :type kernel: list
+        :param list dependencies: dependencies as returned by :func:`_find_dependencies`, with
+                                  positions in ``kernel``
+        :returns: :class:`~osaca.semantics.dependency_graph.DependencyGraph` -- directed graph
+                  object
         """
         # Go through kernel instruction forms and add them as nodes of the graph.  Create a LOAD
         # node for instructions that include a memory reference.
-        dg = nx.DiGraph()
+        dg = DependencyGraph()
+        nodes = []
         loads = {}
-        for i, instruction_form in enumerate(kernel):
-            dg.add_node(instruction_form.line_number)
-            dg.nodes[instruction_form.line_number]["instruction_form"] = instruction_form
+        for instruction_form in kernel:
+            node = dg.add_node(instruction_form.line_number, instruction_form)
+            nodes.append(node)
             # add load as separate node if existent
             if (
                 INSTR_FLAGS.HAS_LD in instruction_form.flags
@@ -95,126 +152,90 @@ class KernelDG(nx.DiGraph):
             ):
                 # add new node
                 load_line_number = KernelDG.get_load_line_number(instruction_form.line_number)
-                loads[instruction_form.line_number] = load_line_number
-                dg.add_node(load_line_number)
-                dg.nodes[load_line_number]["instruction_form"] = InstructionForm(
-                    mnemonic="_LOAD_", line=instruction_form.line, line_number=load_line_number
+                load_node = dg.add_node(
+                    load_line_number,
+                    InstructionForm(
+                        mnemonic="_LOAD_", line=instruction_form.line, line_number=load_line_number
+                    ),
+                    DependencyGraph.LOAD,
                 )
+                loads[instruction_form.line_number] = load_node
                 # and set LD latency as edge weight
                 dg.add_edge(
-                    load_line_number,
-                    instruction_form.line_number,
-                    latency=instruction_form.latency - instruction_form.latency_wo_load,
+                    load_node,
+                    node,
+                    instruction_form.latency - instruction_form.latency_wo_load,
                 )
 
-        # 1. find edges (to dependend further instruction)
+        # 1. find edges (to dependend further instruction), in the same order as
+        #    :func:`find_depending` would find them for each instruction form
         # 2. get LT value and set as edge weight
-        for i, instruction_form in enumerate(kernel):
-            for dep, operand, dep_flags in self.find_depending(
-                instruction_form, kernel[i + 1 :], flag_dependencies
-            ):
-                # print(instruction_form.line_number,"\t",dep.line_number,"\n")
-                edge_weight = (
-                    instruction_form.latency
-                    if "mem_dep" in dep_flags or instruction_form.latency_wo_load is None
-                    else instruction_form.latency_wo_load
-                )
-                if "storeload_dep" in dep_flags and self.model is not None:
-                    edge_weight += self.model.get("store_to_load_forward_latency", 0)
-                if "p_indexed" in dep_flags and self.model is not None:
-                    edge_weight = self.model.get("p_index_latency", 1)
-                if "for_load" in dep_flags and self.model is not None and dep.line_number in loads:
-                    dg.add_edge(
-                        instruction_form.line_number,
-                        loads[dep.line_number],
-                        latency=edge_weight,
-                        operand=operand,
-                    )
-                else:
-                    dg.add_edge(
-                        instruction_form.line_number,
-                        dep.line_number,
-                        latency=edge_weight,
-                        operand=operand,
-                    )
-
-                dg.nodes[dep.line_number]["instruction_form"] = dep
+        for source, _, target, operand, dep_flags in sorted(dependencies, key=itemgetter(0, 1, 2)):
+            instruction_form = kernel[source]
+            dep = kernel[target]
+            edge_weight = (
+                instruction_form.latency
+                if "mem_dep" in dep_flags or instruction_form.latency_wo_load is None
+                else instruction_form.latency_wo_load
+            )
+            if "storeload_dep" in dep_flags and self.model is not None:
+                edge_weight += self.model.get("store_to_load_forward_latency", 0)
+            if "p_indexed" in dep_flags and self.model is not None:
+                edge_weight = self.model.get("p_index_latency", 1)
+            if "for_load" in dep_flags and self.model is not None and dep.line_number in loads:
+                dg.add_edge(nodes[source], loads[dep.line_number], edge_weight, operand)
+            else:
+                dg.add_edge(nodes[source], nodes[target], edge_weight, operand)
         return dg
 
     def check_for_loopcarried_dep(self, kernel, timeout=10, flag_dependencies=False):
         """
         Try to find loop-carried dependencies in given kernel.
 
+        The kernel is unrolled once and, for every instruction, the longest dependency paths from
+        the instruction to its copy in the second iteration are computed by dynamic programming
+        over the (acyclic) dependency graph of the unrolled kernel.  At most
+        ``LCD_PATHS_PER_ROOT`` paths are kept per instruction, which yields all cyclic LCDs as
+        long as no instruction is part of more paths than that.
+
         :param kernel: Parsed asm kernel with assigned semantic information
         :type kernel: list
-        :param timeout: Timeout in seconds for parallel execution, defaults
-                                    to `10`. Set to `0` for no timeout
-        :type timeout: int
+        :param timeout: Timeout in seconds for the LCD search, defaults to `10`. Set to `-1`
+                        for no timeout. After the timeout, the LCDs found so far are returned and
+                        :attr:`timed_out` is set.
+        :type timeout: int or :class:`~osaca.utils.Deadline`
         :returns: `dict` -- dependency dictionary with all cyclic LCDs
         """
+        if not isinstance(timeout, Deadline):
+            timeout = Deadline(None if timeout == -1 else timeout)
         # increase line number for second kernel loop
         offset = max(1000, max([i.line_number for i in kernel]))
-        tmp_kernel = [] + kernel
-        for orig_iform in kernel:
-            temp_iform = copy.copy(orig_iform)
-            temp_iform.line_number += offset
-            tmp_kernel.append(temp_iform)
         # get dependency graph
-        dg = self.create_DG(tmp_kernel, flag_dependencies)
+        dg = self._create_unrolled_DG(kernel, offset, flag_dependencies)
 
         # build cyclic loop-carried dependencies
         loopcarried_deps = []
         all_paths = []
 
-        klen = len(kernel)
-        if klen >= self.INSTRUCTION_THRESHOLD:
-            # parallel execution with static scheduling
-            num_cores = cpu_count()
-            workload = int((klen - 1) / num_cores) + 1
-            starts = [tid * workload for tid in range(num_cores)]
-            ends = [min((tid + 1) * workload, klen) for tid in range(num_cores)]
-            instrs = [kernel[s:e] for s, e in zip(starts, ends)]
-            with Manager() as manager:
-                all_paths = manager.list()
-                processes = [
-                    Process(
-                        target=KernelDG._extend_path,
-                        args=(all_paths, instr_section, dg, offset),
-                    )
-                    for instr_section in instrs
-                ]
-                for p in processes:
-                    p.start()
-                if timeout == -1:
-                    # no timeout
-                    for p in processes:
-                        p.join()
-                else:
-                    start_time = time.time()
-                    while time.time() - start_time <= timeout:
-                        if any(p.is_alive() for p in processes):
-                            time.sleep(0.2)
-                        else:
-                            # all procs done
-                            for p in processes:
-                                p.join()
-                            break
-                    else:
-                        self.timed_out = True
-                        # terminate running processes
-                        for p in processes:
-                            if p.is_alive():
-                                p.kill()
-                            p.join()
-                all_paths = list(all_paths)
-        else:
-            # sequential execution to avoid overhead when analyzing smaller kernels
-            for instr in kernel:
-                all_paths.extend(
-                    nx.algorithms.simple_paths.all_simple_paths(
-                        dg, instr.line_number, instr.line_number + offset
-                    )
+        topological_order = dg.topological_order()
+        if topological_order is None:
+            raise NotImplementedError("Kernel is cyclic.")
+        for instr in kernel:
+            # unlike the LCD timeout, the deadline of the whole analysis aborts it
+            if self.deadline is not None:
+                self.deadline.check()
+            if timeout.expired():
+                self.timed_out = True
+                break
+            all_paths.extend(
+                self._longest_paths(
+                    dg,
+                    topological_order,
+                    dg.node_id(instr.line_number),
+                    dg.node_id(instr.line_number + offset),
+                    self.LCD_PATHS_PER_ROOT,
                 )
+            )
 
         paths_set = set()
         for path in all_paths:
@@ -222,10 +243,12 @@ class KernelDG(nx.DiGraph):
             lat_sum = 0.0
             # extend path by edge bound latencies (e.g., store-to-load latency)
             lat_path = []
-            for s, d in nx.utils.pairwise(path):
-                edge_lat = dg.edges[s, d]["latency"]
-                if s <= offset and d > offset and "operand" in dg.edges[s, d]:
-                    loop_carrying_operand = dg.edges[s, d]["operand"]
+            for source, target in zip(path, path[1:]):
+                edge = dg.edge_id(source, target)
+                s, d = dg.line_numbers[source], dg.line_numbers[target]
+                edge_lat = dg.latencies[edge]
+                if s <= offset and d > offset and dg.operands[edge] is not None:
+                    loop_carrying_operand = dg.operands[edge]
                 # map source node back to original line numbers
                 if s > offset:
                     s -= offset
@@ -257,32 +280,118 @@ class KernelDG(nx.DiGraph):
             }
         return loopcarried_deps_dict
 
+    def _create_unrolled_DG(self, kernel, offset, flag_dependencies=False):
+        """
+        Create directed graph from given kernel unrolled once.
+
+        The result is the same as from :func:`create_DG` for the unrolled kernel, but it is
+        derived from the dependencies of the kernel: both copies have the same dependencies and
+        destinations of the first copy not overwritten until its end additionally reach into the
+        second copy.
+
+        :param kernel: Parsed asm kernel with assigned semantic information
+        :type kernel: list
+        :param int offset: line number offset of the second copy
+        :param flag_dependencies: indicating if dependencies of flags should be considered,
+                                  defaults to `False`
+        :type flag_dependencies: boolean, optional
+        :returns: :class:`~osaca.semantics.dependency_graph.DependencyGraph` -- directed graph
+                  object
+        """
+        tmp_kernel = [] + kernel
+        for orig_iform in kernel:
+            temp_iform = copy.copy(orig_iform)
+            temp_iform.line_number += offset
+            tmp_kernel.append(temp_iform)
+        dependencies, chains = self._find_dependencies(kernel, flag_dependencies)
+        carried_dependencies, _ = self._find_dependencies(
+            kernel, flag_dependencies, chains=chains, start=len(kernel)
+        )
+        return self._build_DG(
+            tmp_kernel,
+            dependencies
+            + carried_dependencies
+            + [
+                (source + len(kernel), index, target + len(kernel), operand, dep_flags)
+                for source, index, target, operand, dep_flags in dependencies
+            ],
+        )
+
+    @staticmethod
+    def _longest_paths(dg, topological_order, source, target, max_paths):
+        """
+        Return the ``max_paths`` longest paths from ``source`` to ``target`` in the DAG ``dg``.
+
+        Each node keeps the best ``max_paths`` partial paths reaching it, so the runtime is
+        linear in the number of edges for a fixed ``max_paths``.  Only nodes from which
+        ``target`` is reachable are considered, hence the result contains *all* paths if there
+        are at most ``max_paths`` of them.
+
+        :param dg: directed acyclic graph
+        :type dg: :class:`~osaca.semantics.dependency_graph.DependencyGraph`
+        :param list topological_order: node ids of ``dg`` in topological order
+        :param int source: node id of start node
+        :param int target: node id of end node
+        :param int max_paths: maximum number of paths to return
+        :returns: `list` of paths, each as list of node ids
+        """
+        relevant = dg.ancestors(target)
+        if not relevant[source] or source == target:
+            return []
+        # partial paths are stored as (latency, (node, (predecessor, (...))))
+        best = {source: [(0.0, (source, None))]}
+        sources = dg.sources
+        latencies = dg.latencies
+        for node in topological_order[topological_order.index(source) + 1 :]:
+            if not relevant[node]:
+                continue
+            candidates = [
+                (latency + latencies[edge], (node, link))
+                for edge in dg.predecessors(node)
+                if sources[edge] in best
+                for latency, link in best[sources[edge]]
+            ]
+            if candidates:
+                best[node] = heapq.nlargest(max_paths, candidates, key=itemgetter(0))
+            if node == target:
+                break
+        paths = []
+        for _, link in best.get(target, []):
+            path = []
+            while link is not None:
+                path.append(link[0])
+                link = link[1]
+            paths.append(path[::-1])
+        return paths
+
     def _get_node_by_lineno(self, dg, lineno):
         """Return instruction form with line number ``lineno`` from  dg"""
-        return dg.nodes[lineno]["instruction_form"]
+        return dg.instruction_forms[dg.node_id(lineno)]
 
     def get_critical_path(self):
         """Find and return critical path after the creation of a directed graph."""
         max_latency_instr = max(self.kernel, key=lambda k: k.latency)
-        if nx.algorithms.dag.is_directed_acyclic_graph(self.dg):
-            longest_path = nx.algorithms.dag.dag_longest_path(self.dg, weight="latency")
+        dg = self._get_graph()
+        topological_order = dg.topological_order()
+        if topological_order is not None:
+            longest_path = dg.longest_path(topological_order)
             # TODO verify that we can remove the next two lince due to earlier initialization
-            for line_number in longest_path:
-                self._get_node_by_lineno(self.dg, line_number).latency_cp = 0
+            for node in longest_path:
+                dg.instruction_forms[node].latency_cp = 0
             # set cp latency to instruction
             path_latency = 0.0
-            for s, d in nx.utils.pairwise(longest_path):
-                node = self._get_node_by_lineno(self.dg, s)
-                node.latency_cp = self.dg.edges[(s, d)]["latency"]
+            for s, d in zip(longest_path, longest_path[1:]):
+                node = dg.instruction_forms[s]
+                node.latency_cp = dg.latencies[dg.edge_id(s, d)]
                 path_latency += node.latency_cp
             # add latency for last instruction
-            node = self._get_node_by_lineno(self.dg, longest_path[-1])
+            node = dg.instruction_forms[longest_path[-1]]
             node.latency_cp = node.latency
             if max_latency_instr.latency > path_latency:
                 max_latency_instr.latency_cp = float(max_latency_instr.latency)
                 return [max_latency_instr]
             else:
-                return [self._get_node_by_lineno(self.dg, x) for x in longest_path]
+                return [dg.instruction_forms[x] for x in longest_path]
         else:
             # split to DAG
             raise NotImplementedError("Kernel is cyclic.")
@@ -291,12 +400,207 @@ class KernelDG(nx.DiGraph):
         """
         Return all LCDs from kernel (after :func:`~KernelDG.check_for_loopcarried_dep` was run)
         """
-        if nx.algorithms.dag.is_directed_acyclic_graph(self.dg):
+        if self._get_graph().is_acyclic():
             return self.loopcarried_deps
         else:
             # split to DAG
             raise NotImplementedError("Kernel is cyclic.")
 
+    def _find_dependencies(self, kernel, flag_dependencies=False, chains=None, start=0):
+        """
+        Find all dependencies between instruction forms of a kernel in a single forward sweep.
+
+        The result is the same as from :func:`find_depending` for every instruction form and all
+        subsequent ones, but each destination operand is only followed until it is overwritten
+        (i.e., as long as it is a reaching definition). Register and flag destinations are looked
+        up by :func:`~osaca.parser.BaseParser.get_reg_dependency_key`, so instruction forms are
+        only checked against destinations they may depend on.
+
+        :param kernel: Parsed asm kernel with assigned semantic information
+        :type kernel: list
+        :param flag_dependencies: indicating if dependencies of flags should be considered,
+                                  defaults to `False`
+        :type flag_dependencies: boolean, optional
+        :param chains: destinations still followed after a previous call, to follow them through
+                       ``kernel`` again. No new destinations are followed if given.
+        :type chains: tuple, optional
+        :param int start: position of the first instruction form of ``kernel``, defaults to `0`
+        :returns: `tuple` -- list of dependencies, each as tuple (source position, index of
+                  destination operand, target position, operand creating the dependency,
+                  properties of the dependency), and destinations still followed at the end
+        """
+        follow_new = chains is None
+        register_chains, memory_chains = ({}, []) if follow_new else chains
+        dependencies = []
+        for position, instruction_form in enumerate(kernel, start):
+            if self.deadline is not None:
+                self.deadline.check()
+            written_keys = set()
+            if instruction_form.semantic_operands is not None:
+                written_keys = self._get_written_keys(instruction_form)
+            if instruction_form.semantic_operands is not None and register_chains:
+                # read of register or flag
+                for dep_chain in self._get_chains(
+                    register_chains, self._get_read_keys(instruction_form)
+                ):
+                    dst = dep_chain.operand
+                    if isinstance(dst, RegisterOperand):
+                        read_kind = self._read_kind(dst, instruction_form)
+                        if read_kind == KernelDG.ReadKind.NOT_A_READ:
+                            continue
+                        dep_flags = []
+                        if (
+                            dst.pre_indexed
+                            or dst.post_indexed
+                            or isinstance(dst.post_indexed, dict)
+                        ):
+                            dep_flags = ["p_indexed"]
+                        if read_kind == KernelDG.ReadKind.READ_FOR_LOAD:
+                            dep_flags += ["for_load"]
+                    elif self.is_read(dst, instruction_form):
+                        dep_flags = []
+                    else:
+                        continue
+                    dependencies.append(
+                        (dep_chain.source, dep_chain.index, position, dst, dep_flags)
+                    )
+                # write to register or flag -> abort
+                for key in written_keys:
+                    if key in register_chains:
+                        register_chains[key] = [
+                            dep_chain
+                            for dep_chain in register_chains[key]
+                            if not self.is_written(dep_chain.operand, instruction_form)
+                        ]
+            if memory_chains:
+                self._follow_memory_chains(
+                    memory_chains, instruction_form, position, written_keys, dependencies
+                )
+            if follow_new and instruction_form.semantic_operands is not None:
+                for index, dst in enumerate(
+                    chain(
+                        instruction_form.semantic_operands["destination"],
+                        instruction_form.semantic_operands["src_dst"],
+                    )
+                ):
+                    if isinstance(dst, RegisterOperand) or (
+                        isinstance(dst, FlagOperand) and flag_dependencies
+                    ):
+                        register_chains.setdefault(
+                            self.parser.get_reg_dependency_key(dst), []
+                        ).append(_DependencyChain(position, index, dst))
+                    elif isinstance(dst, MemoryOperand):
+                        memory_chains.append(
+                            _DependencyChain(
+                                position, index, dst, self._update_reg_changes(instruction_form)
+                            )
+                        )
+        return dependencies, (register_chains, memory_chains)
+
+    def _follow_memory_chains(
+        self, memory_chains, instruction_form, position, written_keys, dependencies
+    ):
+        """
+        Check followed memory destinations for loads and stores of an instruction form.
+
+        Destinations overwritten by the instruction form are removed from ``memory_chains``.
+        """
+        has_reg_changes = self.arch_sem is not None and (
+            self.arch_sem.get_reg_changes(instruction_form)
+            or self.arch_sem.get_reg_changes(instruction_form, only_postindexed=True)
+        )
+        has_load = has_store = False
+        if instruction_form.semantic_operands is not None:
+            has_load = any(
+                isinstance(src, MemoryOperand)
+                for src in chain(
+                    instruction_form.semantic_operands["source"],
+                    instruction_form.semantic_operands["src_dst"],
+                )
+            )
+            has_store = any(
+                isinstance(dst, MemoryOperand)
+                for dst in chain(
+                    instruction_form.semantic_operands["destination"],
+                    instruction_form.semantic_operands["src_dst"],
+                )
+            )
+        followed_memory_chains = []
+        for dep_chain in memory_chains:
+            dst = dep_chain.operand
+            if has_reg_changes:
+                self._update_reg_changes(instruction_form, dep_chain.register_changes)
+            # base register is altered during memory access
+            if (
+                (dst.pre_indexed or dst.post_indexed)
+                and self.parser.get_reg_dependency_key(dst.base) in written_keys
+                and self.is_written(dst.base, instruction_form)
+            ):
+                continue
+            # load from same location (presumed)
+            if has_load and self.is_memload(dst, instruction_form, dep_chain.register_changes):
+                dependencies.append(
+                    (dep_chain.source, dep_chain.index, position, dst, ["storeload_dep"])
+                )
+            # store to same location (presumed)
+            if has_store and self.is_memstore(dst, instruction_form, dep_chain.register_changes):
+                continue
+            if has_reg_changes:
+                self._update_reg_changes(
+                    instruction_form, dep_chain.register_changes, only_postindexed=True
+                )
+            followed_memory_chains.append(dep_chain)
+        memory_chains[:] = followed_memory_chains
+
+    @staticmethod
+    def _get_chains(register_chains, keys):
+        """Return followed register and flag destinations with one of the given keys."""
+        return [dep_chain for key in keys for dep_chain in register_chains.get(key, [])]
+
+    def _get_read_keys(self, instruction_form):
+        """Return dependency keys of all registers and flags read by an instruction form."""
+        keys = set()
+        for src in chain(
+            instruction_form.semantic_operands["source"],
+            instruction_form.semantic_operands["src_dst"],
+        ):
+            if isinstance(src, (RegisterOperand, FlagOperand)):
+                keys.add(self.parser.get_reg_dependency_key(src))
+            if isinstance(src, MemoryOperand):
+                if src.base is not None:
+                    keys.add(self.parser.get_reg_dependency_key(src.base))
+                if src.index is not None and isinstance(src.index, RegisterOperand):
+                    keys.add(self.parser.get_reg_dependency_key(src.index))
+        for dst in chain(
+            instruction_form.semantic_operands["destination"],
+            instruction_form.semantic_operands["src_dst"],
+        ):
+            if isinstance(dst, MemoryOperand):
+                if dst.base is not None:
+                    keys.add(self.parser.get_reg_dependency_key(dst.base))
+                if dst.index is not None:
+                    keys.add(self.parser.get_reg_dependency_key(dst.index))
+        return keys
+
+    def _get_written_keys(self, instruction_form):
+        """Return dependency keys of all registers and flags written by an instruction form."""
+        keys = set()
+        for dst in chain(
+            instruction_form.semantic_operands["destination"],
+            instruction_form.semantic_operands["src_dst"],
+        ):
+            if isinstance(dst, (RegisterOperand, FlagOperand)):
+                keys.add(self.parser.get_reg_dependency_key(dst))
+            if isinstance(dst, MemoryOperand) and (dst.pre_indexed or dst.post_indexed):
+                keys.add(self.parser.get_reg_dependency_key(dst.base))
+        for src in chain(
+            instruction_form.semantic_operands["source"],
+            instruction_form.semantic_operands["src_dst"],
+        ):
+            if isinstance(src, MemoryOperand) and (src.pre_indexed or src.post_indexed):
+                keys.add(self.parser.get_reg_dependency_key(src.base))
+        return keys
+
     def find_depending(self, instruction_form, instructions, flag_dependencies=False):
         """
         Find instructions in `instructions` depending on a given instruction form's results.
@@ -402,8 +706,14 @@ class KernelDG(nx.DiGraph):
         if not instr_form and not line_number:
             raise ValueError("Either instruction form or line_number required.")
         line_number = line_number if line_number else instr_form["line_number"]
-        if self.dg.has_node(line_number):
-            return self.dg.successors(line_number)
+        dg = self._get_graph()
+        if line_number in dg:
+            return iter(
+                [
+                    dg.line_numbers[dg.targets[edge]]
+                    for edge in dg.successors(dg.node_id(line_number))
+                ]
+            )
         return iter([])
 
     def _read_kind(self, register, instruction_form):
@@ -571,7 +881,13 @@ class KernelDG(nx.DiGraph):
         :param filepath: path to write DOT file, defaults to None.
         :type filepath: str, optional
         """
-        graph = copy.deepcopy(self.dg)
+        import networkx as nx
+
+        # the copy is changed below, which must not affect the analyses
+        if self._nx_graph is not None:
+            graph = copy.deepcopy(self._nx_graph)
+        else:
+            graph = self._graph.to_networkx()
         cp = self.get_critical_path()
         cp_line_numbers = [x.line_number for x in cp]
         lcd = self.get_loopcarried_dependencies()
@@ -661,7 +977,7 @@ class KernelDG(nx.DiGraph):
             edge["color"] = color
 
         for ln, node in graph.nodes.items():
-            node["tooltip"] = self._get_node_by_lineno(graph, ln).line
+            node["tooltip"] = node["instruction_form"].line
         for edge in graph.edges.values():
             if "operand" in edge:
                 operand = edge["operand"]
@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
-from collections import OrderedDict
+from collections import OrderedDict, deque
 from enum import Enum
 
 from osaca.parser import get_parser
+from osaca.parser.instruction_form import InstructionForm
 from osaca.parser.identifier import IdentifierOperand
 from osaca.parser.immediate import ImmediateOperand
 from osaca.parser.memory import MemoryOperand
@@ -37,11 +38,74 @@ def reduce_to_section(kernel, parser):
     return kernel[start:end]
 
 
+def parse_marked_section(code, parser, deadline=None):
+    """
+    Parse only the marked section of assembly code.
+
+    The code is scanned lazily line by line. To find the markers, only lines which can be part
+    of a marker are parsed, all other lines are replaced by empty instruction forms. In a second
+    scan, the lines of the marked section are parsed. Lines outside of the marked section are
+    never fully parsed and no instruction forms are kept for them.
+
+    :param str code: assembly code
+    :param parser: parser to use
+    :type parser: :class:`~parser.BaseParser`
+    :param deadline: deadline checked for every line, defaults to `None`
+    :type deadline: :class:`~osaca.utils.Deadline`, optional
+    :returns: (`list`, `bool`) -- marked section as list of instruction forms and whether
+              markers were found. Without markers, the whole code is returned.
+    """
+    # a line can only match a marker line, if it has the same mnemonic and contains one of the
+    # immediate values of the marker (in decimal or hexadecimal notation) or if it is a directive
+    # of the same name
+    mnemonics = set()
+    directives = set()
+    values = set()
+    for marker_line in parser.start_marker() + parser.end_marker():
+        for form in marker_line if isinstance(marker_line, list) else [marker_line]:
+            if form.mnemonic is not None:
+                mnemonics.add(form.mnemonic.lower())
+                for operand in form.operands:
+                    if isinstance(operand, MemoryOperand):
+                        operand = operand.offset
+                    if isinstance(operand, ImmediateOperand):
+                        values.update([str(operand.value), format(operand.value, "x")])
+            if form.directive is not None:
+                directives.add("." + form.directive.name.lower())
+    skipped_line = InstructionForm()
+
+    def scan():
+        for line_number, line in parser.iter_lines(code):
+            if deadline is not None:
+                deadline.check()
+            keyword = line.split(None, 1)[0].lower()
+            if (
+                keyword in directives
+                or (keyword in mnemonics and any(value in line.lower() for value in values))
+                or any(marker in line for marker in COMMENT_MARKER.values())
+            ):
+                yield parser.parse_line(line, line_number)
+            else:
+                yield skipped_line
+
+    start, end = find_marked_section(scan(), parser, COMMENT_MARKER)
+    kernel = []
+    for i, (line_number, line) in enumerate(parser.iter_lines(code)):
+        if end != -1 and i >= end:
+            break
+        if i >= start:
+            if deadline is not None:
+                deadline.check()
+            kernel.append(parser.parse_line(line, line_number))
+    return kernel, start != -1 or end != -1
+
+
 def find_marked_section(lines, parser, comments=None):
     """
     Return indexes of marked section
 
-    :param list lines: kernel
+    :param lines: kernel, any iterable of instruction forms is only consumed as far as needed
+    :type lines: list or iterable
     :param parser: parser to use for checking
     :type parser: :class:`~parser.BaseParser`
     :param comments: dictionary with start and end markers in comment format, defaults to None
@@ -52,7 +116,12 @@ def find_marked_section(lines, parser, comments=None):
     index_end = -1
     start_marker = parser.start_marker()
     end_marker = parser.end_marker()
-    for i, line in enumerate(lines):
+    lines = iter(lines)
+    # lines from index i on, which were already consumed by marker matching
+    window = deque()
+    i = 0
+    while window or _read_line(window, lines):
+        line = window[0]
         try:
             if line.mnemonic is None and comments is not None and line.comment is not None:
                 if comments["start"] == line.comment:
@@ -60,20 +129,38 @@ def find_marked_section(lines, parser, comments=None):
                 elif comments["end"] == line.comment:
                     index_end = i
             if index_start == -1:
-                matching_lines = match_lines(parser, lines[i:], start_marker)
+                matching_lines = match_lines(parser, _lookahead(window, lines), start_marker)
                 if matching_lines > 0:
                     # Return the first line after the marker.
                     index_start = i + matching_lines
             if index_end == -1:
-                if match_lines(parser, lines[i:], end_marker):
+                if match_lines(parser, _lookahead(window, lines), end_marker):
                     index_end = i
         except TypeError as e:
             print(i, e, line)
         if index_start != -1 and index_end != -1:
             break
+        window.popleft()
+        i += 1
     return index_start, index_end
 
 
+def _read_line(window, lines):
+    """Append next line to window, return False if there are no lines left."""
+    for line in lines:
+        window.append(line)
+        return True
+    return False
+
+
+def _lookahead(window, lines):
+    """Iterate over window, reading further lines on demand."""
+    i = 0
+    while i < len(window) or _read_line(window, lines):
+        yield window[i]
+        i += 1
+
+
 # This function and the following ones traverse the syntactic tree produced by the parser and try to
 # match it to the marker.  This is necessary because the IACA markers are significantly different on
 # MSVC x86 than on other ISA/compilers.  Therefore, simple string matching is not sufficient.  Also,
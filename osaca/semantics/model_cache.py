@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+Compact on-disk cache for machine models.
+
+The cache file consists of a fixed header, a table of contents, the model data without
+instruction forms ("meta") and two serialized blocks per mnemonic, one with its
+:class:`~osaca.parser.instruction_form.InstructionForm` objects and one with its raw entries::
+
+    header | meta | mnemonic names | offset table | forms_0 | entries_0 | forms_1 | ...
+
+The file is memory-mapped and instruction forms of a mnemonic are only deserialized on their
+first lookup. Raw entries are only needed for DB tools and read separately. Operands are
+shared between instruction forms, so they are stored once in a table after the meta data and
+referenced from the instruction forms blocks by their position in the table.
+"""
+
+import copy
+import hashlib
+import io
+import json
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+import time
+from collections import UserList, defaultdict
+from functools import lru_cache
+from operator import itemgetter
+
+from osaca import utils
+from osaca.parser.operand import Operand
+
+MAGIC = b"OSACAMC\x03"
+# magic, internal version, #mnemonics, meta offset/size, names offset/size, table offset
+HEADER = struct.Struct("<8sIIQQQQQ")
+# offset and size of instruction forms block, offset and size of raw entries block
+TABLE_ENTRY = struct.Struct("<QQQQ")
+# index of all cached models in utils.CACHE_DIR
+INDEX_FILENAME = "index.json"
+# files modified within this time span (in seconds) are always hashed, as their modification
+# time may not change with a subsequent write
+RACY_STAMP_PERIOD = 2
+_index = {}
+
+
+# Instruction forms are only used for analysis, so the line/column and comment information of
+# their YAML values is dropped, which halves their size in the cache and the time to load them.
+# Raw entries and meta data keep it for dumping the model.
+@lru_cache(maxsize=None)
+def _get_plain_types():
+    """Return pickle dispatch table storing YAML round-trip types as their builtin type."""
+    # only needed when writing a cache, so YAML is not imported for reading cached models
+    from ruamel.yaml.comments import CommentedMap, CommentedSeq
+    from ruamel.yaml.scalarbool import ScalarBoolean
+    from ruamel.yaml.scalarfloat import ScalarFloat
+    from ruamel.yaml.scalarint import ScalarInt
+    from ruamel.yaml.scalarstring import ScalarString
+
+    table = {}
+    for yaml_type, plain_type in [
+        (CommentedSeq, list),
+        (CommentedMap, dict),
+        (ScalarFloat, float),
+        (ScalarInt, int),
+        (ScalarBoolean, bool),
+        (ScalarString, str),
+    ]:
+        classes = [yaml_type]
+        while classes:
+            cls = classes.pop()
+            table[cls] = lambda obj, plain_type=plain_type: (plain_type, (plain_type(obj),))
+            classes += cls.__subclasses__()
+    return table
+
+
+def _dumps_plain(obj):
+    """Pickle object, converting YAML round-trip types to builtin types."""
+    buffer = io.BytesIO()
+    pickler = pickle.Pickler(buffer, pickle.HIGHEST_PROTOCOL)
+    pickler.dispatch_table = _get_plain_types()
+    pickler.dump(obj)
+    return buffer.getvalue()
+
+
+class _FormsPickler(pickle.Pickler):
+    """
+    Pickler converting YAML round-trip types to builtin types and storing operands by their
+    position in an operand table shared by all instruction forms blocks.
+    """
+
+    def __init__(self, file, operands, operand_ids):
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.dispatch_table = _get_plain_types()
+        self._operands = operands
+        self._operand_ids = operand_ids
+
+    def persistent_id(self, obj):
+        if not isinstance(obj, Operand):
+            return None
+        if id(obj) not in self._operand_ids:
+            self._operand_ids[id(obj)] = len(self._operands)
+            self._operands.append(obj)
+        return self._operand_ids[id(obj)]
+
+
+def _dumps_forms(forms, operands, operand_ids):
+    """
+    Pickle instruction forms, adding their operands to the operand table.
+
+    :param list forms: instruction forms to pickle
+    :param list operands: operand table
+    :param dict operand_ids: position in the operand table by operand id
+    """
+    buffer = io.BytesIO()
+    _FormsPickler(buffer, operands, operand_ids).dump(forms)
+    return buffer.getvalue()
+
+
+def get_model_hash(path):
+    """
+    Return the sha256 hash of a machine model file.
+
+    The hash is only computed if the (size, mtime_ns, inode) stamp of the file differs from
+    the one stored in the cache index, otherwise the stored hash is returned.
+
+    :param str path: path of the machine model file
+    :returns: `str` -- hex digest of the file content
+    """
+    stat = os.stat(path)
+    stamp = [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+    key = os.path.realpath(path)
+    index = _get_index()
+    entry = index.get(key)
+    if entry is not None and entry.get("stamp") == stamp and "sha256" in entry:
+        return entry["sha256"]
+    with open(path, "rb") as f:
+        hexhash = hashlib.sha256(f.read()).hexdigest()
+    if time.time() - stat.st_mtime_ns / 1e9 > RACY_STAMP_PERIOD:
+        index[key] = {"stamp": stamp, "sha256": hexhash}
+        _write_index(index)
+    return hexhash
+
+
+def register_cachefile(path, cachefile):
+    """
+    Record the cache file of a machine model in the cache index.
+
+    :param str path: path of the machine model file
+    :param str cachefile: path of the corresponding cache file
+    """
+    index = _get_index()
+    entry = index.get(os.path.realpath(path))
+    cachefile = os.path.abspath(cachefile)
+    if entry is not None and entry.get("cachefile") != cachefile:
+        entry["cachefile"] = cachefile
+        _write_index(index)
+
+
+def _get_index():
+    """Return cache index of utils.CACHE_DIR, read only once per process."""
+    if utils.CACHE_DIR not in _index:
+        try:
+            with open(os.path.join(utils.CACHE_DIR, INDEX_FILENAME), "r") as f:
+                _index[utils.CACHE_DIR] = json.load(f)
+        except (OSError, ValueError):
+            _index[utils.CACHE_DIR] = {}
+    return _index[utils.CACHE_DIR]
+
+
+def _write_index(index):
+    """Write cache index to utils.CACHE_DIR, silently ignoring unwritable directories."""
+    try:
+        os.makedirs(utils.CACHE_DIR, exist_ok=True)
+        _atomic_write(os.path.join(utils.CACHE_DIR, INDEX_FILENAME), [json.dumps(index).encode()])
+    except OSError:
+        pass
+
+
+def _atomic_write(path, parts):
+    """Write to temporary file first, so concurrent readers never see partial files."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for part in parts:
+                f.write(part)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def write_model_cache(path, data, internal_version):
+    """
+    Write machine model data into a compact cache file.
+
+    :param str path: path of the cache file
+    :param dict data: machine model data as created by
+                      :class:`~osaca.semantics.hw_model.MachineModel`
+    :param int internal_version: internal version of the data format
+    """
+    meta = data.copy()
+    del meta["instruction_forms"]
+    del meta["instruction_forms_dict"]
+    # group raw entries by mnemonic, keeping their position in the model
+    entries = defaultdict(list)
+    for position, entry in enumerate(data["instruction_forms"]):
+        entries[entry["name"] if isinstance(entry, dict) else entry.mnemonic].append(
+            (position, entry)
+        )
+    names = sorted(set(entries) | set(data["instruction_forms_dict"]))
+    blocks = []
+    operands = []
+    operand_ids = {}
+    for name in names:
+        forms = data["instruction_forms_dict"].get(name, [])
+        blocks.append(_dumps_forms(forms, operands, operand_ids))
+        blocks.append(pickle.dumps(entries.get(name, []), pickle.HIGHEST_PROTOCOL))
+    meta_block = pickle.dumps(meta, pickle.HIGHEST_PROTOCOL) + _dumps_plain(operands)
+    names_block = "\n".join(names).encode("utf8")
+
+    meta_offset = HEADER.size
+    names_offset = meta_offset + len(meta_block)
+    table_offset = names_offset + len(names_block)
+    offset = table_offset + TABLE_ENTRY.size * len(names)
+    table = []
+    for forms_block, entries_block in zip(blocks[::2], blocks[1::2]):
+        table.append(
+            TABLE_ENTRY.pack(
+                offset, len(forms_block), offset + len(forms_block), len(entries_block)
+            )
+        )
+        offset += len(forms_block) + len(entries_block)
+    header = HEADER.pack(
+        MAGIC,
+        internal_version,
+        len(names),
+        meta_offset,
+        len(meta_block),
+        names_offset,
+        len(names_block),
+        table_offset,
+    )
+    _atomic_write(path, [header, meta_block, names_block] + table + blocks)
+
+
+def load_model_cache(path, internal_version, intern_operand=None):
+    """
+    Load machine model data from a compact cache file.
+
+    The returned data contains lazy containers for ``instruction_forms`` and
+    ``instruction_forms_dict`` which read the instruction forms on first access.
+
+    :param str path: path of the cache file
+    :param int internal_version: expected internal version of the data format
+    :param intern_operand: function applied once to every operand of the instruction forms,
+                           e.g., for sharing them with other models
+    :returns: `dict` -- model data, `None` if the cache is invalid or outdated
+    """
+    try:
+        reader = ModelCacheReader(path)
+    except (OSError, ValueError, struct.error):
+        return None
+    if reader.internal_version != internal_version:
+        return None
+    data = reader.load_meta()
+    if intern_operand is not None:
+        reader.operands = [intern_operand(operand) for operand in reader.operands]
+    data["instruction_forms"] = LazyInstructionFormList(reader=reader)
+    data["instruction_forms_dict"] = LazyInstructionFormDict(reader)
+    return data
+
+
+class ModelCacheReader(object):
+    """Memory-mapped read access to a compact model cache file."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic,
+            self.internal_version,
+            count,
+            self._meta_offset,
+            self._meta_size,
+            names_offset,
+            names_size,
+            table_offset,
+        ) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError("{!r} is no OSACA model cache.".format(path))
+        names = self._mm[names_offset : names_offset + names_size].decode("utf8")
+        names = names.split("\n") if count else []
+        table = struct.iter_unpack(
+            TABLE_ENTRY.format,
+            self._mm[table_offset : table_offset + TABLE_ENTRY.size * count],
+        )
+        self._table = dict(zip(names, table))
+        self._loaded = {}
+        self._loaded_entries = {}
+        self.operands = []
+
+    @property
+    def names(self):
+        """Return all mnemonics in the cache."""
+        return self._table.keys()
+
+    def __contains__(self, name):
+        return name in self._table
+
+    def load_meta(self):
+        """Return model data without instruction forms and read the operand table."""
+        stream = io.BytesIO(self._mm[self._meta_offset : self._meta_offset + self._meta_size])
+        meta = pickle.load(stream)
+        self.operands = pickle.load(stream)
+        return meta
+
+    def load(self, name):
+        """
+        Return instruction forms of a mnemonic. Every block is deserialized only once.
+        """
+        if name not in self._loaded:
+            offset, size = self._table[name][:2]
+            unpickler = pickle.Unpickler(io.BytesIO(self._mm[offset : offset + size]))
+            unpickler.persistent_load = self.operands.__getitem__
+            self._loaded[name] = unpickler.load()
+        return self._loaded[name]
+
+    def load_entries(self, name):
+        """
+        Return raw entries of a mnemonic together with their position in the model. Every
+        block is deserialized only once.
+        """
+        if name not in self._loaded_entries:
+            offset, size = self._table[name][2:]
+            self._loaded_entries[name] = pickle.loads(self._mm[offset : offset + size])
+        return self._loaded_entries[name]
+
+
+class LazyInstructionFormDict(defaultdict):
+    """``defaultdict(list)`` of instruction forms per mnemonic, filled from a model cache."""
+
+    def __init__(self, reader):
+        super().__init__(list)
+        self._reader = reader
+
+    def __missing__(self, name):
+        if name in self._reader:
+            value = self._reader.load(name)
+            self[name] = value
+            return value
+        return super().__missing__(name)
+
+    def __contains__(self, name):
+        return dict.__contains__(self, name) or name in self._reader
+
+    def get(self, name, default=None):
+        return self[name] if name in self else default
+
+    def _load_all(self):
+        for name in self._reader.names:
+            if not dict.__contains__(self, name):
+                self[name]
+
+    def __iter__(self):
+        self._load_all()
+        return super().__iter__()
+
+    def __len__(self):
+        self._load_all()
+        return super().__len__()
+
+    def keys(self):
+        self._load_all()
+        return super().keys()
+
+    def values(self):
+        self._load_all()
+        return super().values()
+
+    def items(self):
+        self._load_all()
+        return super().items()
+
+    def __deepcopy__(self, memo):
+        self._load_all()
+        result = defaultdict(list)
+        memo[id(self)] = result
+        for name, value in dict.items(self):
+            result[name] = copy.deepcopy(value, memo)
+        return result
+
+    def __reduce__(self):
+        self._load_all()
+        return (defaultdict, (list,), None, None, iter(dict.items(self)))
+
+
+class LazyInstructionFormList(UserList):
+    """List of raw instruction form entries in model order, read from a model cache on first
+    use."""
+
+    def __init__(self, initlist=None, reader=None):
+        self._reader = reader
+        self._list = None if reader is not None else list(initlist or [])
+
+    @property
+    def data(self):
+        if self._list is None:
+            entries = []
+            for name in self._reader.names:
+                entries += self._reader.load_entries(name)
+            self._list = [entry for _, entry in sorted(entries, key=itemgetter(0))]
+        return self._list
+
+    @data.setter
+    def data(self, value):
+        self._list = value
+
+    def __deepcopy__(self, memo):
+        result = []
+        memo[id(self)] = result
+        result += copy.deepcopy(self.data, memo)
+        return result
+
+    def __reduce__(self):
+        return (list, (self.data,))
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Exact port balancing for throughput analysis.
+
+Uops which can be issued on several ports are aggregated by their set of ports. The total cycles
+of each port set are then distributed over the ports, such that the maximum port load is
+minimal. Among all optimal distributions, the most balanced one is chosen, i.e., the sorted
+vector of port loads is lexicographically minimal. This port load vector is unique.
+
+The distribution is computed by repeatedly finding the most loaded set of ports with a Newton
+iteration over minimum cuts of the bipartite port set/port flow network, fixing the load of these
+ports and continuing with the remaining ones.
+"""
+
+from collections import deque
+
+EPS = 1e-9
+
+
+def balance_port_load(fixed_load, demands):
+    """
+    Distribute cycles over ports with minimal maximum port load.
+
+    :param list fixed_load: load per port index which cannot be moved to other ports
+    :param dict demands: cycles per tuple of port indices, which can be distributed freely
+                         over the ports of the tuple
+    :returns: `dict` -- for each key of `demands` a dict mapping port indices to cycles
+    """
+    groups = [(ports, ports, cycles) for ports, cycles in demands.items() if cycles > EPS]
+    distribution = {ports: {} for ports in demands}
+    while groups:
+        level, tight_ports = _get_max_level(fixed_load, groups)
+        capacity = {p: max(0.0, level - fixed_load[p]) for p in tight_ports}
+        tight_groups = [group for group in groups if tight_ports.issuperset(group[1])]
+        flow, _ = _max_flow([(ports, cycles) for _, ports, cycles in tight_groups], capacity)
+        for (key, _, _), group_flow in zip(tight_groups, flow):
+            distribution[key] = group_flow
+        # remaining uops must not be issued on any of the tight ports anymore
+        groups = [
+            (key, tuple(p for p in ports if p not in tight_ports), cycles)
+            for key, ports, cycles in groups
+            if not tight_ports.issuperset(ports)
+        ]
+    return distribution
+
+
+def _get_max_level(fixed_load, groups):
+    """
+    Return minimal maximum load of the given uop groups together with the set of ports
+    reaching this load.
+    """
+    ports = set()
+    for _, group_ports, _ in groups:
+        ports.update(group_ports)
+    tight_ports = ports
+    level = _fill_level([fixed_load[p] for p in ports], sum(cycles for _, _, cycles in groups))
+    while True:
+        capacity = {p: max(0.0, level - fixed_load[p]) for p in ports}
+        _, reachable = _max_flow([(ports, cycles) for _, ports, cycles in groups], capacity)
+        if not reachable:
+            return level, tight_ports
+        # the ports reachable in the residual network cannot take their demand at this level
+        tight_ports = reachable
+        contained = sum(cycles for _, ports, cycles in groups if reachable.issuperset(ports))
+        new_level = _fill_level([fixed_load[p] for p in reachable], contained)
+        if new_level <= level + EPS:
+            # violation only caused by rounding errors
+            return level, tight_ports
+        level = new_level
+
+
+def _fill_level(loads, cycles):
+    """Return the water level after pouring `cycles` onto ports with the given loads."""
+    loads = sorted(loads)
+    total = 0.0
+    for i, load in enumerate(loads):
+        total += load
+        level = (total + cycles) / (i + 1)
+        if i + 1 == len(loads) or level <= loads[i + 1]:
+            return level
+
+
+def _max_flow(groups, capacity):
+    """
+    Compute a maximum flow from uop groups to ports with Edmonds-Karp.
+
+    :param list groups: tuples of (port indices, cycles)
+    :param dict capacity: capacity per port index
+    :returns: (`list`, `set`) -- flow per port for each group and the set of ports reachable
+              from the source in the residual network, which is empty if all cycles could be
+              assigned
+    """
+    flow = [dict.fromkeys(ports, 0.0) for ports, _ in groups]
+    remaining = [cycles for _, cycles in groups]
+    free = dict(capacity)
+    users = {p: [] for p in capacity}
+    for i, (ports, _) in enumerate(groups):
+        for p in ports:
+            users[p].append(i)
+    while True:
+        # BFS on residual network: source -> group -> port (-> group via back edge) -> sink
+        parent = {}
+        queue = deque(("group", i) for i in range(len(groups)) if remaining[i] > EPS)
+        for node in queue:
+            parent[node] = None
+        sink = None
+        while queue and sink is None:
+            kind, node = queue.popleft()
+            if kind == "group":
+                for p in groups[node][0]:
+                    if ("port", p) not in parent:
+                        parent[("port", p)] = ("group", node)
+                        if free[p] > EPS:
+                            sink = p
+                            break
+                        queue.append(("port", p))
+            else:
+                for i in users[node]:
+                    if ("group", i) not in parent and flow[i][node] > EPS:
+                        parent[("group", i)] = ("port", node)
+                        queue.append(("group", i))
+        if sink is None:
+            if any(remaining[i] > EPS for i in range(len(groups))):
+                return flow, {node for kind, node in parent if kind == "port"}
+            return flow, set()
+        # collect path and augment by its bottleneck
+        path = []
+        node = ("port", sink)
+        while parent[node] is not None:
+            path.append((parent[node], node))
+            node = parent[node]
+        amount = min(remaining[node[1]], free[sink])
+        for tail, head in path:
+            if tail[0] == "port":
+                amount = min(amount, flow[head[1]][tail[1]])
+        remaining[node[1]] -= amount
+        free[sink] -= amount
+        for tail, head in path:
+            if tail[0] == "group":
+                flow[tail[1]][head[1]] += amount
+            else:
+                flow[head[1]][tail[1]] -= amount
+
+
+class PortPressureMatrix(object):
+    """
+    Port pressure of all instructions of a kernel (instructions x ports) with column sums.
+
+    Rows are the ``port_pressure`` lists of the instruction forms themselves. Changes written
+    through :meth:`set_pressure` update the column sums incrementally in ``O(ports)``, so the
+    overall port pressure of the kernel does not need to be summed up again after each change.
+    As in :meth:`~osaca.semantics.ArchSemantics.get_throughput_sum`, only instructions with a
+    throughput other than ``0.0`` contribute to the sums.
+
+    :param list kernel: instruction forms with assigned port pressure
+    """
+
+    def __init__(self, kernel):
+        self._kernel = kernel
+        self._counted = [instr.throughput != 0.0 for instr in kernel]
+        self._sums = [
+            sum(col)
+            for col in zip(
+                *[instr.port_pressure for instr, counted in zip(kernel, self._counted) if counted]
+            )
+        ]
+
+    def __getitem__(self, idx):
+        return self._kernel[idx].port_pressure
+
+    def __len__(self):
+        return len(self._kernel)
+
+    def set_pressure(self, idx, ports, values):
+        """
+        Set port pressure of a single instruction.
+
+        :param int idx: index of the instruction in the kernel
+        :param list ports: port indices to change
+        :param list values: new port pressure for each port in `ports`
+        """
+        row = self._kernel[idx].port_pressure
+        counted = self._counted[idx]
+        for p, value in zip(ports, values):
+            if counted:
+                self._sums[p] += value - row[p]
+            row[p] = value
+
+    def get_sums(self, ndigits=None):
+        """
+        Return overall port pressure of the kernel.
+
+        :param int ndigits: round sums to this precision, defaults to no rounding
+        :returns: `list` -- port pressure sum per port
+        """
+        if ndigits is None:
+            return list(self._sums)
+        return [round(x, ndigits) for x in self._sums]
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Analysis server for OSACA.
+
+The server keeps parsers, semantics and machine models loaded in a pool of worker processes,
+so the time per request is spent on the analysis itself instead of the interpreter startup,
+imports and model loading.  Kernels are sent as JSON over HTTP, either on a local TCP port or
+a Unix socket:
+
+``POST /analyze``
+    Analyze the kernel in the ``code`` field of the JSON object in the request body.  Optional
+    fields are ``arch``, ``syntax``, ``lines``, ``fixed``, ``lcd_timeout`` and
+    ``consider_flag_deps`` (see the CLI options of the same name), ``filename`` (for the
+    header), ``report`` (add the text report as ``Report``) and ``ignore_unknown`` (for the
+    text report).  The response is the analysis as returned by
+    :func:`~osaca.frontend.Frontend.full_analysis_dict` with the outcome in
+    ``["Header"]["Status"]`` like for :func:`~osaca.osaca.batch_inspect`.
+``GET /status``
+    Return the version and supported micro-architectures of the server.
+
+Malformed requests are answered with status 400 and an ``Error`` message.
+"""
+
+import argparse
+import errno
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import socketserver
+import stat
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from osaca import __version__
+from osaca.frontend import Frontend
+from osaca.osaca import (
+    SUPPORTED_ARCHS,
+    SUPPORTED_SYNTAXES,
+    _analyze_kernel_file,
+    _preload_models,
+    _to_serializable,
+    get_line_range,
+    get_result_cache_key,
+    validate_arch_and_syntax,
+)
+
+# optional fields of an analysis request and their defaults
+REQUEST_DEFAULTS = {
+    "arch": None,
+    "syntax": None,
+    "lines": None,
+    "fixed": False,
+    "lcd_timeout": 10,
+    "consider_flag_deps": False,
+    "filename": "",
+    "report": False,
+    "ignore_unknown": False,
+}
+
+
+def parse_request(body):
+    """
+    Parse and check the body of an analysis request.
+
+    :param bytes body: JSON object with the ``code`` and optional fields of
+                       :data:`REQUEST_DEFAULTS`
+    :returns: `dict` -- request with all fields of :data:`REQUEST_DEFAULTS`
+    :raises ValueError: if the request is malformed
+    """
+    request = json.loads(body)
+    if not isinstance(request, dict):
+        raise ValueError("Request must be a JSON object.")
+    if not isinstance(request.get("code"), str):
+        raise ValueError('Request must contain the assembly code as string in "code".')
+    unknown_fields = set(request) - set(REQUEST_DEFAULTS) - {"code"}
+    if unknown_fields:
+        raise ValueError("Unknown request fields: {}.".format(", ".join(sorted(unknown_fields))))
+    request = dict(REQUEST_DEFAULTS, **request)
+    for field in ["arch", "syntax", "lines", "filename"]:
+        if request[field] is not None and not isinstance(request[field], str):
+            raise ValueError('"{}" must be a string.'.format(field))
+    for field in ["fixed", "consider_flag_deps", "report", "ignore_unknown"]:
+        if not isinstance(request[field], bool):
+            raise ValueError('"{}" must be a boolean.'.format(field))
+    if not isinstance(request["lcd_timeout"], int) or isinstance(request["lcd_timeout"], bool):
+        raise ValueError('"lcd_timeout" must be an integer.')
+    request["arch"], request["syntax"] = validate_arch_and_syntax(
+        request["arch"], request["syntax"]
+    )
+    if request["arch"] is not None:
+        request["arch"] = request["arch"].upper()
+    if request["lines"] is not None:
+        try:
+            get_line_range(request["lines"])
+        except ValueError:
+            raise ValueError("Invalid line range {!r}.".format(request["lines"])) from None
+    return request
+
+
+def analyze_request(request, timeout=None, result_cache=None):
+    """
+    Analyze the kernel of a request without raising on failure.
+
+    :param dict request: request as returned by :func:`parse_request`
+    :param timeout: wall-clock limit in seconds for the analysis, defaults to no limit
+    :type timeout: float, optional
+    :param result_cache: cache to look up and store results, defaults to no caching
+    :type result_cache: :class:`~osaca.result_cache.ResultCache`, optional
+    :returns: `dict` -- analysis dictionary with the kernel status in its header
+    """
+    args = argparse.Namespace(
+        arch=request["arch"],
+        syntax=request["syntax"],
+        lines=request["lines"],
+        fixed=request["fixed"],
+        legacy_balancing=False,
+        lcd_timeout=request["lcd_timeout"],
+        consider_flag_deps=request["consider_flag_deps"],
+    )
+    result = None
+    if result_cache is not None:
+        cache_key = get_result_cache_key(request["code"], args)
+        result = result_cache.get(cache_key)
+    if result is None:
+        result = _analyze_kernel_file(
+            request["filename"], args, timeout=timeout, code=request["code"], text_report=True
+        )
+        if result["Header"]["Status"] != "ok":
+            return result
+        # results of a timed out LCD analysis depend on the machine load and are not cached
+        if result_cache is not None and "LCDWarning" not in result["Warnings"]:
+            result_cache.put(cache_key, result)
+        frontend = Frontend(request["filename"], arch=result["Target"]["Name"])
+    else:
+        frontend = Frontend(request["filename"], arch=result["Target"]["Name"])
+        result = dict(result, Header=dict(frontend._header_report_dict(), Status="ok"))
+    if request["report"]:
+        result["Report"] = frontend.full_analysis_from_dict(
+            result, ignore_unknown=request["ignore_unknown"]
+        )
+    del result["TextReport"]
+    return result
+
+
+def _init_worker(archs, syntaxes):
+    """Initialize worker process of the server pool, see :func:`serve`."""
+    # the pool terminates its workers with SIGTERM, which the CLI turns into a KeyboardInterrupt
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    _preload_models(archs, syntaxes)
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    server_version = "OSACA/" + __version__
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path == "/status":
+            self._send_json(
+                200, {"Status": "ok", "Version": __version__, "Architectures": SUPPORTED_ARCHS}
+            )
+        else:
+            self._send_json(404, {"Error": "Unknown path {!r}.".format(self.path)})
+
+    def do_POST(self):
+        if self.path != "/analyze":
+            self._send_json(404, {"Error": "Unknown path {!r}.".format(self.path)})
+            return
+        try:
+            length = int(self.headers["Content-Length"])
+        except (TypeError, ValueError):
+            self._send_json(411, {"Error": "Content-Length required."})
+            return
+        try:
+            request = parse_request(self.rfile.read(length))
+        except ValueError as e:
+            self._send_json(400, {"Error": str(e)})
+            return
+        try:
+            result = self.server.analyze(request)
+        except Exception as e:
+            self._send_json(500, {"Error": "{}: {}".format(type(e).__name__, e)})
+            return
+        self._send_json(200, result)
+
+    def _send_json(self, status, body):
+        data = json.dumps(body, default=_to_serializable).encode()
+        # the request body may not have been read, so the connection cannot be reused
+        if status != 200:
+            self.close_connection = True
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self):
+        # clients of Unix sockets have no address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class _AnalysisServerMixin(object):
+    daemon_threads = True
+    pool = None
+    # not `timeout`, which is the poll timeout of `handle_request()`
+    analysis_timeout = None
+    result_cache = None
+    verbose = False
+
+    def analyze(self, request):
+        """Analyze request in the worker pool, see :func:`analyze_request`."""
+        return self.pool.apply(
+            analyze_request, (request, self.analysis_timeout, self.result_cache)
+        )
+
+
+class AnalysisHTTPServer(_AnalysisServerMixin, ThreadingHTTPServer):
+    """Analysis server listening on a TCP port."""
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+
+    class AnalysisUnixServer(_AnalysisServerMixin, socketserver.ThreadingUnixStreamServer):
+        """Analysis server listening on a Unix socket."""
+
+
+def create_server(address, pool, timeout=None, result_cache=None, verbose=False):
+    """
+    Create analysis server, requests are handled after calling its ``serve_forever()`` method.
+
+    :param address: path of a Unix socket or (host, port) tuple of a TCP socket, port 0 picks a
+                    free port
+    :type address: str or tuple
+    :param pool: worker pool analyzing the requests
+    :type pool: :class:`multiprocessing.pool.Pool`
+    :param timeout: wall-clock limit in seconds per request, defaults to no limit
+    :type timeout: float, optional
+    :param result_cache: cache to look up and store results, defaults to no caching
+    :type result_cache: :class:`~osaca.result_cache.ResultCache`, optional
+    :param bool verbose: log every request to stderr, defaults to `False`
+    :returns: :class:`AnalysisHTTPServer` or :class:`AnalysisUnixServer`
+    """
+    if isinstance(address, str):
+        if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+            raise ValueError("Unix sockets are not supported on this platform.")
+        # remove the socket of a terminated server, but never one in use or any other file
+        if os.path.exists(address) and stat.S_ISSOCK(os.stat(address).st_mode):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+                try:
+                    s.connect(address)
+                except ConnectionRefusedError:
+                    os.unlink(address)
+                else:
+                    raise OSError(errno.EADDRINUSE, os.strerror(errno.EADDRINUSE), address)
+        server = AnalysisUnixServer(address, _RequestHandler)
+    else:
+        server = AnalysisHTTPServer(address, _RequestHandler)
+    server.pool = pool
+    server.analysis_timeout = timeout
+    server.result_cache = result_cache
+    server.verbose = verbose
+    return server
+
+
+def serve(
+    address,
+    archs=None,
+    jobs=None,
+    timeout=None,
+    result_cache=None,
+    verbose=False,
+    output_file=sys.stdout,
+):
+    """
+    Run analysis server until interrupted.
+
+    :param address: path of a Unix socket or (host, port) tuple of a TCP socket
+    :type address: str or tuple
+    :param archs: micro-architectures to load ahead of time, defaults to all supported ones
+    :type archs: list, optional
+    :param int jobs: number of worker processes, defaults to the number of CPUs
+    :param timeout: wall-clock limit in seconds per request, defaults to no limit
+    :type timeout: float, optional
+    :param result_cache: cache to look up and store results, defaults to no caching
+    :type result_cache: :class:`~osaca.result_cache.ResultCache`, optional
+    :param bool verbose: log every request to stderr, defaults to `False`
+    :param output_file: Define the stream for status messages, defaults to :class:`sys.stdout`
+    :type output_file: stream, optional
+    """
+    # Loading before the pool is created lets forked workers start warm, other start methods
+    # load in the initializer of each worker.
+    preload_args = (archs or SUPPORTED_ARCHS, SUPPORTED_SYNTAXES)
+    _preload_models(*preload_args)
+    with multiprocessing.Pool(jobs, initializer=_init_worker, initargs=preload_args) as pool:
+        server = create_server(address, pool, timeout, result_cache, verbose)
+        if isinstance(address, str):
+            location = "unix:" + address
+        else:
+            location = "http://{}:{}".format(*server.server_address[:2])
+        print("OSACA server listening on " + location, file=output_file, flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            if isinstance(address, str):
+                os.unlink(address)
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import os.path
+import time
 
 DATA_DIRS = [
     os.path.expanduser("~/.osaca/data"),
@@ -15,3 +16,69 @@ def find_datafile(name):
         if os.path.exists(path):
             return path
     raise FileNotFoundError("Could not find {!r} in {!r}.".format(name, DATA_DIRS))
+
+
+class DeadlineExceeded(BaseException):
+    """Raised by :meth:`Deadline.check` if the deadline expired or was cancelled.
+
+    Like :class:`KeyboardInterrupt`, it must abort the analysis wherever it is raised, so it is
+    no subclass of :class:`Exception`."""
+
+    def __init__(self, cancelled=False):
+        super().__init__("Analysis was cancelled." if cancelled else "Analysis deadline expired.")
+        self.cancelled = cancelled
+
+
+class Deadline(object):
+    """
+    Point in time at which an analysis is given up, or earlier if it is cancelled.
+
+    The analysis checks its deadline at regular points (while parsing, balancing ports and
+    searching dependencies), so cancelling it from another thread stops the analysis soon.
+    """
+
+    def __init__(self, timeout=None, parent=None):
+        """
+        Constructor method.
+
+        :param timeout: seconds from now until the deadline expires, defaults to no limit
+        :type timeout: float, optional
+        :param parent: deadline which expires or is cancelled together with this one, defaults
+                       to `None`
+        :type parent: :class:`Deadline`, optional
+        """
+        # monotonic clocks are system-wide, so deadlines stay valid in other processes
+        self._expires = None if timeout is None else time.monotonic() + timeout
+        self._parent = parent
+        self._cancelled = False
+
+    def cancel(self):
+        """Let the deadline expire immediately."""
+        self._cancelled = True
+
+    @property
+    def cancelled(self):
+        return self._cancelled or (self._parent is not None and self._parent.cancelled)
+
+    def remaining(self):
+        """Return remaining seconds until the deadline expires, `None` for no limit."""
+        if self.cancelled:
+            return 0.0
+        remaining = None
+        if self._expires is not None:
+            remaining = max(self._expires - time.monotonic(), 0.0)
+        if self._parent is not None:
+            parent_remaining = self._parent.remaining()
+            if remaining is None or (
+                parent_remaining is not None and parent_remaining < remaining
+            ):
+                remaining = parent_remaining
+        return remaining
+
+    def expired(self):
+        return self.remaining() == 0.0
+
+    def check(self):
+        """Raise :class:`DeadlineExceeded` if the deadline expired or was cancelled."""
+        if self.expired():
+            raise DeadlineExceeded(self.cancelled)
@@ -14,6 +14,7 @@ suite = unittest.TestLoader().loadTestsFromNames(
         "test_frontend",
         "test_db_interface",
         "test_cli",
+        "test_api",
     ]
 )
 
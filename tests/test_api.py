@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the asynchronous API of OSACA
+"""
+
+import asyncio
+import os
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import osaca.osaca as osaca
+from osaca.api import analyze
+from osaca.utils import Deadline, DeadlineExceeded
+
+
+class TestAPI(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        with open(self._find_file("kernel_x86.s")) as f:
+            self.code_x86 = f.read()
+        with open(self._find_file("kernel_aarch64.s")) as f:
+            self.code_AArch64 = f.read()
+        # loop body without markers, repeated to a kernel taking several seconds to analyze
+        self.code_x86_long = "\n".join(self.code_x86.splitlines()[2:9] * 600) + "\n"
+
+    ###########
+    # Tests
+    ###########
+
+    def test_analyze(self):
+        async def analyze_all():
+            return await asyncio.gather(
+                analyze(self.code_x86, arch="csx"),
+                analyze(self.code_AArch64, arch="tx2", fixed=True),
+                analyze(self.code_AArch64),
+            )
+
+        results = asyncio.run(analyze_all())
+        kernel_x86 = self._find_file("kernel_x86.s")
+        kernel_aarch64 = self._find_file("kernel_aarch64.s")
+        references = [
+            next(osaca.batch_inspect([kernel_x86], arch="csx")),
+            next(osaca.batch_inspect([kernel_aarch64], arch="tx2", fixed=True)),
+            next(osaca.batch_inspect([kernel_aarch64])),
+        ]
+        for result, reference in zip(results, references):
+            self.assertEqual(result["Summary"], reference["Summary"])
+            self.assertEqual(result["Target"], reference["Target"])
+        self.assertIn("ArchWarning", results[2]["Warnings"])
+        with self.assertRaises(SyntaxError):
+            asyncio.run(analyze("add x1, [[[ x2", arch="tx2"))
+
+    def test_deadline(self):
+        # expired deadlines of the whole analysis abort it
+        with self.assertRaises(TimeoutError):
+            asyncio.run(analyze(self.code_x86, arch="csx", deadline=0))
+        start_time = time.perf_counter()
+        with self.assertRaises(TimeoutError):
+            asyncio.run(analyze(self.code_x86_long, arch="csx", deadline=0.5))
+        self.assertLess(time.perf_counter() - start_time, 5)
+        # expired LCD timeouts only cut the LCD search short
+        result = asyncio.run(analyze(self.code_x86, arch="csx", lcd_timeout=Deadline(0)))
+        self.assertIn("LCDWarning", result["Warnings"])
+        # deadlines expire together with their parent
+        parent = Deadline(10)
+        deadline = Deadline(None, parent=parent)
+        self.assertFalse(deadline.expired())
+        self.assertLessEqual(deadline.remaining(), 10)
+        parent.cancel()
+        self.assertTrue(deadline.cancelled)
+        with self.assertRaises(DeadlineExceeded):
+            deadline.check()
+        self.assertIsNone(Deadline().remaining())
+
+    def test_cancellation(self):
+        deadline = Deadline()
+        executor = ThreadPoolExecutor(1)
+
+        async def cancel_analysis():
+            task = asyncio.ensure_future(
+                analyze(self.code_x86_long, arch="csx", deadline=deadline, executor=executor)
+            )
+            await asyncio.sleep(0.5)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(cancel_analysis())
+        self.assertTrue(deadline.cancelled)
+        # the analysis stops soon after the cancellation
+        start_time = time.perf_counter()
+        executor.shutdown(wait=True)
+        self.assertLess(time.perf_counter() - start_time, 2)
+
+    ##################
+    # Helper functions
+    ##################
+
+    @staticmethod
+    def _find_file(name):
+        testdir = os.path.dirname(__file__)
+        name = os.path.join(testdir, "test_files", name)
+        assert os.path.exists(name)
+        return name
+
+
+if __name__ == "__main__":
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestAPI)
+    unittest.TextTestRunner(verbosity=2, buffer=True).run(suite)
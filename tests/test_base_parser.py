@@ -5,8 +5,9 @@ Unit tests for base assembly parser
 
 import os
 import unittest
+from unittest.mock import patch
 
-from osaca.parser import BaseParser
+from osaca.parser import BaseParser, ParserAArch64, ParserX86ATT, ParserX86Intel
 from osaca.parser.register import RegisterOperand
 from osaca.parser.immediate import ImmediateOperand
 
@@ -37,6 +38,36 @@ class TestBaseParser(unittest.TestCase):
         with self.assertRaises(NotImplementedError):
             self.parser.parse_file(self.triad_code)
 
+    def test_parse_file_parallel(self):
+        for parser, code in [
+            (ParserX86ATT(), self.x86_code),
+            (ParserAArch64(), self.aarch64_code),
+        ]:
+            sequential = parser.parse_file(code, start_line=3)
+            with patch.object(BaseParser, "PARALLEL_MIN_LINES", 0):
+                parallel = parser.parse_file(code, start_line=3, jobs=3)
+            self.assertEqual(parallel, sequential)
+            self.assertEqual(
+                [instr.line_number for instr in parallel],
+                [instr.line_number for instr in sequential],
+            )
+            self.assertEqual(
+                [instr.line for instr in parallel], [instr.line for instr in sequential]
+            )
+        # small files and files with symbol definitions are parsed without worker processes
+        with patch("multiprocessing.Pool") as pool:
+            ParserX86ATT().parse_file(self.x86_code, jobs=4)
+            with patch.object(BaseParser, "PARALLEL_MIN_LINES", 0):
+                ParserX86Intel().parse_file(self.triad_code_intel, jobs=4)
+        pool.assert_not_called()
+
+    def test_split_file(self):
+        code = "a\nb\n\nc\nd"
+        chunks = BaseParser._split_file(code, 5, 3)
+        self.assertEqual("\n".join(chunk for chunk, _ in chunks), code)
+        for chunk, start_line in chunks:
+            self.assertEqual(code.split("\n")[start_line - 5], chunk.split("\n")[0])
+
     def test_parse_line(self):
         line_instruction = "\t\tlea       2(%rax,%rax), %ecx #12.9"
         with self.assertRaises(NotImplementedError):
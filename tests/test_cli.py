@@ -4,14 +4,27 @@ Unit tests for the CLI of OSACA and running the sample kernels in examples/
 """
 
 import argparse
+import http.client
+import json
+import multiprocessing
 import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
 import unittest
 from io import StringIO
 from shutil import copyfile
 from unittest.mock import patch
 
+from ruamel.yaml import YAML
+
 import osaca.osaca as osaca
+from osaca import server
 from osaca.db_interface import sanity_check
+from osaca.result_cache import ResultCache
 from osaca.parser import ParserAArch64, ParserX86ATT, ParserX86Intel
 from osaca.semantics import MachineModel
 
@@ -80,6 +93,30 @@ class TestCLI(unittest.TestCase):
         )
         output = StringIO()
         osaca.run(args, output_file=output)
+        args = parser.parse_args(
+            [
+                "--arch",
+                "tx2",
+                "--db-check",
+                "--db-check-format",
+                "json",
+                self._find_test_file("triad_x86_iaca.s"),
+            ]
+        )
+        output = StringIO()
+        osaca.run(args, output_file=output)
+        self.assertEqual(json.loads(output.getvalue())["arch"], "tx2")
+        args = parser.parse_args(
+            [
+                "--arch",
+                "tx2",
+                "--db-check-format",
+                "json",
+                self._find_test_file("triad_x86_iaca.s"),
+            ]
+        )
+        with self.assertRaises(ValueError):
+            osaca.check_arguments(args, parser)
 
     def test_get_parser(self):
         self.assertTrue(isinstance(osaca.get_asm_parser("csx"), ParserX86ATT))
@@ -88,6 +125,15 @@ class TestCLI(unittest.TestCase):
         with self.assertRaises(ValueError):
             osaca.get_asm_parser("UNKNOWN")
 
+    def test_lazy_imports(self):
+        # graph export, YAML and the grammars are only loaded when they are used,
+        # see benchmarks/import_time.py for the resulting import time
+        result = self._import_in_subprocess()
+        self.assertFalse(
+            [m for m in result["imported"] if m.split(".")[0] in ["networkx", "ruamel"]]
+        )
+        self.assertEqual(result["parsers"], ["osaca.parser.parser_AArch64"])
+
     def test_marker_insert_x86(self):
         # copy file to add markers
         name = self._find_test_file("kernel_x86.s")
@@ -170,6 +216,20 @@ class TestCLI(unittest.TestCase):
                 output = StringIO()
                 osaca.run(args, output_file=output)
 
+    def test_legacy_balancing(self):
+        parser = osaca.create_parser()
+        for kernel, arch in [("kernel_x86.s", "csx"), ("kernel_aarch64.s", "tx2")]:
+            with self.subTest(kernel=kernel):
+                args = parser.parse_args(["--arch", arch, self._find_test_file(kernel)])
+                args_legacy = parser.parse_args(
+                    ["--arch", arch, "--legacy-balancing", self._find_test_file(kernel)]
+                )
+                self.assertFalse(args.legacy_balancing)
+                self.assertTrue(args_legacy.legacy_balancing)
+                output = StringIO()
+                osaca.run(args_legacy, output_file=output)
+                self.assertIn("Combined Analysis Report", output.getvalue())
+
     def test_architectures_sanity(self):
         # Run sanity check for all architectures
         archs = osaca.SUPPORTED_ARCHS
@@ -279,10 +339,232 @@ class TestCLI(unittest.TestCase):
                 osaca.run(a, output_file=output)
                 self.assertEqual(output.getvalue().split("\n")[8:], output_base)
 
+    def test_batch(self):
+        kernels = [
+            self._find_test_file("kernel_x86.s"),
+            self._find_test_file("kernel_aarch64.s"),
+        ]
+        # Single file analysis as reference
+        parser = osaca.create_parser()
+        args = parser.parse_args(["--arch", "tx2", kernels[1]])
+        args.yaml_out = StringIO()
+        osaca.run(args, output_file=StringIO())
+        reference = YAML(typ="unsafe", pure=True).load(args.yaml_out.getvalue())
+        results = list(osaca.batch_inspect(kernels[1:], arch="tx2"))
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["Header"]["Architecture"], "tx2")
+        self.assertEqual(results[0]["Summary"], reference["Summary"])
+        # Directory, glob and manifest input
+        testdir = os.path.dirname(kernels[0])
+        files = osaca.collect_kernel_files([testdir], pattern="kernel_x86.s")
+        self.assertEqual(files, [os.path.join(testdir, "kernel_x86.s")])
+        files = osaca.collect_kernel_files([os.path.join(testdir, "kernel_aarch64*.s")])
+        self.assertIn(kernels[1], files)
+        with self.assertRaises(FileNotFoundError):
+            osaca.collect_kernel_files([os.path.join(testdir, "*.nonexisting")])
+        # CLI with YAML and JSON output
+        parser = osaca.create_batch_parser(ErrorRaisingArgumentParser())
+        for output_format in ["yaml", "json"]:
+            with self.subTest(output_format=output_format):
+                args = parser.parse_args(["--format", output_format] + kernels)
+                output = StringIO()
+                osaca.run_batch(args, output_file=output)
+                if output_format == "yaml":
+                    documents = list(YAML(typ="unsafe", pure=True).load_all(output.getvalue()))
+                else:
+                    documents = [json.loads(line) for line in output.getvalue().splitlines()]
+                self.assertEqual(len(documents), 2)
+                self.assertEqual(documents[0]["Header"]["FileName"], kernels[0])
+                self.assertEqual(documents[1]["Header"]["Architecture"], "v2")
+        # kernel files named like a subcommand are analyzed instead
+        self.assertEqual(osaca._get_subcommand(["batch", "--arch", "tx2"]), "batch")
+        self.assertEqual(osaca._get_subcommand(["serve"]), "serve")
+        self.assertIsNone(osaca._get_subcommand(["--arch", "tx2", "batch"]))
+        self.assertIsNone(osaca._get_subcommand([]))
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            copyfile(kernels[1], os.path.join(tmpdir, "batch"))
+            os.chdir(tmpdir)
+            try:
+                self.assertIsNone(osaca._get_subcommand(["batch", "--arch", "tx2"]))
+            finally:
+                os.chdir(cwd)
+
+    def test_batch_parallel(self):
+        kernels = [
+            self._find_test_file("kernel_aarch64.s"),
+            self._find_test_file("kernel_x86.s"),
+            self._find_test_file("kernel_aarch64_deps.s"),
+        ]
+        sequential = list(osaca.batch_inspect(kernels, arch="tx2"))
+        self.assertEqual([r["Header"]["Status"] for r in sequential], ["ok", "parse error", "ok"])
+        self.assertIn("Error", sequential[1])
+        parallel = list(osaca.batch_inspect(kernels, arch="tx2", jobs=2))
+        self.assertEqual(
+            [r["Header"]["FileName"] for r in parallel],
+            [r["Header"]["FileName"] for r in sequential],
+        )
+        self.assertEqual(parallel[0]["Summary"], sequential[0]["Summary"])
+        self.assertEqual(parallel[2]["Summary"], sequential[2]["Summary"])
+        # Timeout of one kernel does not abort the batch. The analysis stops at its deadline,
+        # the alarm is only a backstop armed with a grace period.
+        with patch("signal.setitimer") as setitimer:
+            results = list(osaca.batch_inspect(kernels[:1], arch="tx2", timeout=1e-6))
+        self.assertEqual(results[0]["Header"]["Status"], "timeout")
+        self.assertGreaterEqual(setitimer.call_args_list[0][0][1], 1)
+
+    def test_result_cache(self):
+        kernel = self._find_test_file("kernel_aarch64.s")
+        parser = osaca.create_parser()
+        with tempfile.TemporaryDirectory() as cache_dir, patch("osaca.utils.CACHE_DIR", cache_dir):
+            text, yaml_out = self._run_with_result_cache(parser, kernel)
+            self.assertEqual(len(os.listdir(os.path.join(cache_dir, "results"))), 1)
+            # second run must be answered from the cache
+            with patch("osaca.osaca.analyze_code", side_effect=AssertionError):
+                text_cached, yaml_out_cached = self._run_with_result_cache(parser, kernel)
+            self.assertEqual(
+                [line for line in text.splitlines() if not line.startswith("Timestamp")],
+                [line for line in text_cached.splitlines() if not line.startswith("Timestamp")],
+            )
+            analysis = YAML(typ="unsafe", pure=True).load(yaml_out)
+            analysis_cached = YAML(typ="unsafe", pure=True).load(yaml_out_cached)
+            self.assertNotIn("TextReport", analysis_cached)
+            for key in ["Kernel", "Summary", "Warnings", "Target"]:
+                self.assertEqual(len(analysis[key]), len(analysis_cached[key]))
+            self.assertEqual(analysis["Summary"], analysis_cached["Summary"])
+            # other options or code lead to other keys, trailing whitespace does not
+            key = ResultCache.get_key("add x1, x1, x2\n", ["tx2"], {"fixed": False})
+            self.assertEqual(
+                key, ResultCache.get_key("add x1, x1, x2  \r\n", ["TX2"], {"fixed": False})
+            )
+            self.assertNotEqual(
+                key, ResultCache.get_key("add x1, x1, x3\n", ["tx2"], {"fixed": False})
+            )
+            self.assertNotEqual(
+                key, ResultCache.get_key("add x1, x1, x2\n", ["tx2"], {"fixed": True})
+            )
+            self.assertNotEqual(
+                key, ResultCache.get_key("add x1, x1, x2\n", ["n1"], {"fixed": False})
+            )
+            # least recently used results are evicted first
+            result_cache = ResultCache(cache_dir=os.path.join(cache_dir, "lru"), max_size=2500)
+            for key in ["a", "b", "c"]:
+                result_cache.put(key, key * 1000)
+                time.sleep(0.01)
+            self.assertIsNone(result_cache.get("a"))
+            self.assertEqual(result_cache.get("b"), "b" * 1000)
+            time.sleep(0.01)
+            result_cache.put("d", "d" * 1000)
+            self.assertIsNone(result_cache.get("c"))
+            self.assertEqual(result_cache.get("b"), "b" * 1000)
+            self.assertEqual(result_cache.get("d"), "d" * 1000)
+
+    def test_serve(self):
+        parser = osaca.create_serve_parser(ErrorRaisingArgumentParser())
+        args = parser.parse_args(["--socket", "osaca.sock", "--arch", "tx2", "--arch", "csx"])
+        self.assertEqual(args.arch, ["tx2", "csx"])
+        self.assertIsNone(args.jobs)
+        kernel = self._find_test_file("kernel_aarch64.s")
+        with open(kernel) as f:
+            code = f.read()
+        # Reference analysis of the batch mode
+        reference = next(osaca.batch_inspect([kernel], arch="tx2"))
+        osaca._preload_models(["TX2"])
+        with tempfile.TemporaryDirectory() as tmpdir, multiprocessing.Pool(1) as pool:
+            # HTTP on a free port
+            analysis_server = server.create_server(
+                ("127.0.0.1", 0), pool, result_cache=ResultCache(cache_dir=tmpdir)
+            )
+            threading.Thread(target=analysis_server.serve_forever, daemon=True).start()
+            connection = http.client.HTTPConnection(*analysis_server.server_address[:2])
+            for _ in range(2):
+                status, result = self._post(
+                    connection, {"code": code, "arch": "tx2", "report": True}
+                )
+                self.assertEqual(status, 200)
+                self.assertEqual(result["Header"]["Status"], "ok")
+                self.assertEqual(result["Summary"], reference["Summary"])
+                self.assertIn("Combined Analysis Report", result["Report"])
+                self.assertNotIn("TextReport", result)
+            self.assertEqual(len(os.listdir(tmpdir)), 1)
+            status, result = self._post(connection, {"code": code})
+            self.assertEqual(result["Header"]["Architecture"], "v2")
+            self.assertNotIn("Report", result)
+            connection.request("GET", "/status")
+            response = connection.getresponse()
+            self.assertEqual(response.status, 200)
+            self.assertIn("TX2", json.loads(response.read())["Architectures"])
+            # malformed requests
+            for request, message in [
+                ([code], "JSON object"),
+                ({"arch": "tx2"}, "code"),
+                ({"code": code, "arch": "THE_MACHINE"}, "not supported"),
+                ({"code": code, "arch": "tx2", "syntax": "ATT"}, "x86"),
+                ({"code": code, "fixed": "yes"}, "boolean"),
+                ({"code": code, "lines": "1-x"}, "line range"),
+                ({"code": code, "colour": "blue"}, "Unknown"),
+            ]:
+                with self.subTest(request=request):
+                    connection = http.client.HTTPConnection(*analysis_server.server_address[:2])
+                    status, result = self._post(connection, request)
+                    self.assertEqual(status, 400)
+                    self.assertIn(message, result["Error"])
+            analysis_server.shutdown()
+            analysis_server.server_close()
+            # Unix socket
+            path = os.path.join(tmpdir, "osaca.sock")
+            analysis_server = server.create_server(path, pool, timeout=60)
+            # the poll timeout of socketserver is not changed by the analysis timeout
+            self.assertEqual(analysis_server.analysis_timeout, 60)
+            self.assertIsNone(analysis_server.timeout)
+            threading.Thread(target=analysis_server.serve_forever, daemon=True).start()
+            with self.assertRaises(OSError):
+                server.create_server(path, pool)
+            connection = http.client.HTTPConnection("localhost")
+            connection.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            connection.sock.connect(path)
+            status, result = self._post(connection, {"code": code, "arch": "tx2"})
+            self.assertEqual(status, 200)
+            self.assertEqual(result["Summary"], reference["Summary"])
+            analysis_server.shutdown()
+            analysis_server.server_close()
+
     ##################
     # Helper functions
     ##################
 
+    @staticmethod
+    def _post(connection, request):
+        connection.request("POST", "/analyze", json.dumps(request))
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+
+    @staticmethod
+    def _import_in_subprocess():
+        code = (
+            "import json, sys\n"
+            "import osaca.osaca\n"
+            "imported = sorted(sys.modules)\n"
+            "osaca.osaca.get_asm_parser('TX2')\n"
+            "parsers = [m for m in sys.modules if m.startswith('osaca.parser.parser_')]\n"
+            "print(json.dumps({'imported': imported, 'parsers': parsers}))"
+        )
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(
+            [os.path.dirname(os.path.dirname(osaca.__file__))]
+            + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else [])
+        )
+        output = subprocess.check_output([sys.executable, "-c", code], env=env)
+        return json.loads(output)
+
+    @staticmethod
+    def _run_with_result_cache(parser, kernel):
+        args = parser.parse_args(["--arch", "tx2", "--result-cache", kernel])
+        args.yaml_out = StringIO()
+        output = StringIO()
+        osaca.run(args, output_file=output)
+        return output.getvalue(), args.yaml_out.getvalue()
+
     @staticmethod
     def _find_file(kernel, arch, comp):
         testdir = os.path.dirname(__file__)
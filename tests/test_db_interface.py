@@ -3,10 +3,13 @@
 Unit tests for DB interface
 """
 
+import json
 import os
 import unittest
 from io import StringIO
 
+from ruamel.yaml import YAML
+
 import osaca.db_interface as dbi
 from osaca.db_interface import sanity_check, _get_full_instruction_name
 from osaca.semantics import MachineModel
@@ -91,6 +94,69 @@ class TestDBInterface(unittest.TestCase):
         sanity_check("tx2", verbose=True, internet_check=False, output_file=output)
         sanity_check("zen1", verbose=True, internet_check=False, output_file=output)
 
+        # machine-readable reports
+        for output_format, load in [("json", json.loads), ("yaml", YAML(typ="safe").load)]:
+            output = StringIO()
+            ok = sanity_check("tx2", output_file=output, output_format=output_format)
+            report = load(output.getvalue())
+            self.assertEqual(report["ok"], ok)
+            self.assertEqual(report["arch"], "tx2")
+            self.assertEqual(report["isa"], "aarch64")
+            self.assertGreater(report["instruction_forms"], 0)
+            self.assertEqual(report["duplicates_arch"], ["ldr  register(prefix:d),mem"])
+        with self.assertRaises(ValueError):
+            sanity_check("tx2", output_file=StringIO(), output_format="xml")
+
+    def test_sanity_check_suspicious_once(self):
+        arch_mm = MachineModel(isa="aarch64")
+        isa_mm = MachineModel(isa="aarch64")
+        entry = {
+            "name": "stp",
+            "operands": [
+                RegisterOperand(prefix="x"),
+                RegisterOperand(prefix="x"),
+                MemoryOperand(offset="imd", base="x", index=None, scale=1),
+            ],
+            "throughput": 1.0,
+            "latency": 1.0,
+            "port_pressure": [],
+        }
+        arch_mm["instruction_forms"].extend([entry, dict(entry)])
+        # forms with the same signature are listed once as suspicious and as duplicate
+        _, _, _, suspicious, duplicates, _ = dbi._check_sanity_arch_db(
+            arch_mm, isa_mm, internet_check=False
+        )
+        self.assertEqual(suspicious, [entry])
+        self.assertEqual(duplicates, [entry])
+
+    def test_instruction_signature(self):
+        signature = MachineModel.get_instruction_signature(
+            "DoItRightAndDoItFast", self.entry_csx.operands
+        )
+        self.assertEqual(
+            MachineModel.get_instruction_signature(
+                "doitrightanddoitfast", copy.deepcopy(self.entry_csx.operands)
+            ),
+            signature,
+        )
+        # operands of other types or with other attributes are no duplicate
+        self.assertNotEqual(
+            MachineModel.get_instruction_signature(
+                "DoItRightAndDoItFast", [self.entry_csx.operands[0], RegisterOperand(name="ymm")]
+            ),
+            signature,
+        )
+        self.assertNotEqual(
+            MachineModel.get_instruction_signature(
+                "DoItRightAndDoItFast",
+                [self.entry_csx.operands[0], RegisterOperand(name="xmm", mask=True)],
+            ),
+            signature,
+        )
+        self.assertNotEqual(
+            MachineModel.get_instruction_signature("vaddpd", self.entry_csx.operands), signature
+        )
+
     def test_ibench_import(self):
         # only check import without dumping the DB file (takes too much time)
         with open(self._find_file("ibench_import_x86.dat")) as input_file:
@@ -117,6 +117,27 @@ class TestFrontend(unittest.TestCase):
             )
             self.assertEqual(line.flags, analysis_dict["Kernel"][i]["Flags"])
             self.assertEqual(line.line_number, analysis_dict["Kernel"][i]["LineNumber"])
+            self.assertEqual(line.port_uops_option, analysis_dict["Kernel"][i]["PortUopsOption"])
+
+    def test_text_report_from_dict(self):
+        reduced_kernel = reduce_to_section(self.kernel_AArch64, self.parser_AArch64)
+        dg = KernelDG(
+            reduced_kernel,
+            self.parser_AArch64,
+            self.machine_model_tx2,
+            self.semantics_tx2,
+        )
+        fe = Frontend(path_to_yaml=os.path.join(self.MODULE_DATA_DIR, "tx2.yml"))
+        analysis_dict = fe.full_analysis_dict(reduced_kernel, dg, text_report=True)
+        self.assertNotIn("TextReport", fe.full_analysis_dict(reduced_kernel, dg))
+        self.assertEqual(len(analysis_dict["TextReport"]["Lines"]), len(reduced_kernel))
+        # reports only differ in their timestamp
+        report = fe.full_analysis(reduced_kernel, dg).splitlines()
+        report_from_dict = fe.full_analysis_from_dict(analysis_dict).splitlines()
+        self.assertEqual(len(report), len(report_from_dict))
+        for line, line_from_dict in zip(report, report_from_dict):
+            if not line.startswith("Timestamp"):
+                self.assertEqual(line, line_from_dict)
 
     def test_dict_output_AArch64(self):
         reduced_kernel = reduce_to_section(self.kernel_AArch64, self.parser_AArch64)
@@ -154,6 +175,7 @@ class TestFrontend(unittest.TestCase):
             )
             self.assertEqual(line.flags, analysis_dict["Kernel"][i]["Flags"])
             self.assertEqual(line.line_number, analysis_dict["Kernel"][i]["LineNumber"])
+            self.assertEqual(line.port_uops_option, analysis_dict["Kernel"][i]["PortUopsOption"])
 
     ##################
     # Helper functions
@@ -6,9 +6,11 @@ Unit tests for IACA/OSACA marker utilities
 import os
 import unittest
 from collections import OrderedDict
+from unittest.mock import patch
 
 from osaca.semantics import (
     reduce_to_section,
+    parse_marked_section,
     find_basic_blocks,
     find_jump_labels,
     find_basic_loop_bodies,
@@ -28,6 +30,11 @@ class TestMarkerUtils(unittest.TestCase):
             triad_code_x86_att = f.read()
         with open(self._find_file("triad_x86_intel_iaca.s")) as f:
             triad_code_x86_intel = f.read()
+        self.triad_code = {
+            self.parser_AArch: triad_code_arm,
+            self.parser_x86_att: triad_code_x86_att,
+            self.parser_x86_intel: triad_code_x86_intel,
+        }
         self.parsed_AArch = self.parser_AArch.parse_file(triad_code_arm)
         self.parsed_x86_att = self.parser_x86_att.parse_file(triad_code_x86_att)
         self.parsed_x86_intel = self.parser_x86_intel.parse_file(triad_code_x86_intel)
@@ -54,6 +61,24 @@ class TestMarkerUtils(unittest.TestCase):
         self.assertEqual(kernel[0].line_number, 111)
         self.assertEqual(kernel[-1].line_number, 117)
 
+    def test_parse_marked_section(self):
+        for parser, code in self.triad_code.items():
+            with self.subTest(parser=type(parser).__name__):
+                with patch.object(
+                    type(parser), "parse_line", autospec=True, side_effect=type(parser).parse_line
+                ) as parse_line:
+                    kernel, marked = parse_marked_section(code, parser)
+                self.assertTrue(marked)
+                self.assertEqual(kernel, reduce_to_section(parser.parse_file(code), parser))
+                # only the kernel and few lines looking like markers are parsed
+                self.assertLess(parse_line.call_count, len(kernel) + 50)
+                self.assertLess(parse_line.call_count, len(code.split("\n")) / 2)
+        # without markers, the whole code is returned
+        code = "\n".join(self.triad_code[self.parser_x86_att].split("\n")[146:154])
+        kernel, marked = parse_marked_section(code, self.parser_x86_att)
+        self.assertFalse(marked)
+        self.assertEqual(kernel, self.parser_x86_att.parse_file(code))
+
     def test_marker_matching_AArch64(self):
         # preparation
         bytes_1_line = ".byte     213,3,32,31\n"
@@ -120,6 +145,10 @@ class TestMarkerUtils(unittest.TestCase):
                         ):
                             sample_parsed = self.parser_AArch.parse_file(sample_code)
                             sample_kernel = reduce_to_section(sample_parsed, ParserAArch64())
+                            self.assertEqual(
+                                parse_marked_section(sample_code, ParserAArch64())[0],
+                                sample_kernel,
+                            )
                             self.assertEqual(len(sample_kernel), kernel_length)
                             kernel_start = len(
                                 list(
@@ -192,6 +221,10 @@ class TestMarkerUtils(unittest.TestCase):
                         ):
                             sample_parsed = self.parser_x86_att.parse_file(sample_code)
                             sample_kernel = reduce_to_section(sample_parsed, ParserX86ATT())
+                            self.assertEqual(
+                                parse_marked_section(sample_code, ParserX86ATT())[0],
+                                sample_kernel,
+                            )
                             self.assertEqual(len(sample_kernel), kernel_length)
                             kernel_start = len(
                                 list(
@@ -234,6 +267,7 @@ class TestMarkerUtils(unittest.TestCase):
             code = pro + kernel + epi
             parsed = self.parser_AArch.parse_file(code)
             test_kernel = reduce_to_section(parsed, ParserAArch64())
+            self.assertEqual(parse_marked_section(code, ParserAArch64())[0], test_kernel)
             if kernel:
                 kernel_length = len(kernel.strip().split("\n"))
             else:
@@ -282,6 +316,7 @@ class TestMarkerUtils(unittest.TestCase):
             code = pro + kernel + epi
             parsed = self.parser_x86_att.parse_file(code)
             test_kernel = reduce_to_section(parsed, ParserX86ATT())
+            self.assertEqual(parse_marked_section(code, ParserX86ATT())[0], test_kernel)
             if kernel:
                 kernel_length = len(kernel.strip().split("\n"))
             else:
@@ -3,12 +3,14 @@
 Unit tests for ARMv8 AArch64 assembly parser
 """
 
+import glob
 import os
 import unittest
+from unittest.mock import patch
 
 from pyparsing import ParseException
 
-from osaca.parser import ParserAArch64, InstructionForm
+from osaca.parser import BaseParser, ParserAArch64, InstructionForm
 from osaca.parser.directive import DirectiveOperand
 from osaca.parser.memory import MemoryOperand
 from osaca.parser.register import RegisterOperand
@@ -351,6 +353,45 @@ class TestParserAArch64(unittest.TestCase):
         self.assertEqual(parsed[0].line_number, 1)
         self.assertEqual(len(parsed), 645)
 
+    def test_parse_line_fast(self):
+        # the fast path must produce exactly the same result as the pyparsing grammar
+        lines = [
+            "ldr d0, [x1, w2, sxtw #3]",
+            "ldr d0, [x1, w2, uxtw]",
+            "add x0, x0, #:lo12:.Lstr",
+            "movk x0, #0x1234, lsl #16",
+            "add x0, x1, x2, lsl #3",
+            "ld1 {v0.s, v1.s}[2], [x0]",
+            "ld1 {v0.16b}, [x0], #16",
+            "csel x0, x1, x2, LT",
+            "fmov s1, #2.0e+2f",
+            "prfm PLDL1KEEP, [x0]",
+            "ptrue p0.s, vl8",
+            "b .L3 // loop",
+            '.asciz "foo bar"',
+        ]
+        fast_lines = 0
+        for name in sorted(
+            glob.glob(os.path.join(os.path.dirname(__file__), "test_files", "*.s"))
+        ):
+            with open(name) as f:
+                code = f.read()
+            if BaseParser.detect_ISA(code) == ("aarch64", None):
+                lines += code.split("\n")
+        for i, line in enumerate(lines, start=1):
+            fast = self.parser._parse_line_fast(line, i)
+            if fast is None:
+                continue
+            fast_lines += 1
+            with patch.object(ParserAArch64, "_parse_line_fast", return_value=None):
+                slow = self.parser._parse_line_uncached(line, i)
+            self.assertEqual(fast, slow, msg=line)
+        # the fast path covers nearly all lines, only uncommon syntax is left to pyparsing
+        self.assertGreater(fast_lines, 0.95 * len([line for line in lines if line.strip()]))
+        self.assertIsNone(self.parser._parse_line_fast("ld1d z0.d, p0/z, [x0, #1, mul vl]", 1))
+        self.assertIsNone(self.parser._parse_line_fast("ldr x0, [x1], x2", 1))
+        self.assertIsNone(self.parser._parse_line_fast(".globl triad // comment", 1))
+
     def test_normalize_imd(self):
         imd_decimal_1 = ImmediateOperand(value="79")
         imd_hex_1 = ImmediateOperand(value="0x4f")
@@ -458,6 +499,14 @@ class TestParserAArch64(unittest.TestCase):
                 assert_value = True if rj == ri else False
                 with self.subTest(reg_a=ri, reg_b=rj, assert_val=assert_value):
                     self.assertEqual(self.parser.is_reg_dependend_of(ri, rj), assert_value)
+        # dependent registers share the same dependency key
+        for ri in regs:
+            for rj in regs:
+                if self.parser.is_reg_dependend_of(ri, rj):
+                    self.assertEqual(
+                        self.parser.get_reg_dependency_key(ri),
+                        self.parser.get_reg_dependency_key(rj),
+                    )
 
     ##################
     # Helper functions
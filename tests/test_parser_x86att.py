@@ -3,12 +3,15 @@
 Unit tests for x86 AT&T assembly parser
 """
 
+import glob
 import os
 import unittest
+from copy import copy
+from unittest.mock import patch
 
 from pyparsing import ParseException
 
-from osaca.parser import ParserX86ATT, InstructionForm
+from osaca.parser import BaseParser, ParserX86ATT, InstructionForm
 from osaca.parser.register import RegisterOperand
 from osaca.parser.immediate import ImmediateOperand
 from osaca.parser.memory import MemoryOperand
@@ -272,6 +275,70 @@ class TestParserX86ATT(unittest.TestCase):
         self.assertEqual(parsed[0].line_number, 1)
         self.assertEqual(len(parsed), 353)
 
+    def test_parse_line_fast(self):
+        # the fast path must produce exactly the same result as the pyparsing grammar
+        lines = fast_lines = 0
+        for name in sorted(
+            glob.glob(os.path.join(os.path.dirname(__file__), "test_files", "*.s"))
+        ):
+            with open(name) as f:
+                code = f.read()
+            if BaseParser.detect_ISA(code) != ("x86", "ATT"):
+                continue
+            for i, line in enumerate(code.split("\n"), start=1):
+                lines += 1
+                fast = self.parser._parse_line_fast(line, i)
+                if fast is None:
+                    continue
+                fast_lines += 1
+                with patch.object(ParserX86ATT, "_parse_line_fast", return_value=None):
+                    slow = self.parser._parse_line_uncached(line, i)
+                self.assertEqual(fast, slow, msg=line)
+        # the fast path covers nearly all lines, only uncommon syntax is left to pyparsing
+        self.assertGreater(fast_lines, 0.95 * lines)
+        self.assertIsNone(self.parser._parse_line_fast('.string "%f, %d\\n"', 1))
+        self.assertIsNone(self.parser._parse_line_fast("callq 0x4210d0", 1))
+        self.assertIsNone(self.parser._parse_line_fast("movl %eax, (%rax", 1))
+
+    def test_parse_line_cached(self):
+        parser = ParserX86ATT()
+        line = "vmovupd (%rax,%rcx,8), %ymm0 # load"
+        first = parser.parse_line(line, 1)
+        second = parser.parse_line("\t\t" + line, 7)
+        self.assertIsNot(first, second)
+        self.assertEqual(second.line, "\t\t" + line)
+        self.assertEqual(second.line_number, 7)
+        self.assertEqual(second.comment, "load")
+        self.assertEqual(first.operands, parser._parse_line_uncached(line, 1).operands)
+        self.assertIsNot(first.operands, second.operands)
+        self.assertIs(first.operands[0], second.operands[0])
+        # shared operands are immutable, copies are not
+        with self.assertRaises(AttributeError):
+            second.operands[0].base.name = "rbx"
+        with self.assertRaises(AttributeError):
+            second.operands[1].name = "ymm1"
+        register = copy(second.operands[1])
+        register.name = "ymm1"
+        self.assertEqual(parser.parse_line(line).operands[1].name, "ymm0")
+        # instruction forms are not shared
+        second.mnemonic = "vmovapd"
+        self.assertEqual(parser.parse_line(line).mnemonic, "vmovupd")
+        # least recently used lines are evicted
+        with patch.object(ParserX86ATT, "PARSE_CACHE_SIZE", 2):
+            parser.parse_line("addq $1, %rax")
+            parser.parse_line("addq $2, %rax")
+            self.assertIsNot(parser.parse_line(line).operands[0], first.operands[0])
+            self.assertLessEqual(len(parser._line_cache), 2)
+        # cached lines parse like any other line, regardless of indentation
+        with open(self._find_file("kernel_x86.s")) as f:
+            for i, line in enumerate(f.read().split("\n"), start=1):
+                if line.strip():
+                    parser.parse_line(line.lstrip(), i)
+                    self.assertEqual(
+                        parser.parse_line("  " + line, i),
+                        parser._parse_line_uncached("  " + line, i),
+                    )
+
     def test_parse_register(self):
         register_str_1 = "%rax"
         register_str_2 = "%r9"
@@ -348,6 +415,14 @@ class TestParserX86ATT(unittest.TestCase):
                 assert_value = True if rj == ri else False
                 with self.subTest(reg_a=ri, reg_b=rj, assert_val=assert_value):
                     self.assertEqual(self.parser.is_reg_dependend_of(ri, rj), assert_value)
+        # dependent registers share the same dependency key
+        for ri in regs:
+            for rj in regs:
+                if self.parser.is_reg_dependend_of(ri, rj):
+                    self.assertEqual(
+                        self.parser.get_reg_dependency_key(ri),
+                        self.parser.get_reg_dependency_key(rj),
+                    )
 
     ##################
     # Helper functions
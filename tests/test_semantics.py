@@ -3,12 +3,20 @@
 Unit tests for Semantic Analysis
 """
 
+import glob
+import hashlib
+import json
 import os
+import shutil
+import tempfile
 import unittest
 import time
-from copy import deepcopy
+from copy import copy, deepcopy
+from operator import itemgetter
+from unittest.mock import patch
 
 import networkx as nx
+from osaca import utils
 from osaca.osaca import get_unmatched_instruction_ratio
 from osaca.parser import ParserAArch64, ParserX86ATT, ParserX86Intel
 from osaca.semantics import (
@@ -22,6 +30,11 @@ from osaca.semantics import (
 from osaca.parser.register import RegisterOperand
 from osaca.parser.memory import MemoryOperand
 from osaca.parser.identifier import IdentifierOperand
+from osaca.semantics.dependency_graph import DependencyGraph
+from osaca.semantics.isa_semantics import compile_operation
+from osaca.semantics.model_cache import get_model_hash, load_model_cache, write_model_cache
+from osaca.semantics.port_balancing import PortPressureMatrix, balance_port_load
+from osaca.utils import Deadline, DeadlineExceeded
 
 
 class TestSemanticTools(unittest.TestCase):
@@ -407,6 +420,27 @@ class TestSemanticTools(unittest.TestCase):
         # --> best case: 9p0,16p2
         k_pp = self.semantics_a64fx.get_throughput_sum(tmp_massign)
         self.assertEqual(k_pp, [9.0, 0.0, 0.0, 16.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0])
+        # chosen options are stored with the instruction forms
+        options = [instr.port_uops_option for instr in tmp_massign if instr.mnemonic == "smlal"]
+        self.assertEqual(options, [1, 1])
+        # identical instructions are distributed over both options
+        tmp_massign = self.parser_AArch64.parse_file(
+            "smlal v2.4s, v1.2d, v1.2d\n" * 4 + "dup v1.2d, v0.d[0]\n" * 9
+        )
+        self.semantics_a64fx.normalize_instruction_forms(tmp_massign)
+        self.semantics_a64fx.add_semantics(tmp_massign)
+        self.semantics_a64fx.assign_optimal_throughput(tmp_massign)
+        # 9p0 + 4*(8p0|8p2) --> best case: 17p0,24p2
+        k_pp = self.semantics_a64fx.get_throughput_sum(tmp_massign)
+        self.assertEqual(k_pp, [17.0, 0.0, 0.0, 24.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0])
+        options = [instr.port_uops_option for instr in tmp_massign if instr.mnemonic == "smlal"]
+        self.assertEqual(sorted(options), [0, 1, 1, 1])
+        # legacy search reports options as well
+        tmp_massign = deepcopy(self.kernel_aarch64_mult_assign)
+        self.semantics_a64fx.add_semantics(tmp_massign)
+        self.semantics_a64fx.assign_optimal_throughput(tmp_massign, legacy=True)
+        options = [instr.port_uops_option for instr in tmp_massign if instr.mnemonic == "smlal"]
+        self.assertEqual(options, [1, 1])
 
     def test_optimal_throughput_assignment_x86_intel(self):
         kernel_fixed = deepcopy(self.kernel_x86_intel)
@@ -450,6 +484,59 @@ class TestSemanticTools(unittest.TestCase):
         self.assertNotEqual(tp_fixed, tp_optimal)
         self.assertTrue(max(tp_optimal) <= max(tp_fixed))
 
+    def test_optimal_throughput_assignment_exact(self):
+        kernel_fixed = deepcopy(self.kernel_AArch64)
+        self.semantics_tx2.add_semantics(kernel_fixed)
+        kernel_legacy = deepcopy(kernel_fixed)
+        kernel_optimal = deepcopy(kernel_fixed)
+        self.semantics_tx2.assign_optimal_throughput(kernel_legacy, legacy=True)
+        self.semantics_tx2.assign_optimal_throughput(kernel_legacy, legacy=True)
+        self.semantics_tx2.assign_optimal_throughput(kernel_optimal)
+        tp_legacy = self.semantics_tx2.get_throughput_sum(kernel_legacy)
+        tp_optimal = self.semantics_tx2.get_throughput_sum(kernel_optimal)
+        self.assertTrue(max(tp_optimal) <= max(tp_legacy))
+        # per-instruction pressure is only moved between the ports of a uop
+        for instr_fixed, instr_optimal in zip(kernel_fixed, kernel_optimal):
+            self.assertAlmostEqual(
+                sum(instr_fixed.port_pressure), sum(instr_optimal.port_pressure)
+            )
+            self.assertTrue(all(pp >= 0 for pp in instr_optimal.port_pressure))
+        # a second pass does not change anything
+        tp_before = [instr.port_pressure for instr in kernel_optimal]
+        self.semantics_tx2.assign_optimal_throughput(kernel_optimal)
+        self.assertEqual(tp_before, [instr.port_pressure for instr in kernel_optimal])
+
+    def test_port_pressure_matrix(self):
+        kernel = deepcopy(self.kernel_x86)
+        self.semantics_csx.add_semantics(kernel)
+        port_pressures = PortPressureMatrix(kernel)
+        self.assertEqual(port_pressures.get_sums(2), self.semantics_csx.get_throughput_sum(kernel))
+        idx = [i for i, instr in enumerate(kernel) if instr.throughput != 0.0][0]
+        port_pressures.set_pressure(idx, [0, 1], [kernel[idx].port_pressure[0] + 1.5, 0.25])
+        self.assertIs(port_pressures[idx], kernel[idx].port_pressure)
+        self.assertEqual(kernel[idx].port_pressure[1], 0.25)
+        self.assertEqual(port_pressures.get_sums(2), self.semantics_csx.get_throughput_sum(kernel))
+        # instructions without throughput do not count
+        idx = [i for i, instr in enumerate(kernel) if instr.throughput == 0.0][0]
+        port_pressures.set_pressure(idx, [0], [1.0])
+        self.assertEqual(port_pressures.get_sums(2), self.semantics_csx.get_throughput_sum(kernel))
+
+    def test_balance_port_load(self):
+        # 2cy on ports 0|1 and 1cy on ports 1|2: exact optimum is 1cy on each port
+        distribution = balance_port_load([0.0, 0.0, 0.0], {(0, 1): 2.0, (1, 2): 1.0})
+        self.assertEqual(distribution[(0, 1)], {0: 1.0, 1: 1.0})
+        self.assertEqual(distribution[(1, 2)], {1: 0.0, 2: 1.0})
+        # fixed load on port 0: 3cy on ports 0|1|2 fill up ports 1 and 2 first
+        distribution = balance_port_load([2.0, 0.0, 0.0], {(0, 1, 2): 3.0})
+        self.assertEqual(
+            [round(distribution[(0, 1, 2)][p], 10) for p in range(3)], [0.0, 1.5, 1.5]
+        )
+        # ports of a heavily used set are not used for remaining uops
+        distribution = balance_port_load([0.0, 0.0, 0.0], {(0,): 0.0, (1,): 3.0, (1, 2): 1.0})
+        self.assertEqual(distribution[(1, 2)].get(1, 0.0), 0.0)
+        self.assertEqual(distribution[(1, 2)][2], 1.0)
+        self.assertEqual(distribution[(0,)], {})
+
     def test_kernelDG_x86(self):
         #
         #  4
@@ -509,6 +596,90 @@ class TestSemanticTools(unittest.TestCase):
         # test dot creation
         dg.export_graph(filepath=os.devnull)
 
+    def test_kernelDG_find_dependencies(self):
+        for kernel, parser, model, semantics in [
+            (self.kernel_x86, self.parser_x86_att, self.machine_model_csx, self.semantics_csx),
+            (
+                self.kernel_x86_memdep,
+                self.parser_x86_att,
+                self.machine_model_csx,
+                self.semantics_csx,
+            ),
+            (
+                self.kernel_x86_intel_memdep,
+                self.parser_x86_intel,
+                self.machine_model_skx,
+                self.semantics_skx_intel,
+            ),
+            (self.kernel_AArch64, self.parser_AArch64, self.machine_model_tx2, self.semantics_tx2),
+            (
+                self.kernel_aarch64_memdep,
+                self.parser_AArch64,
+                self.machine_model_tx2,
+                self.semantics_tx2,
+            ),
+            (
+                self.kernel_aarch64_deps,
+                self.parser_AArch64,
+                self.machine_model_a64fx,
+                self.semantics_a64fx,
+            ),
+        ]:
+            dg = KernelDG(kernel, parser, model, semantics)
+            for flag_dependencies in [False, True]:
+                with self.subTest(kernel=kernel[0].line, flag_dependencies=flag_dependencies):
+                    # single sweep finds the same dependencies as checking all pairs
+                    expected = [
+                        (i, kernel.index(dep), operand, dep_flags)
+                        for i, instruction_form in enumerate(kernel)
+                        for dep, operand, dep_flags in dg.find_depending(
+                            instruction_form, kernel[i + 1 :], flag_dependencies
+                        )
+                    ]
+                    dependencies, chains = dg._find_dependencies(kernel, flag_dependencies)
+                    self.assertEqual(
+                        [
+                            (source, target, operand, dep_flags)
+                            for source, _, target, operand, dep_flags in sorted(
+                                dependencies, key=itemgetter(0, 1, 2)
+                            )
+                        ],
+                        expected,
+                    )
+                    # graph of the unrolled kernel is derived from the single kernel
+                    unrolled_kernel = kernel + [copy(iform) for iform in kernel]
+                    for instruction_form in unrolled_kernel[len(kernel) :]:
+                        instruction_form.line_number += 1000
+                    unrolled_dg = dg._create_unrolled_DG(kernel, 1000, flag_dependencies)
+                    self.assertEqual(
+                        list(unrolled_dg.to_networkx().edges(data=True)),
+                        list(
+                            dg.create_DG(unrolled_kernel, flag_dependencies)
+                            .to_networkx()
+                            .edges(data=True)
+                        ),
+                    )
+                    # graph algorithms give the same results as their networkx counterparts
+                    nx_dg = unrolled_dg.to_networkx()
+                    line_numbers = unrolled_dg.line_numbers
+                    self.assertEqual(
+                        [line_numbers[n] for n in unrolled_dg.topological_order()],
+                        list(nx.topological_sort(nx_dg)),
+                    )
+                    self.assertEqual(
+                        [line_numbers[n] for n in unrolled_dg.longest_path()],
+                        nx.dag_longest_path(nx_dg, weight="latency"),
+                    )
+                    root = unrolled_dg.node_id(kernel[-1].line_number + 1000)
+                    self.assertEqual(
+                        {line_numbers[n] for n, a in enumerate(unrolled_dg.ancestors(root)) if a},
+                        nx.ancestors(nx_dg, line_numbers[root]) | {line_numbers[root]},
+                    )
+                    self.assertEqual(
+                        list(DependencyGraph.from_networkx(nx_dg).to_networkx().edges(data=True)),
+                        list(nx_dg.edges(data=True)),
+                    )
+
     def test_memdependency_x86(self):
         dg = KernelDG(
             self.kernel_x86_memdep,
@@ -669,6 +840,37 @@ class TestSemanticTools(unittest.TestCase):
             dg.get_critical_path()
         with self.assertRaises(NotImplementedError):
             dg.get_loopcarried_dependencies()
+        # the graph is only rebuilt once after changing it
+        dg.dg = nx.DiGraph(dg.dg.subgraph([n for n in dg.dg if n < 100]))
+        from_networkx = DependencyGraph.from_networkx
+        with patch.object(DependencyGraph, "from_networkx", side_effect=from_networkx) as rebuild:
+            dg.get_critical_path()
+            for instruction_form in self.kernel_x86:
+                list(dg.get_dependent_instruction_forms(line_number=instruction_form.line_number))
+        self.assertEqual(rebuild.call_count, 1)
+
+    def test_dg_changes(self):
+        dg = KernelDG(
+            self.kernel_x86, self.parser_x86_att, self.machine_model_csx, self.semantics_csx
+        )
+        graph = dg.dg
+        # reading the graph does not rebuild it, changing attributes only after invalidating it
+        from_networkx = DependencyGraph.from_networkx
+        with patch.object(DependencyGraph, "from_networkx", side_effect=from_networkx) as rebuild:
+            self.assertEqual(len(dg.dg.nodes), len(graph))
+            dg.get_critical_path()
+            rebuild.assert_not_called()
+            for source, target, data in graph.edges(data=True):
+                data["latency"] = 0
+            dg.invalidate()
+            dg.get_critical_path()
+            dg.get_loopcarried_dependencies()
+        self.assertEqual(rebuild.call_count, 1)
+        # changes of a graph kept from an earlier access are considered
+        last = max(graph)
+        graph.add_edge(last, last + 1, latency=1.0)
+        self.assertEqual(list(dg.get_dependent_instruction_forms(line_number=last + 1)), [])
+        self.assertIn(last + 1, list(dg.get_dependent_instruction_forms(line_number=last)))
 
     def test_loop_carried_dependency_aarch64(self):
         dg = KernelDG(
@@ -788,7 +990,7 @@ class TestSemanticTools(unittest.TestCase):
 
     def test_timeout_during_loop_carried_dependency(self):
         start_time = time.perf_counter()
-        KernelDG(
+        dg = KernelDG(
             self.kernel_x86_long_LCD,
             self.parser_x86_att,
             self.machine_model_csx,
@@ -797,20 +999,56 @@ class TestSemanticTools(unittest.TestCase):
         )
         end_time = time.perf_counter()
         time_10 = end_time - start_time
-        start_time = time.perf_counter()
-        KernelDG(
+        # the LCD search is polynomial and must finish long before the timeout
+        self.assertFalse(dg.timed_out)
+        self.assertTrue(time_10 < 10)
+        self.assertTrue(len(dg.get_loopcarried_dependencies()) > 0)
+        dg = KernelDG(
             self.kernel_x86_long_LCD,
             self.parser_x86_att,
             self.machine_model_csx,
             self.semantics_x86,
-            timeout=2,
+            timeout=0,
         )
-        end_time = time.perf_counter()
-        time_2 = end_time - start_time
+        self.assertTrue(dg.timed_out)
+        # a deadline of the whole analysis is not cut short, but aborts it
+        deadline = Deadline()
+        deadline.cancel()
+        with self.assertRaises(DeadlineExceeded):
+            KernelDG(
+                self.kernel_x86_long_LCD,
+                self.parser_x86_att,
+                self.machine_model_csx,
+                self.semantics_x86,
+                deadline=deadline,
+            )
 
-        self.assertTrue(time_10 > 10)
-        self.assertTrue(2 < time_2)
-        self.assertTrue(time_2 < (time_10 - 7))
+    def test_loop_carried_dependency_paths_per_root(self):
+        # limiting the paths per root keeps the longest LCD
+        dg = KernelDG(
+            self.kernel_aarch64_memdep,
+            self.parser_AArch64,
+            self.machine_model_tx2,
+            self.semantics_tx2,
+        )
+        lc_deps = dg.get_loopcarried_dependencies()
+        paths_per_root = KernelDG.LCD_PATHS_PER_ROOT
+        KernelDG.LCD_PATHS_PER_ROOT = 1
+        try:
+            dg_single = KernelDG(
+                self.kernel_aarch64_memdep,
+                self.parser_AArch64,
+                self.machine_model_tx2,
+                self.semantics_tx2,
+            )
+        finally:
+            KernelDG.LCD_PATHS_PER_ROOT = paths_per_root
+        lc_deps_single = dg_single.get_loopcarried_dependencies()
+        self.assertTrue(set(lc_deps_single) <= set(lc_deps))
+        self.assertEqual(
+            max(dep["latency"] for dep in lc_deps.values()),
+            max(dep["latency"] for dep in lc_deps_single.values()),
+        )
 
     def test_is_read_is_written_x86(self):
         # independent form HW model
@@ -963,6 +1201,50 @@ class TestSemanticTools(unittest.TestCase):
                 self.assertTrue(dag.is_written(reg, instr_form_non_rw_1))
                 self.assertTrue(dag.is_written(reg, instr_form_non_rw_1))
 
+    def test_reg_changes(self):
+        instr_form = self.parser_AArch64.parse_line("sub x2, x3, #4")
+        self.semantics_tx2.normalize_instruction_form(instr_form)
+        self.semantics_tx2.assign_src_dst(instr_form)
+        reg_changes = self.semantics_tx2.get_reg_changes(instr_form)
+        self.assertEqual(reg_changes, {"x2": {"name": "x3", "value": -4}})
+        self.assertEqual(self.semantics_tx2.get_reg_changes(instr_form, only_postindexed=True), {})
+        # results are memoized per instruction form until its operands change
+        self.assertIs(self.semantics_tx2.get_reg_changes(instr_form), reg_changes)
+        self.assertNotIn("_reg_changes", instr_form.__getstate__())
+        instr_form.semantic_operands = instr_form.semantic_operands
+        self.assertIsNot(self.semantics_tx2.get_reg_changes(instr_form), reg_changes)
+
+        instr_form = self.parser_AArch64.parse_line("ldr x1, [x2], #16")
+        self.semantics_tx2.normalize_instruction_form(instr_form)
+        self.semantics_tx2.assign_src_dst(instr_form)
+        self.assertEqual(
+            self.semantics_tx2.get_reg_changes(instr_form, only_postindexed=True),
+            {"x2": {"name": "x2", "value": 16}},
+        )
+
+    def test_compile_operation(self):
+        state = {"op1": {"name": "x1", "value": 2}, "op2": {"name": "x2", "value": 3}}
+        compile_operation("op1['value'] += op2['value'] * 2; op1['name'] = op2['name']")(state)
+        self.assertEqual(state["op1"], {"name": "x2", "value": 8})
+        compile_operation("op2['value'] = None if None in [op1['value']] else -op1['value']")(
+            state
+        )
+        self.assertEqual(state["op2"]["value"], -8)
+        operation = "op1['value'] -= 1"
+        self.assertIs(compile_operation(operation), compile_operation(operation))
+        with self.assertRaises(NameError):
+            compile_operation("op3['value'] = 1")(state)
+        # only assignments and simple expressions are supported
+        for operation in [
+            "__import__('os').system('true')",
+            "op1['value'] = op1.__class__",
+            "op1['value'] = len(op1)",
+            "del op1",
+            "op1['value'] =",
+        ]:
+            with self.assertRaises(ValueError):
+                compile_operation(operation)
+
     def test_invalid_MachineModel(self):
         with self.assertRaises(ValueError):
             MachineModel()
@@ -1003,6 +1285,187 @@ class TestSemanticTools(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.assertIsNone(MachineModel.get_isa_for_arch("THE_MACHINE"))
 
+    def test_MachineModel_instruction_lookup(self):
+        # Indexed and memoized lookup must return the first match of a linear scan
+        def linear_lookup(machine_model, name, operands):
+            return next(
+                (
+                    iform
+                    for iform in machine_model["instruction_forms_dict"].get(name.upper(), [])
+                    if machine_model._match_operands(iform.operands, operands)
+                ),
+                None,
+            )
+
+        for machine_model, kernel in [
+            (self.machine_model_csx, self.kernel_x86),
+            (self.machine_model_tx2, self.kernel_AArch64),
+            (self.machine_model_a64fx, self.kernel_aarch64_SVE),
+        ]:
+            for instruction_form in kernel:
+                if instruction_form.mnemonic is None:
+                    continue
+                with self.subTest(mnemonic=instruction_form.mnemonic):
+                    expected = linear_lookup(
+                        machine_model, instruction_form.mnemonic, instruction_form.operands
+                    )
+                    for _ in range(2):
+                        self.assertIs(
+                            machine_model.get_instruction(
+                                instruction_form.mnemonic, instruction_form.operands
+                            ),
+                            expected,
+                        )
+        # Lookup caches are invalidated when the model changes
+        test_mm = MachineModel(path_to_yaml=self._find_file("test_db_aarch64.yml"))
+        operands = [RegisterOperand(prefix="v", shape="d"), RegisterOperand(prefix="x")]
+        self.assertIsNone(test_mm.get_instruction("NEWINSTR", operands))
+        test_mm.set_instruction("NEWINSTR", operands=operands, latency=4)
+        self.assertEqual(test_mm.get_instruction("NEWINSTR", operands).latency, 4)
+        self.assertIsNone(
+            MachineModel(path_to_yaml=self._find_file("test_db_aarch64.yml")).get_instruction(
+                "NEWINSTR", operands
+            )
+        )
+
+    def test_MachineModel_compact_cache(self):
+        mm = MachineModel(path_to_yaml=self._find_file("test_db_x86.yml"))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cachefile = os.path.join(tmpdir, "test_db_x86.osacache")
+            write_model_cache(cachefile, mm._data, MachineModel.INTERNAL_VERSION)
+            self.assertIsNone(load_model_cache(cachefile, MachineModel.INTERNAL_VERSION + 1))
+            data = load_model_cache(cachefile, MachineModel.INTERNAL_VERSION)
+            # instruction forms are only deserialized on lookup
+            reader = data["instruction_forms_dict"]._reader
+            self.assertEqual(len(reader._loaded), 0)
+            self.assertEqual(data["ports"], mm["ports"])
+            self.assertIn("VADDPD", data["instruction_forms_dict"])
+            self.assertNotIn("NOT_AN_INSTRUCTION", data["instruction_forms_dict"])
+            self.assertEqual(len(data["instruction_forms_dict"]["VADDPD"]), 3)
+            self.assertEqual(list(reader._loaded), ["VADDPD"])
+            # instruction forms are stored with builtin instead of YAML round-trip types
+            iform = data["instruction_forms_dict"]["VADDPD"][0]
+            self.assertEqual(iform, mm["instruction_forms_dict"]["VADDPD"][0])
+            self.assertIs(type(iform.port_pressure), list)
+            self.assertIs(type(iform.throughput), float)
+            self.assertFalse(hasattr(iform, "__dict__"))
+            self.assertFalse(hasattr(iform.operands[0], "__dict__"))
+            self.assertEqual(
+                iform.operands[0].__getstate__(),
+                mm["instruction_forms_dict"]["VADDPD"][0].operands[0].__getstate__(),
+            )
+            # raw entries are stored apart from instruction forms
+            self.assertEqual(len(reader._loaded_entries), 0)
+            # full materialization keeps model order
+            self.assertEqual(
+                [iform["name"] for iform in data["instruction_forms"]],
+                [iform["name"] for iform in mm["instruction_forms"]],
+            )
+            self.assertEqual(
+                sorted(data["instruction_forms_dict"]), sorted(mm["instruction_forms_dict"])
+            )
+            # copies are independent of the cache file
+            data_copy = deepcopy(data)
+            self.assertIsInstance(data_copy["instruction_forms"], list)
+            self.assertEqual(len(data_copy["instruction_forms"]), len(mm["instruction_forms"]))
+
+    def test_MachineModel_interned_operands(self):
+        mm = MachineModel(path_to_yaml=self._find_file("test_db_x86.yml"))
+        vaddpd = mm["instruction_forms_dict"]["VADDPD"]
+        # equal DB operands of all instruction forms and models are the same frozen object
+        xmm = MachineModel.intern_operand(RegisterOperand(name="xmm", mask=False))
+        xmm_form = [iform for iform in vaddpd if iform.operands[0].name == "xmm"][0]
+        self.assertIs(xmm_form.operands[0], xmm)
+        self.assertIs(xmm_form.operands[1], xmm)
+        csx_vaddpd = self.machine_model_csx.get_instruction("VADDPD", [xmm] * 3)
+        self.assertIs(csx_vaddpd.operands[0], xmm)
+        self.assertIsNot(
+            MachineModel.intern_operand(RegisterOperand(name="xmm", mask=False, source=True)), xmm
+        )
+        with self.assertRaises(AttributeError):
+            xmm.name = "ymm"
+        memory = MachineModel.intern_operand(
+            MemoryOperand(base=RegisterOperand(name="gpr"), offset=None, index=None, scale=1)
+        )
+        self.assertIs(memory.base, MachineModel.intern_operand(RegisterOperand(name="gpr")))
+        # matching DB operands against each other follows the type-specific checks, even if
+        # they are the same object, so DB-vs-DB checks are not changed by interning
+        self.assertTrue(mm._match_operands(vaddpd[0].operands, vaddpd[0].operands))
+        mm_tx2 = self.machine_model_tx2
+        for iform in mm_tx2["instruction_forms"]:
+            self.assertEqual(
+                mm_tx2._match_operands(iform["operands"], iform["operands"]),
+                all(mm_tx2._check_operands(o, o) for o in iform["operands"]),
+            )
+        ldr = [
+            iform
+            for iform in mm_tx2["instruction_forms_dict"]["LDR"]
+            if isinstance(iform.operands[1], MemoryOperand) and iform.operands[1].offset == "*"
+        ][0]
+        self.assertFalse(mm_tx2._match_operands(ldr.operands, ldr.operands))
+        # sharing is kept by the model cache, cached operands are interned again
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cachefile = os.path.join(tmpdir, "test_db_x86.osacache")
+            write_model_cache(cachefile, mm._data, MachineModel.INTERNAL_VERSION)
+            data = load_model_cache(cachefile, MachineModel.INTERNAL_VERSION)
+            operands = [
+                o for iform in data["instruction_forms_dict"].values() for o in iform[0].operands
+            ]
+            self.assertLess(len({id(o) for o in operands}), len(operands))
+            data = load_model_cache(
+                cachefile, MachineModel.INTERNAL_VERSION, MachineModel.intern_operand
+            )
+            self.assertIs(
+                data["instruction_forms_dict"]["VADDPD"][0].operands[0], vaddpd[0].operands[0]
+            )
+
+    def test_MachineModel_lazy(self):
+        with tempfile.TemporaryDirectory() as tmpdir, patch.object(
+            utils, "CACHE_DIR", os.path.join(tmpdir, "cache")
+        ):
+            yaml_file = os.path.join(tmpdir, "model.yml")
+            shutil.copyfile(self._find_file("test_db_x86.yml"), yaml_file)
+            # first load creates cache, lazy model is complete nonetheless
+            mm = MachineModel(path_to_yaml=yaml_file, lazy=True)
+            self.assertIsNotNone(mm.get_instruction("VADDPD", 3))
+            del MachineModel._runtime_cache[yaml_file]
+            del MachineModel._runtime_lookup_cache[yaml_file]
+            mm_lazy = MachineModel(path_to_yaml=yaml_file, lazy=True)
+            reader = mm_lazy["instruction_forms_dict"]._reader
+            self.assertEqual(mm_lazy["ports"], mm["ports"])
+            self.assertEqual(len(reader._loaded), 0)
+            self.assertEqual(mm_lazy.get_instruction("VADDPD", 3), mm.get_instruction("VADDPD", 3))
+            self.assertEqual(list(reader._loaded), ["VADDPD"])
+            self.assertEqual(len(reader._loaded_entries), 0)
+
+    def test_MachineModel_cache_validation(self):
+        with tempfile.TemporaryDirectory() as tmpdir, patch.object(
+            utils, "CACHE_DIR", os.path.join(tmpdir, "cache")
+        ):
+            yaml_file = os.path.join(tmpdir, "model.yml")
+            shutil.copyfile(self._find_file("test_db_x86.yml"), yaml_file)
+            # modification must not be recent to trust the stamp
+            os.utime(yaml_file, ns=(0, 10**18))
+            with open(yaml_file, "rb") as f:
+                expected_hash = hashlib.sha256(f.read()).hexdigest()
+            self.assertEqual(get_model_hash(yaml_file), expected_hash)
+            # unchanged stamp: no need to read and hash file again
+            with patch("hashlib.sha256", side_effect=AssertionError("hashed again")):
+                self.assertEqual(get_model_hash(yaml_file), expected_hash)
+                mm = MachineModel(path_to_yaml=yaml_file)
+            with open(os.path.join(utils.CACHE_DIR, "index.json")) as f:
+                index = json.load(f)
+            entry = index[os.path.realpath(yaml_file)]
+            self.assertEqual(entry["sha256"], expected_hash)
+            self.assertTrue(os.path.exists(entry["cachefile"]))
+            # changed stamp: hash is recomputed and the outdated cache is not used
+            with open(yaml_file, "a") as f:
+                f.write("\n")
+            self.assertNotEqual(get_model_hash(yaml_file), expected_hash)
+            MachineModel._runtime_cache.pop(yaml_file)
+            self.assertIsNot(MachineModel(path_to_yaml=yaml_file)._data, mm._data)
+            self.assertEqual(len(glob.glob(os.path.join(tmpdir, ".model_*.osacache"))), 2)
+
     ##################
     # Helper functions
     ##################
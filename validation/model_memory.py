@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Memory and load time benchmark of the machine models in osaca/data.
+
+For every model, a fresh interpreter builds the model cache from a copy of the YAML file and
+another one loads all instruction forms from that cache. Reported are the size of the cache
+file, the time to load all instruction forms and the resulting increase of the resident set
+size (RSS). Results can be stored as JSON and compared to a previous run::
+
+    ./model_memory.py --save before.json
+    # ... change OSACA ...
+    ./model_memory.py --compare before.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from glob import glob
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(REPO_DIR, "osaca", "data")
+
+# Run in a fresh interpreter, prints measurements as JSON. The current RSS is read from /proc,
+# where not available the peak RSS is used instead (given in KiB on Linux, bytes on macOS).
+MEASURE = """
+import gc, json, os, resource, sys, time
+from osaca import utils
+from osaca.semantics.hw_model import MachineModel
+
+def rss():
+    gc.collect()
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024**2
+    except OSError:
+        scale = 1024**2 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+utils.CACHE_DIR = sys.argv[2]
+rss_before = rss()
+start = time.perf_counter()
+model = MachineModel(path_to_yaml=sys.argv[1])
+forms = sum(len(forms) for forms in model["instruction_forms_dict"].values())
+duration = time.perf_counter() - start
+print(json.dumps({"time": duration, "rss": rss() - rss_before, "forms": forms}))
+"""
+
+
+def measure(path, cache_dir):
+    env = dict(os.environ, PYTHONPATH=REPO_DIR)
+    output = subprocess.check_output([sys.executable, "-c", MEASURE, path, cache_dir], env=env)
+    return json.loads(output)
+
+
+def benchmark_model(yaml_file):
+    """Build the cache of a copy of a model and load all of its instruction forms again."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, os.path.basename(yaml_file))
+        shutil.copy(yaml_file, path)
+        build = measure(path, tmp_dir)
+        load = measure(path, tmp_dir)
+        cachefiles = glob(os.path.join(tmp_dir, ".*.osacache"))
+        return {
+            "forms": load["forms"],
+            "cache_size": sum(os.path.getsize(f) for f in cachefiles) / 1024**2,
+            "build_time": build["time"],
+            "load_time": load["time"],
+            "load_rss": load["rss"],
+        }
+
+
+def get_models():
+    """Return all machine and ISA models in osaca/data, without symlinked duplicates."""
+    files = sorted(glob(os.path.join(DATA_DIR, "*.yml"))) + sorted(
+        glob(os.path.join(DATA_DIR, "isa", "*.yml"))
+    )
+    return [f for f in files if not os.path.islink(f)]
+
+
+def print_row(name, result, columns):
+    print("{:<12}".format(name) + "".join(cell.format(result[c]) for c, _, cell in columns))
+
+
+def get_totals(results, names, columns):
+    """Sum up all columns of the given models."""
+    return {c: sum(results[n][c] for n in names if n in results) for c, _, _ in columns}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("models", nargs="*", help="model files, defaults to all of osaca/data")
+    parser.add_argument("--save", metavar="FILE", help="store results as JSON")
+    parser.add_argument("--compare", metavar="FILE", help="compare with results stored before")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    columns = [
+        ("forms", "{:>7}", "{:>7d}"),
+        ("cache_size", "{:>11}", "{:>11.2f}"),
+        ("build_time", "{:>11}", "{:>11.2f}"),
+        ("load_time", "{:>10}", "{:>10.3f}"),
+        ("load_rss", "{:>9}", "{:>9.1f}"),
+    ]
+    print(
+        "{:<12}".format("model")
+        + "".join(head.format(name) for name, head, _ in columns)
+        + "  (cache size in MiB, times in s, RSS in MiB)"
+    )
+    results = {}
+    for yaml_file in args.models or get_models():
+        yaml_file = os.path.abspath(yaml_file)
+        name = os.path.relpath(yaml_file, DATA_DIR)
+        results[name] = benchmark_model(yaml_file)
+        print_row(os.path.splitext(name)[0], results[name], columns)
+        if name in baseline:
+            print_row("  before", baseline[name], columns)
+        sys.stdout.flush()
+    print_row("total", get_totals(results, results, columns), columns)
+    if any(name in baseline for name in results):
+        print_row("  before", get_totals(baseline, results, columns), columns)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()